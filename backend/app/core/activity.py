@@ -0,0 +1,241 @@
+"""
+Asynchronous, batched writer for the activity log.
+
+Handlers enqueue events with `record()` instead of inserting them inline, so
+auditing adds no database round trip to the request. A background task
+drains the queue and writes events with one multi-row INSERT per batch,
+flushing when ACTIVITY_BATCH_SIZE events are waiting or ACTIVITY_FLUSH_INTERVAL
+seconds after the first one arrived.
+
+The queue is bounded by ACTIVITY_QUEUE_SIZE. When it is full,
+ACTIVITY_OVERFLOW_POLICY decides what happens:
+
+* ``drop_new``: discard the incoming event
+* ``drop_oldest``: discard the oldest queued event to make room
+* ``block``: wait up to ACTIVITY_ENQUEUE_TIMEOUT seconds for room (applying
+  backpressure to the handler), then discard the incoming event
+
+A batch that fails to write is retried up to ACTIVITY_FLUSH_RETRIES times,
+waiting ACTIVITY_RETRY_BACKOFF seconds before the first retry and twice as
+long before each next one, so a database restart or failover does not lose
+the events. Only then is the batch dropped. A retry after an ambiguous
+failure (the commit went through but its reply was lost) can write a batch
+twice. stats() counts dropped events by cause.
+
+Events still queued at shutdown are flushed, within ACTIVITY_DRAIN_TIMEOUT.
+"""
+
+import asyncio
+import logging
+import time
+from datetime import datetime
+from typing import Any, Dict, List, Optional
+
+from sqlalchemy import insert
+
+from app.core.config import settings
+from app.db.session import async_session
+from app.models.activity import ActivityLog
+
+logger = logging.getLogger(__name__)
+
+OVERFLOW_POLICIES = ("drop_new", "drop_oldest", "block")
+
+
+class ActivityWriter:
+    def __init__(
+        self,
+        max_queue: int,
+        batch_size: int,
+        flush_interval: float,
+        overflow_policy: str = "drop_new",
+        enqueue_timeout: float = 0.05,
+        drain_timeout: float = 10.0,
+        flush_retries: int = 3,
+        retry_backoff: float = 0.5,
+    ):
+        if overflow_policy not in OVERFLOW_POLICIES:
+            raise ValueError(f"Unknown activity overflow policy: {overflow_policy}")
+        self.max_queue = max_queue
+        self.batch_size = batch_size
+        self.flush_interval = flush_interval
+        self.overflow_policy = overflow_policy
+        self.enqueue_timeout = enqueue_timeout
+        self.drain_timeout = drain_timeout
+        self.flush_retries = flush_retries
+        self.retry_backoff = retry_backoff
+        self._queue: Optional[asyncio.Queue] = None
+        self._task: Optional[asyncio.Task] = None
+        self.enqueued = 0
+        # Events dropped because the queue was full, and after failed writes
+        self.dropped = 0
+        self.dropped_failed_writes = 0
+        self.written = 0
+        self.write_errors = 0
+        self.retries = 0
+        self.flushes = 0
+        self.flush_time_total = 0.0
+        self.flush_time_max = 0.0
+        self.last_flush_time = 0.0
+
+    @property
+    def queue(self) -> asyncio.Queue:
+        # Created lazily so the queue binds to the running event loop
+        if self._queue is None:
+            self._queue = asyncio.Queue(maxsize=self.max_queue)
+        return self._queue
+
+    async def record(
+        self,
+        action: str,
+        entity_type: str,
+        entity_id: int,
+        user_id: str,
+        details: Optional[Dict[str, Any]] = None,
+    ) -> bool:
+        """
+        Queue an activity for writing. Returns False if it was dropped.
+        """
+        event = {
+            "action": action,
+            "entity_type": entity_type,
+            "entity_id": entity_id,
+            "user_id": user_id,
+            "details": details,
+            # Stamped now so the feed orders by when it happened, not when it was flushed
+            "created_at": datetime.now(),
+        }
+        queue = self.queue
+        try:
+            queue.put_nowait(event)
+        except asyncio.QueueFull:
+            if self.overflow_policy == "drop_oldest":
+                queue.get_nowait()
+                queue.task_done()
+                self.dropped += 1
+                queue.put_nowait(event)
+            elif self.overflow_policy == "block":
+                try:
+                    await asyncio.wait_for(queue.put(event), self.enqueue_timeout)
+                except asyncio.TimeoutError:
+                    self.dropped += 1
+                    return False
+            else:
+                self.dropped += 1
+                return False
+        self.enqueued += 1
+        return True
+
+    def start(self) -> None:
+        if self._task is None:
+            self._task = asyncio.create_task(self._run())
+
+    async def stop(self) -> None:
+        """
+        Stop the background task after flushing whatever is still queued.
+        """
+        if self._task is None:
+            return
+        task, self._task = self._task, None
+        try:
+            await asyncio.wait_for(self.queue.join(), self.drain_timeout)
+        except asyncio.TimeoutError:
+            logger.warning(
+                f"Activity log drain timed out; {self.queue.qsize()} events not written"
+            )
+        task.cancel()
+        try:
+            await task
+        except asyncio.CancelledError:
+            pass
+
+    async def _run(self) -> None:
+        queue = self.queue
+        while True:
+            batch = [await queue.get()]
+            deadline = time.monotonic() + self.flush_interval
+            while len(batch) < self.batch_size:
+                timeout = deadline - time.monotonic()
+                if timeout <= 0:
+                    break
+                try:
+                    batch.append(await asyncio.wait_for(queue.get(), timeout))
+                except asyncio.TimeoutError:
+                    break
+            try:
+                await self._flush(batch)
+            finally:
+                for _ in batch:
+                    queue.task_done()
+
+    async def _flush(self, batch: List[Dict[str, Any]]) -> None:
+        attempt = 0
+        while True:
+            started = time.perf_counter()
+            try:
+                async with async_session() as session:
+                    # executemany over a Core insert becomes batched multi-row VALUES
+                    await session.execute(insert(ActivityLog), batch)
+                    await session.commit()
+                break
+            except Exception as e:
+                self.write_errors += 1
+                if attempt >= self.flush_retries:
+                    self.dropped_failed_writes += len(batch)
+                    logger.error(
+                        f"Dropped {len(batch)} activity log events after {attempt + 1} attempts | "
+                        f"Error: {str(e)}"
+                    )
+                    return
+                delay = self.retry_backoff * 2 ** attempt
+                logger.warning(
+                    f"Failed to write {len(batch)} activity log events; retrying in {delay:.1f}s | "
+                    f"Error: {str(e)}"
+                )
+            try:
+                await asyncio.sleep(delay)
+            except asyncio.CancelledError:
+                # Stopped while waiting to retry (drain timeout)
+                self.dropped_failed_writes += len(batch)
+                raise
+            attempt += 1
+            self.retries += 1
+        elapsed = time.perf_counter() - started
+        self.written += len(batch)
+        self.flushes += 1
+        self.flush_time_total += elapsed
+        self.last_flush_time = elapsed
+        if elapsed > self.flush_time_max:
+            self.flush_time_max = elapsed
+
+    def stats(self) -> Dict[str, Any]:
+        return {
+            "queue_depth": self.queue.qsize(),
+            "queue_capacity": self.max_queue,
+            "overflow_policy": self.overflow_policy,
+            "enqueued": self.enqueued,
+            "dropped": self.dropped + self.dropped_failed_writes,
+            "dropped_queue_full": self.dropped,
+            "dropped_failed_writes": self.dropped_failed_writes,
+            "written": self.written,
+            "write_errors": self.write_errors,
+            "retries": self.retries,
+            "flushes": self.flushes,
+            "flush_latency_last_seconds": round(self.last_flush_time, 6),
+            "flush_latency_avg_seconds": (
+                round(self.flush_time_total / self.flushes, 6) if self.flushes else 0.0
+            ),
+            "flush_latency_max_seconds": round(self.flush_time_max, 6),
+        }
+
+
+activity_writer = ActivityWriter(
+    max_queue=settings.ACTIVITY_QUEUE_SIZE,
+    batch_size=settings.ACTIVITY_BATCH_SIZE,
+    flush_interval=settings.ACTIVITY_FLUSH_INTERVAL,
+    overflow_policy=settings.ACTIVITY_OVERFLOW_POLICY,
+    enqueue_timeout=settings.ACTIVITY_ENQUEUE_TIMEOUT,
+    drain_timeout=settings.ACTIVITY_DRAIN_TIMEOUT,
+    flush_retries=settings.ACTIVITY_FLUSH_RETRIES,
+    retry_backoff=settings.ACTIVITY_RETRY_BACKOFF,
+)
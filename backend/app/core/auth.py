@@ -3,13 +3,17 @@ from fastapi.security import OAuth2PasswordBearer
 from jose import JWTError, jwt
 from datetime import datetime, timedelta
 import secrets
-import requests
 from urllib.parse import urlencode
+from sqlalchemy import union_all
+from sqlalchemy.dialects.postgresql import insert as pg_insert
 from sqlmodel import select
 from sqlmodel.ext.asyncio.session import AsyncSession
 from typing import Optional
 
+from app.core.activity import activity_writer
 from app.core.config import settings
+from app.core.http import get_http_client
+from app.core.user_cache import user_cache
 from app.db.session import get_session
 from app.models.user import User
 
@@ -60,7 +64,8 @@ async def exchange_code_for_token(code: str, redirect_uri: str):
         "grant_type": "authorization_code"
     }
     
-    response = requests.post(AZURE_TOKEN_ENDPOINT, data=data)
+    client = get_http_client()
+    response = await client.post(AZURE_TOKEN_ENDPOINT, data=data)
     if response.status_code != 200:
         raise HTTPException(
             status_code=status.HTTP_401_UNAUTHORIZED,
@@ -77,7 +82,8 @@ async def get_user_info(access_token: str):
         "Content-Type": "application/json"
     }
     
-    response = requests.get(f"{MICROSOFT_GRAPH_ENDPOINT}/me", headers=headers)
+    client = get_http_client()
+    response = await client.get(f"{MICROSOFT_GRAPH_ENDPOINT}/me", headers=headers)
     if response.status_code != 200:
         raise HTTPException(
             status_code=status.HTTP_401_UNAUTHORIZED,
@@ -96,21 +102,35 @@ async def get_or_create_user(session: AsyncSession, user_info: dict):
             detail="Invalid user info",
         )
     
-    result = await session.execute(select(User).where(User.id == user_id))
-    user = result.scalar_one_or_none()
-    
-    if not user:
-        # Create new user
-        user = User(
+    # Single round trip: insert if missing, otherwise read the existing row
+    inserted = (
+        pg_insert(User)
+        .values(
             id=user_id,
             email=user_info.get("mail") or user_info.get("userPrincipalName", ""),
             name=user_info.get("displayName", ""),
-            role="user"
+            role="user",
+            created_at=datetime.now()
         )
-        session.add(user)
-        await session.commit()
-        await session.refresh(user)
+        .on_conflict_do_nothing(index_elements=[User.id])
+        .returning(*User.__table__.c)
+        .cte("inserted_user")
+    )
+    existing = select(User.__table__).where(User.id == user_id)
+    result = await session.execute(
+        select(User).from_statement(union_all(select(inserted), existing).limit(1))
+    )
+    user = result.scalar_one_or_none()
+    
+    if not user:
+        # A concurrent login inserted the row after our snapshot was taken
+        result = await session.execute(select(User).where(User.id == user_id))
+        user = result.scalar_one()
     
+    await session.commit()
+    # User ids are not integers; the user is identified by user_id instead.
+    # No details: activity rows are served back by the feed, so keep PII out
+    await activity_writer.record("login", "user", 0, user.id)
     return user
 
 # Verify JWT token
@@ -147,6 +167,11 @@ async def get_current_user(
     payload = await verify_token(token)
     user_id = payload.get("sub")
     
+    # Serve from the user cache before touching the database
+    user = user_cache.get(user_id)
+    if user:
+        return user
+    
     result = await session.execute(select(User).where(User.id == user_id))
     user = result.scalar_one_or_none()
     
@@ -157,4 +182,5 @@ async def get_current_user(
             headers={"WWW-Authenticate": "Bearer"},
         )
     
+    user_cache.set(user)
     return user
@@ -0,0 +1,38 @@
+"""
+Helpers for ETag / If-None-Match conditional GETs.
+"""
+
+import hashlib
+from fastapi import Request, Response
+
+# Let browsers keep the body but revalidate it on every use
+REVALIDATE_CACHE_CONTROL = "private, no-cache"
+
+def make_etag(*parts: object) -> str:
+    """
+    Build a strong ETag from the values that identify a representation.
+    """
+    digest = hashlib.sha256(":".join(str(p) for p in parts).encode()).hexdigest()
+    return f'"{digest[:32]}"'
+
+def etag_matches(request: Request, etag: str) -> bool:
+    """
+    Check whether the request's If-None-Match header matches etag.
+    If-None-Match uses weak comparison, so W/ prefixes are ignored.
+    """
+    header = request.headers.get("If-None-Match")
+    if not header:
+        return False
+    if header.strip() == "*":
+        return True
+    candidates = (tag.strip() for tag in header.split(","))
+    return any(tag.removeprefix("W/") == etag for tag in candidates)
+
+def not_modified(etag: str) -> Response:
+    """
+    Build a bodyless 304 response for etag.
+    """
+    return Response(
+        status_code=304,
+        headers={"ETag": etag, "Cache-Control": REVALIDATE_CACHE_CONTROL},
+    )
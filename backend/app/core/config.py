@@ -11,7 +11,8 @@ class Settings(BaseSettings):
     PROJECT_DESCRIPTION: str = "FastAPI backend for the FullStack application"
     PROJECT_VERSION: str = "0.1.0"
     
-    # Security settings
+    # Security settings. The generated default is per process; startup.py
+    # exports the resolved key so every worker signs with the same one
     SECRET_KEY: str = secrets.token_urlsafe(32)
     ACCESS_TOKEN_EXPIRE_MINUTES: int = 60 * 24 * 8  # 8 days
     COOKIE_SECURE: bool = os.getenv("COOKIE_SECURE", "False").lower() == "true"
@@ -54,12 +55,134 @@ class Settings(BaseSettings):
             host=info.data.get("POSTGRES_SERVER"),
             path=f"{info.data.get('POSTGRES_DB') or ''}",
         )
+
+    # Database connection pool (per worker process)
+    DB_POOL_SIZE: int = int(os.getenv("DB_POOL_SIZE", "5"))
+    DB_MAX_OVERFLOW: int = int(os.getenv("DB_MAX_OVERFLOW", "10"))
+    DB_POOL_TIMEOUT: float = float(os.getenv("DB_POOL_TIMEOUT", "30"))
+    DB_POOL_RECYCLE: int = int(os.getenv("DB_POOL_RECYCLE", "1800"))
+    DB_POOL_PRE_PING: bool = os.getenv("DB_POOL_PRE_PING", "True").lower() == "true"
+    DB_STATEMENT_CACHE_SIZE: int = int(os.getenv("DB_STATEMENT_CACHE_SIZE", "100"))
+    DB_ECHO: bool = os.getenv("DB_ECHO", "False").lower() == "true"
     
     # Azure AD (Microsoft Entra ID) settings
     AZURE_TENANT_ID: str = os.getenv("AZURE_TENANT_ID", "your-tenant-id")
     AZURE_CLIENT_ID: str = os.getenv("AZURE_CLIENT_ID", "your-client-id")
     AZURE_CLIENT_SECRET: str = os.getenv("AZURE_CLIENT_SECRET", "your-client-secret")
-    
+
+    # Outbound HTTP client settings (Entra ID / Microsoft Graph)
+    HTTP_TIMEOUT: float = float(os.getenv("HTTP_TIMEOUT", "10.0"))
+    HTTP_CONNECT_TIMEOUT: float = float(os.getenv("HTTP_CONNECT_TIMEOUT", "5.0"))
+    HTTP_POOL_TIMEOUT: float = float(os.getenv("HTTP_POOL_TIMEOUT", "5.0"))
+    HTTP_MAX_CONNECTIONS_PER_HOST: int = int(os.getenv("HTTP_MAX_CONNECTIONS_PER_HOST", "20"))
+    HTTP_MAX_KEEPALIVE_CONNECTIONS: int = int(os.getenv("HTTP_MAX_KEEPALIVE_CONNECTIONS", "10"))
+    HTTP_KEEPALIVE_EXPIRY: float = float(os.getenv("HTTP_KEEPALIVE_EXPIRY", "60.0"))
+    HTTP_CONNECT_RETRIES: int = int(os.getenv("HTTP_CONNECT_RETRIES", "1"))
+
+    # App-only Graph token cache (seconds)
+    GRAPH_TOKEN_REFRESH_MARGIN: int = int(os.getenv("GRAPH_TOKEN_REFRESH_MARGIN", "300"))
+    GRAPH_TOKEN_EXPIRY_SKEW: int = int(os.getenv("GRAPH_TOKEN_EXPIRY_SKEW", "30"))
+
+    # Entra ID token signing keys (seconds)
+    JWKS_REFRESH_INTERVAL: int = int(os.getenv("JWKS_REFRESH_INTERVAL", "86400"))
+    JWKS_MIN_REFRESH_INTERVAL: int = int(os.getenv("JWKS_MIN_REFRESH_INTERVAL", "60"))
+
+    # Profile photo cache
+    PHOTO_CACHE_TTL: int = int(os.getenv("PHOTO_CACHE_TTL", "3600"))
+    PHOTO_CACHE_NEGATIVE_TTL: int = int(os.getenv("PHOTO_CACHE_NEGATIVE_TTL", "900"))
+    PHOTO_CACHE_ERROR_TTL: int = int(os.getenv("PHOTO_CACHE_ERROR_TTL", "60"))
+    PHOTO_CACHE_MAX_ENTRIES: int = int(os.getenv("PHOTO_CACHE_MAX_ENTRIES", "1024"))
+    PHOTO_CACHE_MAX_BYTES: int = int(os.getenv("PHOTO_CACHE_MAX_BYTES", str(32 * 1024 * 1024)))
+    PHOTO_CACHE_DIR: Optional[str] = os.getenv("PHOTO_CACHE_DIR")
+    PHOTO_CACHE_DISK_MAX_BYTES: int = int(os.getenv("PHOTO_CACHE_DISK_MAX_BYTES", str(512 * 1024 * 1024)))
+    # Signed photo URLs stay valid for one to two of these periods
+    PHOTO_URL_TTL: int = int(os.getenv("PHOTO_URL_TTL", "3600"))
+
+    # Authenticated user cache
+    USER_CACHE_TTL: int = int(os.getenv("USER_CACHE_TTL", "60"))
+    USER_CACHE_MAX_ENTRIES: int = int(os.getenv("USER_CACHE_MAX_ENTRIES", "10000"))
+    USER_CACHE_BROADCAST: bool = os.getenv("USER_CACHE_BROADCAST", "False").lower() == "true"
+
+    # Maximum number of items accepted by a bulk endpoint
+    BULK_MAX_ITEMS: int = int(os.getenv("BULK_MAX_ITEMS", "5000"))
+
+    # Rows fetched per server-side cursor round trip when exporting
+    EXPORT_CHUNK_SIZE: int = int(os.getenv("EXPORT_CHUNK_SIZE", "1000"))
+
+    # Project import: rows per COPY batch and row errors reported back
+    IMPORT_BATCH_SIZE: int = int(os.getenv("IMPORT_BATCH_SIZE", "5000"))
+    IMPORT_MAX_ERRORS: int = int(os.getenv("IMPORT_MAX_ERRORS", "100"))
+
+    # Serve responses through orjson and precompiled row serializers
+    FAST_JSON: bool = os.getenv("FAST_JSON", "False").lower() == "true"
+
+    # Response cache for list endpoints ("memory" or "redis")
+    RESPONSE_CACHE_BACKEND: str = os.getenv("RESPONSE_CACHE_BACKEND", "memory")
+    RESPONSE_CACHE_URL: str = os.getenv("RESPONSE_CACHE_URL", "redis://localhost:6379/0")
+    RESPONSE_CACHE_TTL: int = int(os.getenv("RESPONSE_CACHE_TTL", "300"))
+    RESPONSE_CACHE_MAX_ENTRIES: int = int(os.getenv("RESPONSE_CACHE_MAX_ENTRIES", "1024"))
+    RESPONSE_CACHE_MAX_BYTES: int = int(os.getenv("RESPONSE_CACHE_MAX_BYTES", str(64 * 1024 * 1024)))
+
+    # Seconds between dashboard counter reconciliations (0 disables)
+    STATS_RECONCILE_INTERVAL: int = int(os.getenv("STATS_RECONCILE_INTERVAL", "3600"))
+
+    # Activity log writer: queued events are flushed in batches
+    ACTIVITY_QUEUE_SIZE: int = int(os.getenv("ACTIVITY_QUEUE_SIZE", "10000"))
+    ACTIVITY_BATCH_SIZE: int = int(os.getenv("ACTIVITY_BATCH_SIZE", "500"))
+    ACTIVITY_FLUSH_INTERVAL: float = float(os.getenv("ACTIVITY_FLUSH_INTERVAL", "1.0"))
+    # When the queue is full: "drop_new", "drop_oldest" or "block"
+    ACTIVITY_OVERFLOW_POLICY: str = os.getenv("ACTIVITY_OVERFLOW_POLICY", "drop_new")
+    ACTIVITY_ENQUEUE_TIMEOUT: float = float(os.getenv("ACTIVITY_ENQUEUE_TIMEOUT", "0.05"))
+    ACTIVITY_DRAIN_TIMEOUT: float = float(os.getenv("ACTIVITY_DRAIN_TIMEOUT", "10.0"))
+    # Failed batches are retried with doubling delays before being dropped
+    ACTIVITY_FLUSH_RETRIES: int = int(os.getenv("ACTIVITY_FLUSH_RETRIES", "3"))
+    ACTIVITY_RETRY_BACKOFF: float = float(os.getenv("ACTIVITY_RETRY_BACKOFF", "0.5"))
+
+    # OAuth login state: "memory" (single worker) or "signed" (stateless,
+    # works across workers and nodes sharing SECRET_KEY)
+    OAUTH_STATE_BACKEND: str = os.getenv("OAUTH_STATE_BACKEND", "memory")
+    OAUTH_STATE_TTL: int = int(os.getenv("OAUTH_STATE_TTL", "600"))
+    OAUTH_STATE_MAX_ENTRIES: int = int(os.getenv("OAUTH_STATE_MAX_ENTRIES", "10000"))
+
+    # Production server (startup.py). WEB_CONCURRENCY=0 sizes the worker
+    # count from the CPUs available to the process
+    WEB_CONCURRENCY: int = int(os.getenv("WEB_CONCURRENCY", "0"))
+    WORKERS_PER_CORE: float = float(os.getenv("WORKERS_PER_CORE", "1"))
+    MAX_WORKERS: int = int(os.getenv("MAX_WORKERS", "0"))
+    # Event loop/HTTP parser: "auto", "uvloop" (with httptools) or "asyncio"
+    SERVER_LOOP: str = os.getenv("SERVER_LOOP", "auto")
+    # Recycle workers after this many requests (plus random jitter)
+    SERVER_MAX_REQUESTS: int = int(os.getenv("SERVER_MAX_REQUESTS", "10000"))
+    SERVER_MAX_REQUESTS_JITTER: int = int(os.getenv("SERVER_MAX_REQUESTS_JITTER", "1000"))
+    SERVER_TIMEOUT: int = int(os.getenv("SERVER_TIMEOUT", "60"))
+    SERVER_GRACEFUL_TIMEOUT: int = int(os.getenv("SERVER_GRACEFUL_TIMEOUT", "30"))
+    SERVER_KEEPALIVE: int = int(os.getenv("SERVER_KEEPALIVE", "5"))
+    SERVER_PRELOAD: bool = os.getenv("SERVER_PRELOAD", "True").lower() == "true"
+    # Worker processes serving the app; set by startup.py, so per-process
+    # caches can tell whether other workers exist
+    SERVER_WORKERS: int = int(os.getenv("SERVER_WORKERS", "1"))
+
+    # Logging. "production" switches console output to JSON lines
+    ENVIRONMENT: str = os.getenv("ENVIRONMENT", "development")
+    LOG_LEVEL: str = os.getenv("LOG_LEVEL", "INFO")
+    # Records buffered for the writer thread before new ones are dropped
+    LOG_QUEUE_SIZE: int = int(os.getenv("LOG_QUEUE_SIZE", "10000"))
+    # Per-logger limits for records below WARNING, as "logger=value" pairs:
+    # max records per second, and fraction of records kept
+    LOG_RATE_LIMITS: str = os.getenv("LOG_RATE_LIMITS", "app.auth=20")
+    LOG_SAMPLE_RATES: str = os.getenv("LOG_SAMPLE_RATES", "")
+
+    # Prometheus metrics served at /metrics: to scrapers sending METRICS_TOKEN
+    # as a bearer token, or to admins when no token is set
+    METRICS_ENABLED: bool = os.getenv("METRICS_ENABLED", "True").lower() == "true"
+    METRICS_TOKEN: str = os.getenv("METRICS_TOKEN", "")
+
+    # Per-request profiling (X-Profile header, admins only) and slow query log.
+    # Slow SELECTs can also be re-run under EXPLAIN ANALYZE after the response
+    PROFILER_ENABLED: bool = os.getenv("PROFILER_ENABLED", "True").lower() == "true"
+    SLOW_QUERY_THRESHOLD: float = float(os.getenv("SLOW_QUERY_THRESHOLD", "0.5"))
+    SLOW_QUERY_EXPLAIN: bool = os.getenv("SLOW_QUERY_EXPLAIN", "False").lower() == "true"
+
     # First superuser
     FIRST_SUPERUSER_EMAIL: str = os.getenv("FIRST_SUPERUSER_EMAIL", "admin@example.com")
     FIRST_SUPERUSER_NAME: str = os.getenv("FIRST_SUPERUSER_NAME", "Admin")
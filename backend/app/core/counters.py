@@ -0,0 +1,108 @@
+"""
+Periodic reconciliation of the dashboard counters.
+
+entity_counters is kept current by triggers; this job recomputes it every
+STATS_RECONCILE_INTERVAL seconds to repair drift from writes that bypassed
+the triggers (manual fixes, restores, disabled triggers).
+
+Every worker runs the job, but only the one holding a session-level
+advisory lock on a dedicated connection reconciles; the others try to take
+the lock over on each interval, which they get as soon as the holder's
+connection goes away.
+"""
+
+import asyncio
+import logging
+from typing import Any, Dict, Optional
+
+import asyncpg
+
+from app.core.config import settings
+from app.crud.crud_stats import stats
+from app.db.session import ASYNCPG_DSN, async_session
+
+logger = logging.getLogger(__name__)
+
+# Distinct from the lock reconcile_entity_counters() takes for each run
+LEADER_LOCK = "counter_reconciler_leader"
+
+
+class CounterReconciler:
+    def __init__(self, interval: float):
+        self.interval = interval
+        self.runs = 0
+        self.repaired = 0
+        self.failures = 0
+        self._task: Optional[asyncio.Task] = None
+        self._leader_conn: Optional[asyncpg.Connection] = None
+
+    async def reconcile(self) -> int:
+        async with async_session() as session:
+            repaired = await stats.reconcile(session)
+        self.runs += 1
+        self.repaired += repaired
+        if repaired:
+            logger.warning(f"Repaired {repaired} drifted entity counters")
+        return repaired
+
+    def start(self) -> None:
+        if self.interval > 0 and self._task is None:
+            self._task = asyncio.create_task(self._run())
+
+    async def stop(self) -> None:
+        if self._task is not None:
+            task, self._task = self._task, None
+            task.cancel()
+            try:
+                await task
+            except asyncio.CancelledError:
+                pass
+        if self._leader_conn is not None:
+            # Closing the session releases the lock for another worker
+            conn, self._leader_conn = self._leader_conn, None
+            await conn.close()
+
+    async def _is_leader(self) -> bool:
+        if self._leader_conn is not None:
+            conn = self._leader_conn
+            try:
+                # The lock lives as long as the session; make sure it is still up
+                await conn.fetchval("SELECT 1")
+                return True
+            except Exception as e:
+                self._leader_conn = None
+                conn.terminate()
+                logger.warning(f"Lost the counter reconciler lock connection | Error: {str(e)}")
+        conn = await asyncpg.connect(ASYNCPG_DSN)
+        try:
+            elected = await conn.fetchval("SELECT pg_try_advisory_lock(hashtext($1))", LEADER_LOCK)
+        except BaseException:
+            await conn.close()
+            raise
+        if not elected:
+            await conn.close()
+            return False
+        self._leader_conn = conn
+        logger.info("Elected to reconcile entity counters")
+        return True
+
+    async def _run(self) -> None:
+        while True:
+            await asyncio.sleep(self.interval)
+            try:
+                if await self._is_leader():
+                    await self.reconcile()
+            except Exception as e:
+                self.failures += 1
+                logger.error(f"Entity counter reconciliation failed | Error: {str(e)}")
+
+    def stats(self) -> Dict[str, Any]:
+        return {
+            "leader": self._leader_conn is not None,
+            "runs": self.runs,
+            "repaired": self.repaired,
+            "failures": self.failures,
+        }
+
+
+counter_reconciler = CounterReconciler(settings.STATS_RECONCILE_INTERVAL)
@@ -3,30 +3,37 @@ Microsoft Graph API utilities for the backend.
 This module handles all interactions with Microsoft Graph API.
 """
 
-import requests
+import asyncio
+import logging
+import time
 from fastapi import HTTPException, status
-from typing import Dict, Any, Optional
+from typing import Dict, Any, Optional, Tuple
 
 from app.core.config import settings
+from app.core.http import get_http_client
 
 # Microsoft Graph API endpoint
 MICROSOFT_GRAPH_ENDPOINT = "https://graph.microsoft.com/v1.0"
 
-async def get_graph_token() -> str:
+logger = logging.getLogger(__name__)
+
+GRAPH_DEFAULT_SCOPE = "https://graph.microsoft.com/.default"
+
+async def _request_graph_token(scope: str) -> Tuple[str, int]:
     """
-    Get an access token for Microsoft Graph API using client credentials flow.
-    This is for application-level permissions, not user-delegated permissions.
+    Run a client credentials exchange and return (access_token, expires_in).
     """
     token_url = f"https://login.microsoftonline.com/{settings.AZURE_TENANT_ID}/oauth2/v2.0/token"
     
     data = {
         "client_id": settings.AZURE_CLIENT_ID,
         "client_secret": settings.AZURE_CLIENT_SECRET,
-        "scope": "https://graph.microsoft.com/.default",
+        "scope": scope,
         "grant_type": "client_credentials"
     }
     
-    response = requests.post(token_url, data=data)
+    client = get_http_client()
+    response = await client.post(token_url, data=data)
     
     if response.status_code != 200:
         raise HTTPException(
@@ -35,7 +42,92 @@ async def get_graph_token() -> str:
         )
     
     token_data = response.json()
-    return token_data["access_token"]
+    return token_data["access_token"], int(token_data.get("expires_in", 3599))
+
+class GraphTokenCache:
+    """
+    In-process cache of app-only Graph tokens, keyed by scope.
+
+    Tokens are served until shortly before they expire. Once a token enters
+    the refresh window a single background refresh is started while callers
+    keep using the current token. Concurrent callers that find no usable
+    token all await the same in-flight exchange.
+    """
+
+    def __init__(self, refresh_margin: float, expiry_skew: float):
+        self.refresh_margin = refresh_margin
+        self.expiry_skew = expiry_skew
+        self._tokens: Dict[str, Tuple[str, float]] = {}
+        self._inflight: Dict[str, asyncio.Task] = {}
+        self.hits = 0
+        self.misses = 0
+        self.refreshes = 0
+        self.failures = 0
+
+    async def get(self, scope: str) -> str:
+        now = time.monotonic()
+        cached = self._tokens.get(scope)
+        if cached and cached[1] - self.expiry_skew > now:
+            self.hits += 1
+            if cached[1] - now <= self.refresh_margin:
+                self._start_refresh(scope)
+            return cached[0]
+        
+        self.misses += 1
+        # Shield so a cancelled caller does not abort the shared refresh
+        return await asyncio.shield(self._start_refresh(scope))
+
+    def invalidate(self, scope: Optional[str] = None) -> None:
+        if scope is None:
+            self._tokens.clear()
+        else:
+            self._tokens.pop(scope, None)
+
+    def stats(self) -> Dict[str, int]:
+        return {
+            "hits": self.hits,
+            "misses": self.misses,
+            "refreshes": self.refreshes,
+            "failures": self.failures,
+            "size": len(self._tokens),
+        }
+
+    def _start_refresh(self, scope: str) -> asyncio.Task:
+        task = self._inflight.get(scope)
+        if task is None:
+            task = asyncio.ensure_future(self._refresh(scope))
+            self._inflight[scope] = task
+            task.add_done_callback(lambda t: self._refresh_done(scope, t))
+        return task
+
+    def _refresh_done(self, scope: str, task: asyncio.Task) -> None:
+        self._inflight.pop(scope, None)
+        # Retrieve the exception so background failures are not reported as unhandled
+        if not task.cancelled() and task.exception() is not None:
+            self.failures += 1
+            logger.warning(
+                f"Graph token refresh failed | Scope: {scope} | "
+                f"Error: {task.exception()}"
+            )
+
+    async def _refresh(self, scope: str) -> str:
+        access_token, expires_in = await _request_graph_token(scope)
+        self._tokens[scope] = (access_token, time.monotonic() + expires_in)
+        self.refreshes += 1
+        return access_token
+
+graph_token_cache = GraphTokenCache(
+    refresh_margin=settings.GRAPH_TOKEN_REFRESH_MARGIN,
+    expiry_skew=settings.GRAPH_TOKEN_EXPIRY_SKEW,
+)
+
+async def get_graph_token(scope: str = GRAPH_DEFAULT_SCOPE) -> str:
+    """
+    Get an access token for Microsoft Graph API using client credentials flow.
+    This is for application-level permissions, not user-delegated permissions.
+    Tokens are cached per scope until shortly before they expire.
+    """
+    return await graph_token_cache.get(scope)
 
 async def get_user_profile(user_id: str, access_token: Optional[str] = None) -> Dict[str, Any]:
     """
@@ -56,7 +148,8 @@ async def get_user_profile(user_id: str, access_token: Optional[str] = None) ->
         "Content-Type": "application/json"
     }
     
-    response = requests.get(f"{MICROSOFT_GRAPH_ENDPOINT}/users/{user_id}", headers=headers)
+    client = get_http_client()
+    response = await client.get(f"{MICROSOFT_GRAPH_ENDPOINT}/users/{user_id}", headers=headers)
     
     if response.status_code != 200:
         raise HTTPException(
@@ -84,7 +177,8 @@ async def get_user_photo(user_id: str, access_token: Optional[str] = None) -> by
         "Authorization": f"Bearer {access_token}",
     }
     
-    response = requests.get(f"{MICROSOFT_GRAPH_ENDPOINT}/users/{user_id}/photo/$value", headers=headers)
+    client = get_http_client()
+    response = await client.get(f"{MICROSOFT_GRAPH_ENDPOINT}/users/{user_id}/photo/$value", headers=headers)
     
     if response.status_code != 200:
         raise HTTPException(
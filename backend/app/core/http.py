@@ -0,0 +1,86 @@
+"""
+Shared outbound HTTP client for the backend.
+All calls to Microsoft Entra ID and Microsoft Graph go through a single
+pooled httpx.AsyncClient owned by the application lifespan.
+"""
+
+from typing import Optional
+import httpx
+
+from app.core.config import settings
+from app.core.metrics import OUTBOUND_EVENT_HOOKS
+from app.core.profiler import PROFILER_EVENT_HOOKS
+
+# Hosts we talk to; each gets its own connection pool and limits
+AZURE_LOGIN_HOST = "https://login.microsoftonline.com"
+MICROSOFT_GRAPH_HOST = "https://graph.microsoft.com"
+
+_client: Optional[httpx.AsyncClient] = None
+
+
+def _build_transport() -> httpx.AsyncHTTPTransport:
+    """
+    Build a keep-alive transport capped at HTTP_MAX_CONNECTIONS_PER_HOST.
+    """
+    limits = httpx.Limits(
+        max_connections=settings.HTTP_MAX_CONNECTIONS_PER_HOST,
+        max_keepalive_connections=settings.HTTP_MAX_KEEPALIVE_CONNECTIONS,
+        keepalive_expiry=settings.HTTP_KEEPALIVE_EXPIRY,
+    )
+    return httpx.AsyncHTTPTransport(limits=limits, retries=settings.HTTP_CONNECT_RETRIES)
+
+
+def create_http_client() -> httpx.AsyncClient:
+    """
+    Create a new pooled client with explicit timeouts and per-host limits.
+    Every call is timed into the outbound request metrics and the
+    current request's profile.
+    """
+    timeout = httpx.Timeout(
+        settings.HTTP_TIMEOUT,
+        connect=settings.HTTP_CONNECT_TIMEOUT,
+        pool=settings.HTTP_POOL_TIMEOUT,
+    )
+    return httpx.AsyncClient(
+        timeout=timeout,
+        transport=_build_transport(),
+        mounts={
+            AZURE_LOGIN_HOST: _build_transport(),
+            MICROSOFT_GRAPH_HOST: _build_transport(),
+        },
+        event_hooks={
+            event: OUTBOUND_EVENT_HOOKS[event] + PROFILER_EVENT_HOOKS[event]
+            for event in ("request", "response")
+        },
+    )
+
+
+async def init_http_client() -> httpx.AsyncClient:
+    """
+    Create the shared client. Called from the application lifespan.
+    """
+    global _client
+    if _client is None:
+        _client = create_http_client()
+    return _client
+
+
+async def close_http_client() -> None:
+    """
+    Close the shared client and release pooled connections.
+    """
+    global _client
+    if _client is not None:
+        client, _client = _client, None
+        await client.aclose()
+
+
+def get_http_client() -> httpx.AsyncClient:
+    """
+    Return the shared client, creating it lazily when used outside the
+    application lifespan (scripts, one-off tasks).
+    """
+    global _client
+    if _client is None:
+        _client = create_http_client()
+    return _client
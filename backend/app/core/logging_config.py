@@ -0,0 +1,251 @@
+"""
+Queued logging pipeline.
+
+Handlers never format or write records on the calling thread (usually the
+event loop): the root logger has a single QueueHandler that puts records on
+a bounded queue, and a QueueListener thread formats them and writes them to
+stderr. When the queue is full the record is dropped and counted rather than
+blocking the request.
+
+Before a record is queued, a filter applies per-logger limits to records
+below WARNING, so chatty hot-path loggers cannot flood the queue:
+
+* LOG_RATE_LIMITS: ``logger=N`` pairs allowing at most N records per second
+  (token bucket with a one second burst)
+* LOG_SAMPLE_RATES: ``logger=F`` pairs keeping a fraction F of records
+
+A setting for a logger also covers its children, e.g. ``app.routers=50``.
+Warnings and errors are never rate limited or sampled.
+"""
+
+import atexit
+import copy
+import logging
+import os
+import queue
+import random
+import threading
+import time
+from datetime import datetime, timezone
+from logging.handlers import QueueHandler, QueueListener
+from typing import Any, Dict, Optional, Tuple
+
+from app.core.config import settings
+from app.core.serialization import dumps
+
+# Attributes every LogRecord has; anything else was passed with `extra=`
+RESERVED_ATTRS = frozenset(vars(logging.makeLogRecord({}))) | {"message", "asctime"}
+
+TEXT_FORMAT = "%(asctime)s | %(levelname)s | %(name)s | %(message)s"
+
+_EXCEPTION_FORMATTER = logging.Formatter()
+
+
+def parse_logger_limits(value: str) -> Dict[str, float]:
+    """
+    Parse "logger=value,other.logger=value" into a dict.
+    """
+    limits = {}
+    for item in value.split(","):
+        name, sep, limit = item.partition("=")
+        if sep and name.strip():
+            limits[name.strip()] = float(limit)
+    return limits
+
+
+class JsonFormatter(logging.Formatter):
+    def format(self, record: logging.LogRecord) -> str:
+        log_record = {
+            # Formatting happens later on the listener thread, so use the record's own time
+            "timestamp": datetime.fromtimestamp(record.created, timezone.utc).isoformat(),
+            "level": record.levelname,
+            "logger": record.name,
+            "message": record.getMessage(),
+        }
+
+        if record.exc_info:
+            log_record["exception"] = self.formatException(record.exc_info)
+        elif record.exc_text:
+            log_record["exception"] = record.exc_text
+
+        # Add any extra attributes
+        attrs = record.__dict__
+        for key in attrs.keys() - RESERVED_ATTRS:
+            log_record[key] = attrs[key]
+
+        return dumps(log_record).decode()
+
+
+class LogThrottleFilter(logging.Filter):
+    """
+    Per-logger rate limiting and sampling for records below WARNING.
+    """
+
+    def __init__(self, rate_limits: Dict[str, float], sample_rates: Dict[str, float]):
+        super().__init__()
+        self.rate_limits = rate_limits
+        self.sample_rates = sample_rates
+        # Resolved (rate, sample) per logger name, including inherited settings
+        self._resolved: Dict[str, Tuple[Optional[float], Optional[float]]] = {}
+        # Token bucket state per logger name: [tokens, last refill]
+        self._buckets: Dict[str, list] = {}
+        self._lock = threading.Lock()
+        self.rate_limited = 0
+        self.sampled_out = 0
+
+    def _resolve(self, name: str) -> Tuple[Optional[float], Optional[float]]:
+        resolved = self._resolved.get(name)
+        if resolved is None:
+            rate = sample = None
+            node = name
+            while node and (rate is None or sample is None):
+                if rate is None:
+                    rate = self.rate_limits.get(node)
+                if sample is None:
+                    sample = self.sample_rates.get(node)
+                node = node.rpartition(".")[0]
+            resolved = self._resolved[name] = (rate, sample)
+        return resolved
+
+    def filter(self, record: logging.LogRecord) -> bool:
+        if record.levelno >= logging.WARNING:
+            return True
+        rate, sample = self._resolve(record.name)
+        if sample is not None and random.random() >= sample:
+            self.sampled_out += 1
+            return False
+        if rate is not None:
+            now = time.monotonic()
+            with self._lock:
+                bucket = self._buckets.get(record.name)
+                if bucket is None:
+                    bucket = self._buckets[record.name] = [rate, now]
+                tokens = min(rate, bucket[0] + (now - bucket[1]) * rate)
+                bucket[1] = now
+                if tokens < 1:
+                    bucket[0] = tokens
+                    self.rate_limited += 1
+                    return False
+                bucket[0] = tokens - 1
+        return True
+
+
+class DroppingQueueHandler(QueueHandler):
+    """
+    QueueHandler that drops records instead of blocking when the queue is full.
+    """
+
+    def __init__(self, log_queue: queue.Queue):
+        super().__init__(log_queue)
+        self.enqueued = 0
+        self.dropped = 0
+
+    def prepare(self, record: logging.LogRecord) -> logging.LogRecord:
+        # Only what cannot cross threads is done here: merging the arguments
+        # (they may change after the call) and rendering the traceback.
+        # Unlike the default, the traceback stays out of the message so the
+        # listener's formatter can place it.
+        record = copy.copy(record)
+        record.msg = record.getMessage()
+        record.args = None
+        if record.exc_info:
+            record.exc_text = _EXCEPTION_FORMATTER.formatException(record.exc_info)
+            record.exc_info = None
+        return record
+
+    def enqueue(self, record: logging.LogRecord) -> None:
+        try:
+            self.queue.put_nowait(record)
+        except queue.Full:
+            self.dropped += 1
+        else:
+            self.enqueued += 1
+
+
+class DrainingQueueListener(QueueListener):
+    def enqueue_sentinel(self) -> None:
+        # Wait for room rather than fail when stopping with a full queue
+        self.queue.put(self._sentinel)
+
+
+class LoggingPipeline:
+    def __init__(self, max_queue: int):
+        self.max_queue = max_queue
+        self.handler: Optional[DroppingQueueHandler] = None
+        self.listener: Optional[DrainingQueueListener] = None
+        self.throttle: Optional[LogThrottleFilter] = None
+
+    def start(self, output: logging.Handler, throttle: LogThrottleFilter) -> DroppingQueueHandler:
+        self.throttle = throttle
+        self.handler = DroppingQueueHandler(queue.Queue(maxsize=self.max_queue))
+        self.handler.addFilter(throttle)
+        self.listener = DrainingQueueListener(self.handler.queue, output, respect_handler_level=True)
+        self.listener.start()
+        return self.handler
+
+    def stop(self) -> None:
+        """
+        Stop the listener after it has written everything already queued.
+        """
+        if self.listener is not None and self.listener._thread is not None:
+            self.listener.stop()
+
+    def after_fork(self) -> None:
+        # The listener thread does not survive fork (gunicorn preload), and the
+        # inherited queue's lock may have been held mid-put: start afresh
+        if self.listener is None:
+            return
+        self.handler.queue = queue.Queue(maxsize=self.max_queue)
+        self.listener.queue = self.handler.queue
+        self.listener._thread = None
+        self.listener.start()
+
+    def stats(self) -> Dict[str, Any]:
+        if self.handler is None:
+            return {}
+        return {
+            "queue_depth": self.handler.queue.qsize(),
+            "queue_capacity": self.max_queue,
+            "enqueued": self.handler.enqueued,
+            "dropped": self.handler.dropped,
+            "rate_limited": self.throttle.rate_limited,
+            "sampled_out": self.throttle.sampled_out,
+        }
+
+
+log_pipeline = LoggingPipeline(max_queue=settings.LOG_QUEUE_SIZE)
+
+
+def setup_logging() -> None:
+    """
+    Route every log record through the queued pipeline. Safe to call more than once.
+    """
+    root_logger = logging.getLogger()
+    root_logger.setLevel(settings.LOG_LEVEL.upper())
+
+    # Clear existing handlers
+    for handler in root_logger.handlers[:]:
+        root_logger.removeHandler(handler)
+    log_pipeline.stop()
+
+    # Console output with JSON formatting in production, readable format in development
+    console_handler = logging.StreamHandler()
+    if settings.ENVIRONMENT == "production":
+        console_handler.setFormatter(JsonFormatter())
+    else:
+        console_handler.setFormatter(logging.Formatter(TEXT_FORMAT))
+
+    throttle = LogThrottleFilter(
+        rate_limits=parse_logger_limits(settings.LOG_RATE_LIMITS),
+        sample_rates=parse_logger_limits(settings.LOG_SAMPLE_RATES),
+    )
+    root_logger.addHandler(log_pipeline.start(console_handler, throttle))
+
+    # Set specific log levels for different modules
+    logging.getLogger("uvicorn").setLevel(logging.WARNING)
+    logging.getLogger("sqlalchemy").setLevel(logging.WARNING)
+
+
+atexit.register(log_pipeline.stop)
+if hasattr(os, "register_at_fork"):
+    os.register_at_fork(after_in_child=log_pipeline.after_fork)
@@ -0,0 +1,180 @@
+"""
+Prometheus metrics for the API, its database pool and outbound HTTP calls.
+
+Requests are measured by MetricsMiddleware, a pure ASGI middleware labelled
+by route template (``/api/v1/projects/{id}``) rather than raw path, so label
+cardinality stays bounded; requests that match no route share one label.
+
+Under gunicorn or uvicorn with several workers, startup.py points
+PROMETHEUS_MULTIPROC_DIR at a shared directory before the app is imported.
+Each worker then writes its samples to memory-mapped files there, and
+/metrics, whichever worker serves it, reports the sum over all workers.
+"""
+
+import os
+import time
+from typing import Any, Dict, Optional, Tuple
+
+import httpx
+from prometheus_client import (
+    CONTENT_TYPE_LATEST,
+    REGISTRY,
+    CollectorRegistry,
+    Counter,
+    Gauge,
+    Histogram,
+    generate_latest,
+    multiprocess,
+)
+from starlette.types import ASGIApp, Message, Receive, Scope, Send
+
+# Label for requests that did not match any route (404s, probes)
+UNMATCHED_ROUTE = "unmatched"
+
+LATENCY_BUCKETS = (0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0)
+
+HTTP_REQUESTS = Counter(
+    "http_requests_total",
+    "HTTP requests handled, by route template and status code.",
+    ["method", "route", "status"],
+)
+HTTP_REQUEST_DURATION = Histogram(
+    "http_request_duration_seconds",
+    "Time from receiving a request to sending the last byte of its response.",
+    ["method", "route"],
+    buckets=LATENCY_BUCKETS,
+)
+HTTP_REQUESTS_IN_PROGRESS = Gauge(
+    "http_requests_in_progress",
+    "HTTP requests currently being handled.",
+    ["method"],
+    multiprocess_mode="livesum",
+)
+
+DB_POOL_SIZE = Gauge(
+    "db_pool_size",
+    "Configured connections kept open by the database pool.",
+    multiprocess_mode="livesum",
+)
+DB_POOL_CHECKED_OUT = Gauge(
+    "db_pool_checked_out",
+    "Database connections currently checked out of the pool.",
+    multiprocess_mode="livesum",
+)
+DB_POOL_OVERFLOW = Gauge(
+    "db_pool_overflow",
+    "Database connections open beyond the pool size.",
+    multiprocess_mode="livesum",
+)
+DB_POOL_CHECKOUT_WAIT = Histogram(
+    "db_pool_checkout_wait_seconds",
+    "Time spent waiting to check a connection out of the pool.",
+    buckets=(0.0005, 0.001, 0.005, 0.01, 0.05, 0.1, 0.5, 1.0, 5.0, 30.0),
+)
+DB_POOL_TIMEOUTS = Counter(
+    "db_pool_timeouts_total",
+    "Pool checkouts that gave up after DB_POOL_TIMEOUT.",
+)
+
+OUTBOUND_REQUEST_DURATION = Histogram(
+    "outbound_http_request_duration_seconds",
+    "Time until response headers arrive for calls to Entra ID and Microsoft Graph.",
+    ["host", "method", "status"],
+    buckets=LATENCY_BUCKETS,
+)
+
+
+class MetricsMiddleware:
+    """
+    Records count, latency and status of every HTTP request.
+    """
+
+    def __init__(self, app: ASGIApp):
+        self.app = app
+        # Labelled children by label values; .labels() takes a lock and
+        # builds a key on every call, a dict hit does not
+        self._in_progress: Dict[str, Any] = {}
+        self._requests: Dict[Tuple[str, str, int], Any] = {}
+        self._durations: Dict[Tuple[str, str], Any] = {}
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+
+        method = scope["method"]
+        status_code = 500
+
+        async def send_wrapper(message: Message) -> None:
+            nonlocal status_code
+            if message["type"] == "http.response.start":
+                status_code = message["status"]
+            await send(message)
+
+        in_progress = self._in_progress.get(method)
+        if in_progress is None:
+            in_progress = self._in_progress[method] = HTTP_REQUESTS_IN_PROGRESS.labels(method)
+        in_progress.inc()
+        started = time.perf_counter()
+        try:
+            await self.app(scope, receive, send_wrapper)
+        finally:
+            elapsed = time.perf_counter() - started
+            in_progress.dec()
+            # The router stores the matched route in the (shared) scope
+            route = scope.get("route")
+            template = getattr(route, "path_format", None) or UNMATCHED_ROUTE
+
+            key = (method, template, status_code)
+            requests = self._requests.get(key)
+            if requests is None:
+                requests = self._requests[key] = HTTP_REQUESTS.labels(
+                    method, template, str(status_code)
+                )
+            requests.inc()
+
+            duration = self._durations.get(key[:2])
+            if duration is None:
+                duration = self._durations[key[:2]] = HTTP_REQUEST_DURATION.labels(method, template)
+            duration.observe(elapsed)
+
+
+async def _start_outbound_timer(request: httpx.Request) -> None:
+    request.extensions["metrics_started"] = time.perf_counter()
+
+
+async def _observe_outbound(response: httpx.Response) -> None:
+    request = response.request
+    started: Optional[float] = request.extensions.get("metrics_started")
+    if started is not None:
+        OUTBOUND_REQUEST_DURATION.labels(
+            request.url.host, request.method, str(response.status_code)
+        ).observe(time.perf_counter() - started)
+
+
+# For httpx.AsyncClient(event_hooks=...)
+OUTBOUND_EVENT_HOOKS = {
+    "request": [_start_outbound_timer],
+    "response": [_observe_outbound],
+}
+
+
+def render_metrics() -> bytes:
+    """
+    Current metrics in the Prometheus text format, summed over all workers
+    when running in multiprocess mode.
+    """
+    if "PROMETHEUS_MULTIPROC_DIR" in os.environ:
+        registry = CollectorRegistry()
+        multiprocess.MultiProcessCollector(registry)
+        return generate_latest(registry)
+    return generate_latest(REGISTRY)
+
+
+def mark_worker_dead(pid: int) -> None:
+    """
+    Drop a dead worker's live gauges (in-flight requests, pool occupancy).
+    """
+    if "PROMETHEUS_MULTIPROC_DIR" in os.environ:
+        multiprocess.mark_process_dead(pid)
+
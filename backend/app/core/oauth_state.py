@@ -0,0 +1,165 @@
+"""
+Storage for the OAuth `state` parameter of the Entra ID login flow.
+
+A state is issued when a login starts and consumed by the callback, which
+gets back the redirect URI the login started with. The backend is chosen
+with OAUTH_STATE_BACKEND:
+
+* ``memory``: per-process store with a TTL and a size bound. Only works when
+  the callback reaches the worker that started the login.
+* ``signed``: stateless HS256 token carrying the redirect URI and expiry,
+  valid on any worker or node that shares SECRET_KEY.
+
+Either way the router also binds the state to the browser with a cookie,
+so a state obtained by someone else cannot complete a login.
+"""
+
+import secrets
+import time
+from abc import ABC, abstractmethod
+from collections import OrderedDict
+from typing import Dict, Optional, Tuple
+
+from jose import JWTError, jwt
+
+from app.core.config import settings
+
+# Token type claim, so session tokens signed with the same key never pass as state
+STATE_TOKEN_TYPE = "oauth_state"
+
+
+class StateStore(ABC):
+    """
+    Storage interface for OAuth login states.
+    """
+
+    @abstractmethod
+    async def issue(self, redirect_uri: str) -> str:
+        ...
+
+    @abstractmethod
+    async def consume(self, state: str) -> Optional[str]:
+        """
+        Return the redirect URI for a valid state, or None. A state can be
+        consumed at most once where the backend can enforce it.
+        """
+
+    def stats(self) -> Dict[str, int]:
+        return {}
+
+
+class MemoryStateStore(StateStore):
+    """
+    Per-process store bounded by TTL and entry count.
+
+    Every entry has the same TTL, so insertion order is expiry order:
+    sweeping pops expired entries off the front of the OrderedDict and
+    stops at the first live one, which makes each sweep O(expired).
+    """
+
+    def __init__(self, ttl: float, max_entries: int):
+        self.ttl = ttl
+        self.max_entries = max_entries
+        self._states: "OrderedDict[str, Tuple[str, float]]" = OrderedDict()
+        self.issued = 0
+        self.consumed = 0
+        self.expired = 0
+        self.evicted = 0
+
+    async def issue(self, redirect_uri: str) -> str:
+        self._sweep()
+        state = secrets.token_urlsafe(32)
+        self._states[state] = (redirect_uri, time.monotonic() + self.ttl)
+        self.issued += 1
+        while len(self._states) > self.max_entries:
+            # Oldest pending login is the one most likely abandoned
+            self._states.popitem(last=False)
+            self.evicted += 1
+        return state
+
+    async def consume(self, state: str) -> Optional[str]:
+        self._sweep()
+        entry = self._states.pop(state, None)
+        if entry is None:
+            return None
+        self.consumed += 1
+        return entry[0]
+
+    def _sweep(self) -> None:
+        now = time.monotonic()
+        while self._states:
+            _, expires_at = next(iter(self._states.values()))
+            if expires_at > now:
+                break
+            self._states.popitem(last=False)
+            self.expired += 1
+
+    def stats(self) -> Dict[str, int]:
+        return {
+            "pending": len(self._states),
+            "issued": self.issued,
+            "consumed": self.consumed,
+            "expired": self.expired,
+            "evicted": self.evicted,
+        }
+
+
+class SignedStateStore(StateStore):
+    """
+    Stateless store: the state is a signed token, so nothing is kept
+    server-side and any worker can validate it. A token stays valid until
+    it expires; replays are stopped by the browser-bound cookie and the
+    single-use authorization code.
+    """
+
+    def __init__(self, secret_key: str, ttl: float):
+        self.secret_key = secret_key
+        self.ttl = ttl
+        self.issued = 0
+        self.consumed = 0
+        self.rejected = 0
+
+    async def issue(self, redirect_uri: str) -> str:
+        self.issued += 1
+        return jwt.encode(
+            {
+                "typ": STATE_TOKEN_TYPE,
+                "redirect_uri": redirect_uri,
+                # Makes every state unique, like the memory backend's tokens
+                "nonce": secrets.token_urlsafe(16),
+                "exp": int(time.time() + self.ttl),
+            },
+            self.secret_key,
+            algorithm="HS256",
+        )
+
+    async def consume(self, state: str) -> Optional[str]:
+        try:
+            claims = jwt.decode(state, self.secret_key, algorithms=["HS256"])
+        except JWTError:
+            self.rejected += 1
+            return None
+        if claims.get("typ") != STATE_TOKEN_TYPE:
+            self.rejected += 1
+            return None
+        self.consumed += 1
+        return claims.get("redirect_uri")
+
+    def stats(self) -> Dict[str, int]:
+        return {
+            "issued": self.issued,
+            "consumed": self.consumed,
+            "rejected": self.rejected,
+        }
+
+
+def create_state_store() -> StateStore:
+    if settings.OAUTH_STATE_BACKEND == "signed":
+        return SignedStateStore(settings.SECRET_KEY, ttl=settings.OAUTH_STATE_TTL)
+    return MemoryStateStore(
+        ttl=settings.OAUTH_STATE_TTL,
+        max_entries=settings.OAUTH_STATE_MAX_ENTRIES,
+    )
+
+
+state_store = create_state_store()
@@ -0,0 +1,313 @@
+"""
+Profile photo cache for Microsoft Graph user photos.
+
+Photo metadata (existence, ETag, content digest) lives in a bounded in-memory
+LRU. Photo bytes are kept in memory, or in an optional on-disk store
+addressed by their SHA-256 digest when PHOTO_CACHE_DIR is set. Both stores
+are bounded in bytes (PHOTO_CACHE_MAX_BYTES, PHOTO_CACHE_DISK_MAX_BYTES):
+memory evicts least recently used photos, the disk store deletes the least
+recently read files. Expired entries are revalidated against Graph with
+If-None-Match, and missing photos are remembered for a shorter negative TTL.
+Failed lookups (Graph errors, token or network failures) are remembered for
+PHOTO_CACHE_ERROR_TTL so an outage costs one Graph call per user per
+interval rather than one per request.
+
+Photos are served from signed URLs so that an <img> tag, which cannot send
+the Authorization header, can load them.
+"""
+
+import asyncio
+import hashlib
+import hmac
+import logging
+import os
+import threading
+import time
+from collections import OrderedDict
+from pathlib import Path
+from typing import Dict, Optional
+
+import httpx
+from fastapi import HTTPException
+
+from app.core.config import settings
+from app.core.graph import MICROSOFT_GRAPH_ENDPOINT, get_graph_token
+from app.core.http import get_http_client
+
+logger = logging.getLogger(__name__)
+
+# Pruning the disk store deletes files until it is back under this share of the limit
+DISK_PRUNE_TARGET = 0.9
+
+
+def _photo_signature(user_id: str, version: str, expires: int) -> str:
+    message = f"{user_id}:{version}:{expires}".encode()
+    return hmac.new(settings.SECRET_KEY.encode(), message, hashlib.sha256).hexdigest()
+
+
+def sign_photo_url(user_id: str, digest: str) -> str:
+    """
+    Path and query of a photo URL valid for PHOTO_URL_TTL to 2 * PHOTO_URL_TTL
+    seconds. The expiry is rounded to the TTL so the URL, and the browser's
+    cached copy, stays the same within each window.
+    """
+    ttl = settings.PHOTO_URL_TTL
+    expires = (int(time.time()) // ttl + 2) * ttl
+    version = digest[:16]
+    signature = _photo_signature(user_id, version, expires)
+    return (
+        f"{settings.API_V1_STR}/auth/photo/{user_id}"
+        f"?v={version}&exp={expires}&sig={signature}"
+    )
+
+
+def verify_photo_signature(user_id: str, version: str, expires: int, signature: str) -> bool:
+    if expires < time.time():
+        return False
+    return hmac.compare_digest(_photo_signature(user_id, version, expires), signature)
+
+
+class PhotoEntry:
+    __slots__ = ("etag", "content_type", "digest", "content", "expires_at")
+
+    def __init__(
+        self,
+        expires_at: float,
+        etag: Optional[str] = None,
+        content_type: Optional[str] = None,
+        digest: Optional[str] = None,
+        content: Optional[bytes] = None,
+    ):
+        self.expires_at = expires_at
+        self.etag = etag
+        self.content_type = content_type
+        self.digest = digest
+        self.content = content
+
+    @property
+    def exists(self) -> bool:
+        return self.digest is not None
+
+
+class PhotoCache:
+    def __init__(
+        self,
+        max_entries: int,
+        ttl: float,
+        negative_ttl: float,
+        error_ttl: float,
+        max_bytes: int,
+        disk_dir: Optional[str] = None,
+        disk_max_bytes: int = 0,
+    ):
+        self.max_entries = max_entries
+        self.ttl = ttl
+        self.negative_ttl = negative_ttl
+        self.error_ttl = error_ttl
+        self.max_bytes = max_bytes
+        self.disk_dir = Path(disk_dir) if disk_dir else None
+        self.disk_max_bytes = disk_max_bytes
+        self._entries: "OrderedDict[str, PhotoEntry]" = OrderedDict()
+        # Photo bytes held in memory by the entries above
+        self._bytes = 0
+        # Bytes in the disk store; unknown until the first prune scans it
+        self._disk_bytes: Optional[int] = None
+        # Disk writes and pruning run in worker threads
+        self._disk_lock = threading.Lock()
+        self.evictions = 0
+        self.disk_evictions = 0
+        self.errors = 0
+        self._inflight: Dict[str, asyncio.Task] = {}
+        self.hits = 0
+        self.misses = 0
+        self.revalidations = 0
+        self.not_modified = 0
+
+    async def get(self, user_id: str) -> PhotoEntry:
+        """
+        Get the photo entry for a user, fetching or revalidating it at most
+        once per TTL. Concurrent callers share a single Graph request.
+        """
+        entry = self._entries.get(user_id)
+        if entry is not None and entry.expires_at > time.monotonic():
+            self._entries.move_to_end(user_id)
+            self.hits += 1
+            return entry
+
+        self.misses += 1
+        task = self._inflight.get(user_id)
+        if task is None:
+            task = asyncio.ensure_future(self._fetch(user_id, entry))
+            self._inflight[user_id] = task
+            task.add_done_callback(lambda _: self._inflight.pop(user_id, None))
+        return await asyncio.shield(task)
+
+    async def read_content(self, entry: PhotoEntry) -> Optional[bytes]:
+        """
+        Return the photo bytes for an entry from memory or the disk store.
+        """
+        if entry.content is not None or entry.digest is None:
+            return entry.content
+        path = self._content_path(entry.digest)
+        try:
+            return await asyncio.to_thread(self._read_file, path)
+        except FileNotFoundError:
+            return None
+
+    def invalidate(self, user_id: str) -> None:
+        self._discard(self._entries.pop(user_id, None))
+
+    def stats(self) -> Dict[str, int]:
+        return {
+            "hits": self.hits,
+            "misses": self.misses,
+            "revalidations": self.revalidations,
+            "not_modified": self.not_modified,
+            "size": len(self._entries),
+            "bytes": self._bytes,
+            "evictions": self.evictions,
+            "disk_bytes": self._disk_bytes or 0,
+            "disk_evictions": self.disk_evictions,
+            "errors": self.errors,
+        }
+
+    async def _fetch(self, user_id: str, previous: Optional[PhotoEntry]) -> PhotoEntry:
+        try:
+            access_token = await get_graph_token()
+            headers = {"Authorization": f"Bearer {access_token}"}
+            if previous is not None and previous.etag:
+                headers["If-None-Match"] = previous.etag
+                self.revalidations += 1
+
+            client = get_http_client()
+            response = await client.get(
+                f"{MICROSOFT_GRAPH_ENDPOINT}/users/{user_id}/photo/$value",
+                headers=headers,
+            )
+        except (HTTPException, httpx.HTTPError) as e:
+            logger.warning(f"Failed to fetch photo | User: {user_id} | Error: {e!r}")
+            return self._store_failure(user_id, previous)
+        now = time.monotonic()
+
+        if response.status_code == 304 and previous is not None:
+            self.not_modified += 1
+            previous.expires_at = now + self.ttl
+            entry = previous
+        elif response.status_code == 200:
+            content = response.content
+            digest = hashlib.sha256(content).hexdigest()
+            entry = PhotoEntry(
+                expires_at=now + self.ttl,
+                etag=response.headers.get("ETag"),
+                content_type=response.headers.get("Content-Type", "image/jpeg"),
+                digest=digest,
+            )
+            if self.disk_dir is not None:
+                await asyncio.to_thread(self._write_content, digest, content)
+            else:
+                entry.content = content
+        elif response.status_code == 404:
+            logger.debug(f"No photo found for user: {user_id}")
+            entry = PhotoEntry(expires_at=now + self.negative_ttl)
+        else:
+            logger.warning(
+                f"Unexpected status code when fetching photo | "
+                f"User: {user_id} | Status: {response.status_code}"
+            )
+            return self._store_failure(user_id, previous)
+
+        self._store(user_id, entry)
+        return entry
+
+    def _store_failure(self, user_id: str, previous: Optional[PhotoEntry]) -> PhotoEntry:
+        # Keep serving what we had, but back off before asking Graph again
+        self.errors += 1
+        now = time.monotonic()
+        entry = previous or PhotoEntry(expires_at=now)
+        entry.expires_at = now + self.error_ttl
+        self._store(user_id, entry)
+        return entry
+
+    def _store(self, user_id: str, entry: PhotoEntry) -> None:
+        self._discard(self._entries.pop(user_id, None))
+        self._entries[user_id] = entry
+        if entry.content is not None:
+            self._bytes += len(entry.content)
+        while len(self._entries) > self.max_entries or (
+            self._bytes > self.max_bytes and len(self._entries) > 1
+        ):
+            _, evicted = self._entries.popitem(last=False)
+            self._discard(evicted)
+            self.evictions += 1
+
+    def _discard(self, entry: Optional[PhotoEntry]) -> None:
+        if entry is not None and entry.content is not None:
+            self._bytes -= len(entry.content)
+
+    def _content_path(self, digest: str) -> Path:
+        return self.disk_dir / digest[:2] / digest
+
+    @staticmethod
+    def _read_file(path: Path) -> bytes:
+        content = path.read_bytes()
+        # The modification time marks recent use for pruning
+        os.utime(path)
+        return content
+
+    def _write_content(self, digest: str, content: bytes) -> None:
+        path = self._content_path(digest)
+        if path.exists():
+            return
+        path.parent.mkdir(parents=True, exist_ok=True)
+        tmp_path = path.with_suffix(f".{os.getpid()}.tmp")
+        tmp_path.write_bytes(content)
+        os.replace(tmp_path, path)
+        with self._disk_lock:
+            if self._disk_bytes is not None:
+                self._disk_bytes += len(content)
+            if self.disk_max_bytes and (
+                self._disk_bytes is None or self._disk_bytes > self.disk_max_bytes
+            ):
+                self._prune_disk()
+
+    def _prune_disk(self) -> None:
+        """
+        Delete the least recently used files until the store is under its
+        limit. Other workers share the directory, so the total is rescanned
+        rather than trusted. Called with the disk lock held.
+        """
+        files = []
+        for bucket in os.scandir(self.disk_dir):
+            if not bucket.is_dir():
+                continue
+            for item in os.scandir(bucket.path):
+                try:
+                    stat = item.stat()
+                except FileNotFoundError:
+                    continue
+                files.append((stat.st_mtime, stat.st_size, item.path))
+        total = sum(size for _, size, _ in files)
+        if total > self.disk_max_bytes:
+            target = self.disk_max_bytes * DISK_PRUNE_TARGET
+            files.sort()
+            for _, size, file_path in files:
+                if total <= target:
+                    break
+                try:
+                    os.remove(file_path)
+                except FileNotFoundError:
+                    pass
+                total -= size
+                self.disk_evictions += 1
+        self._disk_bytes = total
+
+
+photo_cache = PhotoCache(
+    max_entries=settings.PHOTO_CACHE_MAX_ENTRIES,
+    ttl=settings.PHOTO_CACHE_TTL,
+    negative_ttl=settings.PHOTO_CACHE_NEGATIVE_TTL,
+    error_ttl=settings.PHOTO_CACHE_ERROR_TTL,
+    max_bytes=settings.PHOTO_CACHE_MAX_BYTES,
+    disk_dir=settings.PHOTO_CACHE_DIR,
+    disk_max_bytes=settings.PHOTO_CACHE_DISK_MAX_BYTES,
+)
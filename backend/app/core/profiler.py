@@ -0,0 +1,230 @@
+"""
+Per-request query profiling.
+
+ProfilerMiddleware gives every HTTP request a RequestProfile held in a
+context variable. Engine events add each SQL statement's count and time to
+it, the shared httpx client adds outbound calls, and the JSON encoders add
+serialization time.
+
+Statements slower than SLOW_QUERY_THRESHOLD seconds are logged with their
+parameters. With SLOW_QUERY_EXPLAIN, slow SELECTs are also re-run under
+EXPLAIN (ANALYZE, BUFFERS) on a separate connection in a background task
+once the request is done, and the plan is logged.
+
+Admins can profile a single request by sending ``X-Profile: 1`` (or
+``X-Profile: explain`` to capture plans for that request's slow SELECTs)
+with a session token carrying the admin role. The response then has a
+Server-Timing header with db, http and serialize durations, which browser
+developer tools display per request.
+"""
+
+import asyncio
+import logging
+import time
+from contextvars import ContextVar
+from typing import Any, List, Optional, Set, Tuple
+
+import httpx
+from jose import JWTError, jwt
+from sqlalchemy import event
+from sqlalchemy.engine import Engine
+from sqlalchemy.ext.asyncio import AsyncEngine
+from starlette.datastructures import MutableHeaders
+from starlette.types import ASGIApp, Message, Receive, Scope, Send
+
+from app.core.config import settings
+
+logger = logging.getLogger(__name__)
+
+PROFILE_HEADER = b"x-profile"
+PROFILE_EXPLAIN = "explain"
+# Plans captured per request at most; each one re-runs its query
+MAX_EXPLAINS_PER_REQUEST = 5
+# Logged parameters are cut off beyond this many characters
+MAX_LOGGED_PARAMS = 1000
+
+
+class RequestProfile:
+    __slots__ = (
+        "path", "enabled", "explain", "db_count", "db_time", "http_count",
+        "http_time", "serialize_time", "explain_queue",
+    )
+
+    def __init__(self, path: str, enabled: bool = False, explain: bool = False):
+        self.path = path
+        self.enabled = enabled
+        self.explain = explain
+        self.db_count = 0
+        self.db_time = 0.0
+        self.http_count = 0
+        self.http_time = 0.0
+        self.serialize_time = 0.0
+        # (engine, statement, parameters) of slow SELECTs to explain
+        self.explain_queue: List[Tuple[Engine, str, Any]] = []
+
+    def server_timing(self, total: float) -> str:
+        return (
+            f'db;dur={self.db_time * 1000:.2f};desc="{self.db_count} queries", '
+            f'http;dur={self.http_time * 1000:.2f};desc="{self.http_count} calls", '
+            f"serialize;dur={self.serialize_time * 1000:.2f}, "
+            f"total;dur={total * 1000:.2f}"
+        )
+
+
+_current_profile: ContextVar[Optional[RequestProfile]] = ContextVar(
+    "request_profile", default=None
+)
+
+# The event loop only keeps weak references to tasks
+_explain_tasks: Set[asyncio.Task] = set()
+
+
+def record_serialization(elapsed: float) -> None:
+    profile = _current_profile.get()
+    if profile is not None:
+        profile.serialize_time += elapsed
+
+
+def _is_admin(authorization: Optional[bytes]) -> bool:
+    # The role claim in the session token is enough here; this only decides
+    # whether timings are shown, not access to any data
+    if not authorization or not authorization.startswith(b"Bearer "):
+        return False
+    try:
+        claims = jwt.decode(
+            authorization[7:].decode("latin-1"), settings.SECRET_KEY, algorithms=["HS256"]
+        )
+    except JWTError:
+        return False
+    return claims.get("role") == "admin"
+
+
+class ProfilerMiddleware:
+    """
+    Attributes queries, outbound calls and serialization to each request.
+    """
+
+    def __init__(self, app: ASGIApp):
+        self.app = app
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+
+        switch = authorization = None
+        for name, value in scope["headers"]:
+            if name == PROFILE_HEADER:
+                switch = value.decode("latin-1").lower()
+            elif name == b"authorization":
+                authorization = value
+        enabled = switch is not None and _is_admin(authorization)
+        profile = RequestProfile(
+            scope["path"],
+            enabled=enabled,
+            explain=settings.SLOW_QUERY_EXPLAIN or (enabled and switch == PROFILE_EXPLAIN),
+        )
+        started = time.perf_counter()
+
+        async def send_wrapper(message: Message) -> None:
+            if profile.enabled and message["type"] == "http.response.start":
+                headers = MutableHeaders(scope=message)
+                headers.append("Server-Timing", profile.server_timing(time.perf_counter() - started))
+            await send(message)
+
+        token = _current_profile.set(profile)
+        try:
+            await self.app(scope, receive, send_wrapper if enabled else send)
+        finally:
+            _current_profile.reset(token)
+            if profile.explain_queue:
+                # Captured in the background so neither this request nor its
+                # latency metric waits for the plans
+                task = asyncio.create_task(explain_queries(profile))
+                _explain_tasks.add(task)
+                task.add_done_callback(_explain_tasks.discard)
+
+
+async def explain_queries(profile: RequestProfile) -> None:
+    for sync_engine, statement, parameters in profile.explain_queue[:MAX_EXPLAINS_PER_REQUEST]:
+        try:
+            async with AsyncEngine(sync_engine).connect() as conn:
+                # The EXPLAIN is as slow as the query; keep it out of the slow query log
+                await conn.execution_options(skip_slow_query_log=True)
+                result = await conn.exec_driver_sql(
+                    f"EXPLAIN (ANALYZE, BUFFERS) {statement}", parameters
+                )
+                plan = "\n".join(row[0] for row in result)
+                # Closing without commit rolls back whatever ANALYZE executed
+        except Exception as e:
+            logger.error(f"Could not explain slow query | Path: {profile.path} | Error: {str(e)}")
+            continue
+        logger.warning("Plan for slow query | Path: %s | %s\n%s", profile.path, statement, plan)
+
+
+def _format_parameters(parameters: Any) -> str:
+    text = repr(parameters)
+    if len(text) > MAX_LOGGED_PARAMS:
+        text = text[:MAX_LOGGED_PARAMS] + "..."
+    return text
+
+
+@event.listens_for(Engine, "before_cursor_execute")
+def _start_query_timer(conn, cursor, statement, parameters, context, executemany) -> None:
+    # Kept on the execution context, which is discarded with the statement
+    # whether or not it succeeds
+    if context is not None:
+        context._query_started = time.perf_counter()
+
+
+@event.listens_for(Engine, "after_cursor_execute")
+def _record_query(conn, cursor, statement, parameters, context, executemany) -> None:
+    started = getattr(context, "_query_started", None)
+    if started is None:
+        return
+    elapsed = time.perf_counter() - started
+    # SQLAlchemy runs async engines' events in a greenlet sharing the
+    # caller's context, so the request's profile is visible here
+    profile = _current_profile.get()
+    if profile is not None:
+        profile.db_count += 1
+        profile.db_time += elapsed
+
+    if settings.SLOW_QUERY_THRESHOLD <= 0 or elapsed < settings.SLOW_QUERY_THRESHOLD:
+        return
+    if conn.get_execution_options().get("skip_slow_query_log"):
+        return
+    logger.warning(
+        "Slow query | %.1f ms | Path: %s | %s | Parameters: %s",
+        elapsed * 1000,
+        profile.path if profile is not None else "-",
+        statement,
+        _format_parameters(parameters),
+    )
+    if (
+        profile is not None
+        and profile.explain
+        and not executemany
+        and statement.lstrip()[:6].upper() == "SELECT"
+    ):
+        profile.explain_queue.append((conn.engine, statement, parameters))
+
+
+async def _start_outbound_timer(request: httpx.Request) -> None:
+    if _current_profile.get() is not None:
+        request.extensions["profile_started"] = time.perf_counter()
+
+
+async def _record_outbound(response: httpx.Response) -> None:
+    started = response.request.extensions.get("profile_started")
+    profile = _current_profile.get()
+    if started is not None and profile is not None:
+        profile.http_count += 1
+        profile.http_time += time.perf_counter() - started
+
+
+# For httpx.AsyncClient(event_hooks=...)
+PROFILER_EVENT_HOOKS = {
+    "request": [_start_outbound_timer],
+    "response": [_record_outbound],
+}
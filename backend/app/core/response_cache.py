@@ -0,0 +1,225 @@
+"""
+Versioned cache for encoded API responses.
+
+Cached bodies are keyed by a namespace version, so invalidation is a single
+version bump: writers bump the namespaces they touch and readers simply stop
+finding the old keys, which then age out through LRU eviction or TTL.
+The storage backend is pluggable; the in-memory backend is per worker, the
+Redis backend is shared across workers and nodes. A per-worker cache cannot
+see other workers' invalidations, so it is only used when a single worker
+serves the app (see ResponseCache.consistent).
+"""
+
+import logging
+import os
+import secrets
+import time
+from abc import ABC, abstractmethod
+from collections import OrderedDict
+from typing import Dict, Optional, Tuple
+
+from app.core.config import settings
+
+logger = logging.getLogger(__name__)
+
+
+class CacheBackend(ABC):
+    """
+    Storage interface for the response cache.
+    """
+
+    # Whether every worker sees the same entries and versions
+    shared: bool = False
+
+    @abstractmethod
+    async def get(self, key: str) -> Optional[bytes]:
+        ...
+
+    @abstractmethod
+    async def set(self, key: str, value: bytes, ttl: int) -> None:
+        ...
+
+    @abstractmethod
+    async def get_version(self, namespace: str) -> str:
+        ...
+
+    @abstractmethod
+    async def bump_version(self, *namespaces: str) -> None:
+        ...
+
+    async def close(self) -> None:
+        pass
+
+
+class MemoryCacheBackend(CacheBackend):
+    """
+    Per-process LRU bounded by entry count and total body size.
+    """
+
+    def __init__(self, max_entries: int, max_bytes: int):
+        self.max_entries = max_entries
+        self.max_bytes = max_bytes
+        self._entries: "OrderedDict[str, Tuple[bytes, float]]" = OrderedDict()
+        self._size = 0
+        self._versions: Dict[str, int] = {}
+        # Versions restart at zero with the process; the epoch keeps them
+        # from colliding with versions handed out before a restart or by
+        # another process. It is made on first use and again after a fork,
+        # so workers forked from a preloading master never share one.
+        self._epoch: Optional[str] = None
+        self._epoch_pid: Optional[int] = None
+
+    async def get(self, key: str) -> Optional[bytes]:
+        cached = self._entries.get(key)
+        if cached is None:
+            return None
+        if cached[1] <= time.monotonic():
+            self._evict(key)
+            return None
+        self._entries.move_to_end(key)
+        return cached[0]
+
+    async def set(self, key: str, value: bytes, ttl: int) -> None:
+        if len(value) > self.max_bytes:
+            return
+        if key in self._entries:
+            self._evict(key)
+        self._entries[key] = (value, time.monotonic() + ttl)
+        self._size += len(value)
+        while len(self._entries) > self.max_entries or self._size > self.max_bytes:
+            self._evict(next(iter(self._entries)))
+
+    async def get_version(self, namespace: str) -> str:
+        return f"{self._get_epoch()}.{self._versions.get(namespace, 0)}"
+
+    def _get_epoch(self) -> str:
+        pid = os.getpid()
+        if self._epoch_pid != pid:
+            # Whatever a parent process cached belongs to its own epoch
+            self._entries.clear()
+            self._size = 0
+            self._versions.clear()
+            self._epoch = secrets.token_hex(4)
+            self._epoch_pid = pid
+        return self._epoch
+
+    async def bump_version(self, *namespaces: str) -> None:
+        for namespace in namespaces:
+            self._versions[namespace] = self._versions.get(namespace, 0) + 1
+
+    def _evict(self, key: str) -> None:
+        value, _ = self._entries.pop(key)
+        self._size -= len(value)
+
+
+class RedisCacheBackend(CacheBackend):
+    """
+    Shared backend for multi-worker deployments. Requires the `redis` package.
+    """
+
+    shared = True
+
+    def __init__(self, url: str, prefix: str = "respcache:"):
+        try:
+            import redis.asyncio as redis
+        except ImportError:
+            raise RuntimeError(
+                "RESPONSE_CACHE_BACKEND=redis requires the 'redis' package"
+            )
+        self.prefix = prefix
+        self._redis = redis.from_url(url)
+
+    async def get(self, key: str) -> Optional[bytes]:
+        return await self._redis.get(self.prefix + key)
+
+    async def set(self, key: str, value: bytes, ttl: int) -> None:
+        await self._redis.set(self.prefix + key, value, ex=ttl)
+
+    async def get_version(self, namespace: str) -> str:
+        version = await self._redis.get(f"{self.prefix}version:{namespace}")
+        return version.decode() if version else "0"
+
+    async def bump_version(self, *namespaces: str) -> None:
+        async with self._redis.pipeline(transaction=False) as pipe:
+            for namespace in namespaces:
+                pipe.incr(f"{self.prefix}version:{namespace}")
+            await pipe.execute()
+
+    async def close(self) -> None:
+        await self._redis.aclose()
+
+
+class ResponseCache:
+    def __init__(self, backend: CacheBackend, ttl: int):
+        self.backend = backend
+        self.ttl = ttl
+        self.hits = 0
+        self.misses = 0
+        self.invalidations = 0
+
+    @property
+    def consistent(self) -> bool:
+        """
+        Whether versions seen here reflect every write. A per-process
+        backend only sees its own worker's invalidations.
+        """
+        return self.backend.shared or settings.SERVER_WORKERS <= 1
+
+    async def versioned_key(self, namespace: str, *parts: object) -> str:
+        """
+        Build a cache key bound to the current version of `namespace`.
+        """
+        version = await self.backend.get_version(namespace)
+        return ":".join([namespace, version, *(str(p) for p in parts)])
+
+    async def get(self, key: str) -> Optional[bytes]:
+        if not self.consistent:
+            return None
+        value = await self.backend.get(key)
+        if value is None:
+            self.misses += 1
+        else:
+            self.hits += 1
+        return value
+
+    async def set(self, key: str, value: bytes) -> None:
+        if self.consistent:
+            await self.backend.set(key, value, self.ttl)
+
+    async def invalidate(self, *namespaces: str) -> None:
+        self.invalidations += 1
+        await self.backend.bump_version(*namespaces)
+
+    async def close(self) -> None:
+        await self.backend.close()
+
+    def stats(self) -> Dict[str, int]:
+        return {
+            "hits": self.hits,
+            "misses": self.misses,
+            "invalidations": self.invalidations,
+        }
+
+
+def create_cache_backend() -> CacheBackend:
+    if settings.RESPONSE_CACHE_BACKEND == "redis":
+        return RedisCacheBackend(settings.RESPONSE_CACHE_URL)
+    if settings.SERVER_WORKERS > 1:
+        logger.warning(
+            "RESPONSE_CACHE_BACKEND=memory is per worker; list caching and "
+            "version ETags are off with multiple workers. Use RESPONSE_CACHE_BACKEND=redis"
+        )
+    return MemoryCacheBackend(
+        max_entries=settings.RESPONSE_CACHE_MAX_ENTRIES,
+        max_bytes=settings.RESPONSE_CACHE_MAX_BYTES,
+    )
+
+
+response_cache = ResponseCache(create_cache_backend(), ttl=settings.RESPONSE_CACHE_TTL)
+
+
+def projects_namespace(owner_id: Optional[str] = None) -> str:
+    """
+    Namespace for project listings: one per owner, plus one for unfiltered lists.
+    """
+    return f"projects:owner:{owner_id}" if owner_id else "projects:all"
@@ -1,32 +1,178 @@
-from datetime import datetime, timedelta
+import asyncio
+import logging
+import time
 from typing import Any, Dict, Optional
-from jose import JWTError, jwt
+from jose import JWTError, jwk, jwt
+from jose.backends.base import Key
 from fastapi import HTTPException, status
-import requests
 
 from app.core.config import settings
+from app.core.http import get_http_client
 
-# Microsoft Entra ID JWKS URI
-MICROSOFT_JWKS_URI = f"https://login.microsoftonline.com/{settings.MICROSOFT_TENANT_ID}/discovery/v2.0/keys"
+logger = logging.getLogger(__name__)
+
+# Microsoft Entra ID JWKS URI and v2.0 token issuer
+MICROSOFT_JWKS_URI = f"https://login.microsoftonline.com/{settings.AZURE_TENANT_ID}/discovery/v2.0/keys"
+MICROSOFT_ISSUER = f"https://login.microsoftonline.com/{settings.AZURE_TENANT_ID}/v2.0"
+
+class JWKSCache:
+    """
+    Signing keys from a JWKS endpoint, indexed by 'kid'.
+
+    Keys are parsed once and reused, so verifying a token only costs the
+    signature check. Once started, a background task refreshes the key set
+    every `refresh_interval` seconds (retrying failures after
+    `min_refresh_interval`). Tokens naming an unknown 'kid' also trigger a
+    refresh, at most once per `min_refresh_interval` seconds.
+    """
+
+    def __init__(self, jwks_uri: str, refresh_interval: float, min_refresh_interval: float):
+        self.jwks_uri = jwks_uri
+        self.refresh_interval = refresh_interval
+        self.min_refresh_interval = min_refresh_interval
+        self._keys: Dict[str, Key] = {}
+        self._raw_keys: Dict[str, Dict[str, Any]] = {}
+        # Last successful fetch, and last attempt (which rate limits refreshes)
+        self._fetched_at: Optional[float] = None
+        self._attempted_at: Optional[float] = None
+        self._lock = asyncio.Lock()
+        self._task: Optional[asyncio.Task] = None
+        self.refreshes = 0
+        self.failures = 0
+
+    async def get_key(self, kid: str) -> Key:
+        if self._fetched_at is None:
+            # The scheduled refresh has not succeeded yet
+            await self.refresh()
+
+        key = self._keys.get(kid)
+        if key is None and time.monotonic() - self._attempted_at >= self.min_refresh_interval:
+            # Possibly a key rotation we have not seen yet
+            await self.refresh()
+            key = self._keys.get(kid)
+
+        if key is None:
+            raise HTTPException(
+                status_code=status.HTTP_401_UNAUTHORIZED,
+                detail="Invalid token: unknown signing key",
+                headers={"WWW-Authenticate": "Bearer"},
+            )
+        return key
+
+    async def refresh(self) -> bool:
+        """
+        Fetch the key set. Returns False if the fetch failed and the cached
+        keys were kept; raises 503 if there are no cached keys to keep.
+        """
+        started = time.monotonic()
+        async with self._lock:
+            # Another caller refreshed while we were waiting for the lock
+            if self._attempted_at is not None and self._attempted_at >= started:
+                return self._fetched_at == self._attempted_at
+
+            self._attempted_at = time.monotonic()
+            try:
+                client = get_http_client()
+                response = await client.get(self.jwks_uri)
+                response.raise_for_status()
+                jwks = response.json()
+            except Exception as e:
+                self.failures += 1
+                if self._fetched_at is None:
+                    logger.error(f"Could not fetch JWKS | Error: {str(e)}")
+                    raise HTTPException(
+                        status_code=status.HTTP_503_SERVICE_UNAVAILABLE,
+                        detail="Could not fetch token signing keys",
+                    )
+                # Keep the keys we have; _attempted_at holds off retries for
+                # the rate limit window while _fetched_at still shows their age
+                logger.warning(f"JWKS refresh failed, keeping cached keys | Error: {str(e)}")
+                return False
+
+            keys: Dict[str, Key] = {}
+            raw_keys: Dict[str, Dict[str, Any]] = {}
+            for key_data in jwks.get("keys", []):
+                kid = key_data.get("kid")
+                if not kid or key_data.get("kty") != "RSA":
+                    continue
+                raw_keys[kid] = key_data
+                # Reuse parsed keys that did not change
+                if self._raw_keys.get(kid) == key_data:
+                    keys[kid] = self._keys[kid]
+                else:
+                    keys[kid] = jwk.construct(key_data, algorithm=key_data.get("alg", "RS256"))
+
+            self._keys = keys
+            self._raw_keys = raw_keys
+            self._fetched_at = self._attempted_at
+            self.refreshes += 1
+            return True
+
+    def start(self) -> None:
+        if self.refresh_interval > 0 and self._task is None:
+            self._task = asyncio.create_task(self._run())
+
+    async def stop(self) -> None:
+        if self._task is not None:
+            task, self._task = self._task, None
+            task.cancel()
+            try:
+                await task
+            except asyncio.CancelledError:
+                pass
+
+    async def _run(self) -> None:
+        # Fetch right away so the first request does not wait for the keys
+        while True:
+            try:
+                refreshed = await self.refresh()
+            except HTTPException:
+                refreshed = False
+            await asyncio.sleep(self.refresh_interval if refreshed else self.min_refresh_interval)
+
+    def stats(self) -> Dict[str, Any]:
+        return {
+            "keys": len(self._keys),
+            "age_seconds": (
+                round(time.monotonic() - self._fetched_at, 1) if self._fetched_at is not None else None
+            ),
+            "refreshes": self.refreshes,
+            "failures": self.failures,
+        }
+
+jwks_cache = JWKSCache(
+    MICROSOFT_JWKS_URI,
+    refresh_interval=settings.JWKS_REFRESH_INTERVAL,
+    min_refresh_interval=settings.JWKS_MIN_REFRESH_INTERVAL,
+)
 
 async def verify_token(token: str) -> Dict[str, Any]:
     """
     Verify and decode a JWT token from Microsoft Entra ID.
-    
-    In a production environment, you would:
-    1. Fetch the JWKS (JSON Web Key Set) from Microsoft
-    2. Find the key that matches the token's 'kid' (Key ID)
-    3. Verify the token signature using the public key
-    4. Verify the token claims (issuer, audience, expiration)
+
+    The signing key is looked up by the token's 'kid' in the cached JWKS,
+    then the signature, issuer, audience and expiration are verified.
     """
     try:
-        # For this example, we'll use a simplified approach
+        header = jwt.get_unverified_header(token)
+    except JWTError as e:
+        raise HTTPException(
+            status_code=status.HTTP_401_UNAUTHORIZED,
+            detail=f"Invalid token: {str(e)}",
+            headers={"WWW-Authenticate": "Bearer"},
+        )
+
+    key = await jwks_cache.get_key(header.get("kid"))
+
+    try:
         payload = jwt.decode(
             token,
-            options={"verify_signature": False},  # In production, set this to True
-            audience=settings.MICROSOFT_CLIENT_ID,
+            key,
+            algorithms=["RS256"],
+            audience=settings.AZURE_CLIENT_ID,
+            issuer=MICROSOFT_ISSUER,
         )
-        
+
         return payload
     except JWTError as e:
         raise HTTPException(
@@ -0,0 +1,111 @@
+"""
+Fast JSON serialization for API responses and logs.
+
+With FAST_JSON enabled (and orjson installed) ORJSONResponse becomes the
+default response class, and hot endpoints encode ORM rows with precompiled
+RowSerializers instead of re-validating trusted database output through
+their response models.
+"""
+
+import json
+import logging
+import time
+from operator import attrgetter
+from typing import Any, Iterable, List, Type
+
+from fastapi.responses import JSONResponse, ORJSONResponse, Response
+from pydantic import BaseModel, TypeAdapter
+
+from app.core.config import settings
+from app.core.profiler import record_serialization
+
+try:
+    import orjson
+except ImportError:
+    orjson = None
+
+logger = logging.getLogger(__name__)
+
+FAST_JSON = settings.FAST_JSON and orjson is not None
+if settings.FAST_JSON and orjson is None:
+    logger.warning("FAST_JSON is enabled but orjson is not installed; using stdlib json")
+
+# UTC datetimes end in "Z", matching pydantic's JSON output
+_ORJSON_OPTIONS = orjson.OPT_UTC_Z if orjson is not None else 0
+
+
+class TimedRenderMixin:
+    """
+    Adds the time spent encoding a response body to the request profile.
+    """
+
+    def render(self, content: Any) -> bytes:
+        started = time.perf_counter()
+        body = super().render(content)
+        record_serialization(time.perf_counter() - started)
+        return body
+
+
+class TimedJSONResponse(TimedRenderMixin, JSONResponse):
+    pass
+
+
+class TimedORJSONResponse(TimedRenderMixin, ORJSONResponse):
+    pass
+
+
+DefaultResponse = TimedORJSONResponse if FAST_JSON else TimedJSONResponse
+
+
+def dumps(obj: Any) -> bytes:
+    """
+    Encode obj as JSON bytes, falling back to str() for unknown types.
+    """
+    if orjson is not None:
+        return orjson.dumps(obj, default=str, option=_ORJSON_OPTIONS)
+    return json.dumps(obj, default=str, separators=(",", ":")).encode()
+
+
+class RowSerializer:
+    """
+    Encodes ORM rows with a schema's fields.
+
+    On the fast path rows are read with one precompiled attrgetter and
+    handed straight to orjson; otherwise they go through a TypeAdapter so
+    the output is identical to FastAPI's response_model handling.
+    """
+
+    def __init__(self, schema: Type[BaseModel]):
+        self.fields = tuple(schema.model_fields)
+        self._getter = attrgetter(*self.fields)
+        self._adapter = TypeAdapter(schema)
+        self._list_adapter = TypeAdapter(List[schema])
+
+    def to_dict(self, obj: Any) -> dict:
+        return dict(zip(self.fields, self._getter(obj)))
+
+    def dump(self, obj: Any) -> bytes:
+        started = time.perf_counter()
+        if FAST_JSON:
+            body = dumps(self.to_dict(obj))
+        else:
+            body = self._adapter.dump_json(
+                self._adapter.validate_python(obj, from_attributes=True)
+            )
+        record_serialization(time.perf_counter() - started)
+        return body
+
+    def dump_list(self, objs: Iterable[Any]) -> bytes:
+        started = time.perf_counter()
+        if FAST_JSON:
+            getter, fields = self._getter, self.fields
+            body = dumps([dict(zip(fields, getter(obj))) for obj in objs])
+        else:
+            body = self._list_adapter.dump_json(
+                self._list_adapter.validate_python(objs, from_attributes=True)
+            )
+        record_serialization(time.perf_counter() - started)
+        return body
+
+    def response(self, obj: Any, **kwargs: Any) -> Response:
+        return Response(content=self.dump(obj), media_type="application/json", **kwargs)
@@ -0,0 +1,237 @@
+"""
+In-process cache of authenticated users, keyed by the token subject.
+
+Entries expire after USER_CACHE_TTL seconds and the cache is bounded to
+USER_CACHE_MAX_ENTRIES with LRU eviction. ORM flushes that modify or delete
+a User invalidate its entry locally, and UPDATE/DELETE statements against
+users clear the cache. With USER_CACHE_BROADCAST enabled the invalidation
+is also published through Postgres NOTIFY so every worker drops its copy
+once the transaction commits. If the listening connection drops, the
+worker clears its cache and reconnects with exponential backoff, clearing
+again once it is listening, since invalidations sent in between are lost.
+"""
+
+import asyncio
+import logging
+import time
+from collections import OrderedDict
+from typing import Any, Dict, Optional, Tuple
+
+import asyncpg
+from sqlalchemy import event, text
+from sqlalchemy.orm import Session
+
+from app.core.config import settings
+from app.db.session import ASYNCPG_DSN
+from app.models.user import User
+
+logger = logging.getLogger(__name__)
+
+USER_CACHE_CHANNEL = "user_cache_invalidate"
+# Payload meaning "drop every cached user"
+ALL_USERS = "*"
+# Backoff between attempts to re-establish the LISTEN connection, in seconds
+RECONNECT_MIN_DELAY = 1.0
+RECONNECT_MAX_DELAY = 30.0
+
+
+class UserCache:
+    def __init__(self, max_entries: int, ttl: float):
+        self.max_entries = max_entries
+        self.ttl = ttl
+        self._entries: "OrderedDict[str, Tuple[Dict[str, Any], float]]" = OrderedDict()
+        self.hits = 0
+        self.misses = 0
+        self.invalidations = 0
+
+    def get(self, user_id: str) -> Optional[User]:
+        """
+        Return a fresh, session-less User for a cached id, or None.
+        """
+        cached = self._entries.get(user_id)
+        if cached is None or cached[1] <= time.monotonic():
+            self.misses += 1
+            return None
+        self._entries.move_to_end(user_id)
+        self.hits += 1
+        # Hand out a new transient instance so requests never share ORM state
+        return User(**cached[0])
+
+    def set(self, user: User) -> None:
+        data = {
+            "id": user.id,
+            "email": user.email,
+            "name": user.name,
+            "role": user.role,
+            "created_at": user.created_at,
+        }
+        self._entries[user.id] = (data, time.monotonic() + self.ttl)
+        self._entries.move_to_end(user.id)
+        while len(self._entries) > self.max_entries:
+            self._entries.popitem(last=False)
+
+    def invalidate(self, user_id: str) -> None:
+        if self._entries.pop(user_id, None) is not None:
+            self.invalidations += 1
+
+    def clear(self) -> None:
+        self._entries.clear()
+
+    def stats(self) -> Dict[str, Any]:
+        lookups = self.hits + self.misses
+        return {
+            "hits": self.hits,
+            "misses": self.misses,
+            "hit_rate": round(self.hits / lookups, 4) if lookups else 0.0,
+            "invalidations": self.invalidations,
+            "size": len(self._entries),
+        }
+
+
+class UserCacheBroadcaster:
+    """
+    Listens for invalidations published by other workers over LISTEN/NOTIFY.
+    """
+
+    def __init__(self, cache: UserCache, channel: str = USER_CACHE_CHANNEL):
+        self.cache = cache
+        self.channel = channel
+        self._conn: Optional[asyncpg.Connection] = None
+        self._reconnect_task: Optional[asyncio.Task] = None
+        self.disconnects = 0
+        self.reconnects = 0
+
+    async def start(self) -> None:
+        try:
+            await self._connect()
+        except Exception as e:
+            logger.error(f"Could not listen for user cache invalidations, retrying | Error: {str(e)}")
+            self._schedule_reconnect()
+
+    async def stop(self) -> None:
+        if self._reconnect_task is not None:
+            task, self._reconnect_task = self._reconnect_task, None
+            task.cancel()
+            try:
+                await task
+            except asyncio.CancelledError:
+                pass
+        if self._conn is not None:
+            # Cleared first so the termination listener ignores this close
+            conn, self._conn = self._conn, None
+            await conn.close()
+
+    async def _connect(self) -> None:
+        conn = await asyncpg.connect(ASYNCPG_DSN)
+        try:
+            await conn.add_listener(self.channel, self._on_notify)
+        except BaseException:
+            await conn.close()
+            raise
+        conn.add_termination_listener(self._on_terminate)
+        self._conn = conn
+        logger.info(f"Listening for user cache invalidations on '{self.channel}'")
+
+    def _on_terminate(self, conn) -> None:
+        if conn is not self._conn:
+            return
+        self._conn = None
+        self.disconnects += 1
+        self.cache.clear()
+        logger.warning("Lost the user cache invalidation connection, cache cleared; reconnecting")
+        self._schedule_reconnect()
+
+    def _schedule_reconnect(self) -> None:
+        if self._reconnect_task is None or self._reconnect_task.done():
+            self._reconnect_task = asyncio.create_task(self._reconnect())
+
+    async def _reconnect(self) -> None:
+        delay = RECONNECT_MIN_DELAY
+        while True:
+            await asyncio.sleep(delay)
+            try:
+                await self._connect()
+            except Exception as e:
+                delay = min(delay * 2, RECONNECT_MAX_DELAY)
+                logger.warning(
+                    f"Reconnecting for user cache invalidations failed, retrying in {delay:.0f}s | Error: {str(e)}"
+                )
+                continue
+            # Users cached while we were not listening may have missed an invalidation
+            self.cache.clear()
+            self.reconnects += 1
+            return
+
+    def stats(self) -> Dict[str, Any]:
+        return {
+            "listening": self._conn is not None,
+            "disconnects": self.disconnects,
+            "reconnects": self.reconnects,
+        }
+
+    def _on_notify(self, conn, pid, channel, payload) -> None:
+        if payload == ALL_USERS:
+            self.cache.clear()
+        else:
+            self.cache.invalidate(payload)
+
+
+user_cache = UserCache(
+    max_entries=settings.USER_CACHE_MAX_ENTRIES,
+    ttl=settings.USER_CACHE_TTL,
+)
+user_cache_broadcaster = UserCacheBroadcaster(user_cache)
+
+
+# Invalidation hooks: fire for any ORM flush that updates or deletes a User
+@event.listens_for(Session, "after_flush")
+def _invalidate_flushed_users(session: Session, flush_context) -> None:
+    user_ids = {
+        obj.id for obj in list(session.dirty) + list(session.deleted)
+        if isinstance(obj, User)
+    }
+    if not user_ids:
+        return
+    session.info.setdefault("invalidated_user_ids", set()).update(user_ids)
+    for user_id in user_ids:
+        user_cache.invalidate(user_id)
+        if settings.USER_CACHE_BROADCAST:
+            # NOTIFY is transactional, so other workers only see it after commit
+            session.connection().execute(
+                text("SELECT pg_notify(:channel, :user_id)"),
+                {"channel": USER_CACHE_CHANNEL, "user_id": user_id},
+            )
+
+
+@event.listens_for(Session, "do_orm_execute")
+def _invalidate_statement_users(orm_execute_state) -> None:
+    # UPDATE/DELETE statements bypass the flush; the affected ids are not
+    # known up front, so drop the whole cache
+    if not (orm_execute_state.is_update or orm_execute_state.is_delete):
+        return
+    mapper = orm_execute_state.bind_mapper
+    if mapper is None or mapper.class_ is not User:
+        return
+    session = orm_execute_state.session
+    session.info.setdefault("invalidated_user_ids", set()).add(ALL_USERS)
+    user_cache.clear()
+    if settings.USER_CACHE_BROADCAST:
+        session.connection().execute(
+            text("SELECT pg_notify(:channel, :user_id)"),
+            {"channel": USER_CACHE_CHANNEL, "user_id": ALL_USERS},
+        )
+
+
+@event.listens_for(Session, "after_commit")
+def _invalidate_committed_users(session: Session) -> None:
+    # Drop anything a concurrent request re-cached between flush and commit
+    for user_id in session.info.pop("invalidated_user_ids", ()):
+        if user_id == ALL_USERS:
+            user_cache.clear()
+        else:
+            user_cache.invalidate(user_id)
+
+
+@event.listens_for(Session, "after_rollback")
+def _discard_invalidated_users(session: Session) -> None:
+    session.info.pop("invalidated_user_ids", None)
@@ -1,7 +1,7 @@
-from typing import Any, Dict, Generic, List, Optional, Type, TypeVar, Union
+from typing import Any, Dict, Generic, List, Optional, Sequence, Tuple, Type, TypeVar, Union
 from fastapi.encoders import jsonable_encoder
 from pydantic import BaseModel
-from sqlalchemy import select
+from sqlalchemy import Boolean, case, cast, column, delete, func, insert, select, update, values
 from sqlalchemy.ext.asyncio import AsyncSession
 
 from app.db.base_class import Base
@@ -10,6 +10,9 @@ ModelType = TypeVar("ModelType", bound=Base)
 CreateSchemaType = TypeVar("CreateSchemaType", bound=BaseModel)
 UpdateSchemaType = TypeVar("UpdateSchemaType", bound=BaseModel)
 
+# Rows per multi-row statement in the bulk helpers
+BULK_BATCH_SIZE = 500
+
 class CRUDBase(Generic[ModelType, CreateSchemaType, UpdateSchemaType]):
     def __init__(self, model: Type[ModelType]):
         """
@@ -30,23 +33,38 @@ class CRUDBase(Generic[ModelType, CreateSchemaType, UpdateSchemaType]):
         return result.scalars().first()
     
     async def get_multi(
-        self, db: AsyncSession, *, skip: int = 0, limit: int = 100
+        self,
+        db: AsyncSession,
+        *,
+        skip: int = 0,
+        limit: int = 100,
+        after_id: Optional[Any] = None
     ) -> List[ModelType]:
         """
-        Get multiple records.
+        Get multiple records ordered by ID.
+        
+        Pass the last ID of the previous page as `after_id` for keyset
+        pagination; `skip` is only applied when no `after_id` is given.
         """
-        result = await db.execute(select(self.model).offset(skip).limit(limit))
+        query = select(self.model).order_by(self.model.id)
+        if after_id is not None:
+            query = query.where(self.model.id > after_id)
+        else:
+            query = query.offset(skip)
+        result = await db.execute(query.limit(limit))
         return result.scalars().all()
     
     async def create(self, db: AsyncSession, *, obj_in: CreateSchemaType) -> ModelType:
         """
-        Create a new record.
+        Create a new record with a single INSERT ... RETURNING.
         """
         obj_in_data = jsonable_encoder(obj_in)
-        db_obj = self.model(**obj_in_data)
-        db.add(db_obj)
+        row = self.model(**obj_in_data).model_dump()
+        if row.get("id") is None:
+            row.pop("id", None)
+        result = await db.execute(insert(self.model).values(**row).returning(self.model))
+        db_obj = result.scalar_one()
         await db.commit()
-        await db.refresh(db_obj)
         return db_obj
     
     async def update(
@@ -57,26 +75,159 @@ class CRUDBase(Generic[ModelType, CreateSchemaType, UpdateSchemaType]):
         obj_in: Union[UpdateSchemaType, Dict[str, Any]]
     ) -> ModelType:
         """
-        Update a record.
+        Update a record with a single UPDATE ... RETURNING.
         """
         obj_data = jsonable_encoder(db_obj)
         if isinstance(obj_in, dict):
             update_data = obj_in
         else:
             update_data = obj_in.dict(exclude_unset=True)
-        for field in obj_data:
-            if field in update_data:
-                setattr(db_obj, field, update_data[field])
-        db.add(db_obj)
+        update_data = {field: value for field, value in update_data.items() if field in obj_data}
+        if not update_data:
+            return db_obj
+        result = await db.execute(
+            update(self.model)
+            .where(self.model.id == db_obj.id)
+            .values(**update_data)
+            .returning(self.model)
+            .execution_options(synchronize_session=False, populate_existing=True)
+        )
+        db_obj = result.scalar_one()
         await db.commit()
-        await db.refresh(db_obj)
         return db_obj
     
     async def remove(self, db: AsyncSession, *, id: int) -> ModelType:
         """
-        Delete a record.
+        Delete a record with a single DELETE ... RETURNING.
         """
-        obj = await db.get(self.model, id)
-        await db.delete(obj)
+        result = await db.execute(
+            delete(self.model)
+            .where(self.model.id == id)
+            .returning(self.model)
+            .execution_options(synchronize_session=False)
+        )
+        obj = result.scalar_one_or_none()
         await db.commit()
         return obj
+    
+    async def create_many(
+        self,
+        db: AsyncSession,
+        *,
+        objs_in: Sequence[Union[CreateSchemaType, Dict[str, Any]]],
+        extra: Optional[Dict[str, Any]] = None,
+        batch_size: int = BULK_BATCH_SIZE
+    ) -> List[ModelType]:
+        """
+        Create records with one multi-row INSERT ... RETURNING per batch,
+        in a single transaction. `extra` is merged into every row and the
+        created records are returned in input order.
+        """
+        rows = []
+        for obj_in in objs_in:
+            obj_in_data = obj_in if isinstance(obj_in, dict) else obj_in.model_dump()
+            # Build through the model so Python-side defaults are applied
+            row = self.model(**{**obj_in_data, **(extra or {})}).model_dump()
+            if row.get("id") is None:
+                row.pop("id", None)
+            rows.append(row)
+        
+        # insertmanyvalues renders one multi-row INSERT per batch and keeps
+        # RETURNING rows in the order of the input rows
+        result = await db.execute(
+            insert(self.model)
+            .returning(self.model, sort_by_parameter_order=True)
+            .execution_options(insertmanyvalues_page_size=batch_size),
+            rows,
+        )
+        created = result.scalars().all()
+        await db.commit()
+        return created
+    
+    async def update_many(
+        self,
+        db: AsyncSession,
+        *,
+        items: Sequence[Tuple[Any, Dict[str, Any]]],
+        filters: Sequence[Any] = (),
+        batch_size: int = BULK_BATCH_SIZE
+    ) -> List[ModelType]:
+        """
+        Apply per-record partial updates given as (id, update_data) pairs.
+        
+        Each batch is a single UPDATE ... FROM (VALUES ...) RETURNING
+        statement, all in one transaction. Every field gets a companion
+        flag column so a row only overwrites the fields it provided.
+        `filters` (e.g. an ownership predicate) are added to the WHERE clause;
+        rows they exclude are simply not returned.
+        """
+        fields = sorted({field for _, update_data in items for field in update_data})
+        if not fields:
+            return []
+        table = self.model.__table__
+        
+        updated: List[ModelType] = []
+        for start in range(0, len(items), batch_size):
+            batch = items[start:start + batch_size]
+            changes = values(
+                column("id", table.c.id.type),
+                *[
+                    col
+                    for field in fields
+                    for col in (column(field, table.c[field].type), column(f"set_{field}", Boolean))
+                ],
+                name="changes",
+            ).data([
+                (id, *[
+                    value
+                    for field in fields
+                    for value in (update_data.get(field), field in update_data)
+                ])
+                for id, update_data in batch
+            ])
+            
+            # Cast back to the column type: a VALUES column holding only NULLs is untyped
+            update_values = {
+                field: case(
+                    (changes.c[f"set_{field}"], cast(changes.c[field], table.c[field].type)),
+                    else_=getattr(self.model, field),
+                )
+                for field in fields
+            }
+            if "updated_at" in table.c:
+                update_values["updated_at"] = func.now()
+            
+            result = await db.execute(
+                update(self.model)
+                .where(self.model.id == changes.c.id, *filters)
+                .values(update_values)
+                .returning(self.model)
+                .execution_options(synchronize_session=False, populate_existing=True)
+            )
+            updated.extend(result.scalars().all())
+        await db.commit()
+        return updated
+    
+    async def remove_many(
+        self,
+        db: AsyncSession,
+        *,
+        ids: Sequence[Any],
+        filters: Sequence[Any] = (),
+        batch_size: int = BULK_BATCH_SIZE
+    ) -> List[Any]:
+        """
+        Delete records with one DELETE ... RETURNING per batch, in a single
+        transaction. Returns the IDs that were actually deleted.
+        """
+        removed: List[Any] = []
+        for start in range(0, len(ids), batch_size):
+            result = await db.execute(
+                delete(self.model)
+                .where(self.model.id.in_(ids[start:start + batch_size]), *filters)
+                .returning(self.model.id)
+                .execution_options(synchronize_session=False)
+            )
+            removed.extend(result.scalars().all())
+        await db.commit()
+        return removed
@@ -0,0 +1,43 @@
+from datetime import datetime
+from typing import List, Optional, Tuple
+from sqlalchemy import select, tuple_
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.crud.base import CRUDBase
+from app.models.activity import ActivityLog, ActivityLogCreate
+
+class CRUDActivityLog(CRUDBase[ActivityLog, ActivityLogCreate, ActivityLogCreate]):
+    async def get_feed(
+        self,
+        db: AsyncSession,
+        *,
+        user_id: Optional[str] = None,
+        entity_type: Optional[str] = None,
+        entity_id: Optional[int] = None,
+        cursor: Optional[Tuple[datetime, int]] = None,
+        limit: int = 50
+    ) -> List[ActivityLog]:
+        """
+        Get a page of activities, newest first.
+        
+        `cursor` is the (created_at, id) of the last activity on the previous
+        page. The filter combinations the feed allows are served by composite
+        indexes ending in (created_at, id), so a page is a bounded index range
+        scan however large the log grows; `entity_id` is only indexed together
+        with `entity_type`, so callers must not pass it alone.
+        """
+        query = select(ActivityLog)
+        if user_id:
+            query = query.where(ActivityLog.user_id == user_id)
+        if entity_type:
+            query = query.where(ActivityLog.entity_type == entity_type)
+        if entity_id is not None:
+            query = query.where(ActivityLog.entity_id == entity_id)
+        if cursor is not None:
+            query = query.where(tuple_(ActivityLog.created_at, ActivityLog.id) < tuple_(*cursor))
+        query = query.order_by(ActivityLog.created_at.desc(), ActivityLog.id.desc()).limit(limit)
+        
+        result = await db.execute(query)
+        return result.scalars().all()
+
+activity_log = CRUDActivityLog(ActivityLog)
@@ -0,0 +1,85 @@
+from datetime import datetime
+from typing import List, Optional, Tuple
+from sqlalchemy import delete, insert, select, tuple_
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.crud.base import CRUDBase
+from app.models.comment import Comment, CommentCreate
+
+class CRUDComment(CRUDBase[Comment, CommentCreate, CommentCreate]):
+    async def get_page(
+        self,
+        db: AsyncSession,
+        *,
+        project_id: Optional[int] = None,
+        task_id: Optional[int] = None,
+        cursor: Optional[Tuple[datetime, int]] = None,
+        limit: int = 50
+    ) -> List[Comment]:
+        """
+        Get a page of a project's or a task's comments, oldest first.
+        
+        `cursor` is the (created_at, id) of the last comment on the previous
+        page, matching the (project_id | task_id, created_at, id) indexes.
+        """
+        query = select(Comment)
+        if task_id is not None:
+            query = query.where(Comment.task_id == task_id)
+        else:
+            query = query.where(Comment.project_id == project_id)
+        if cursor is not None:
+            query = query.where(tuple_(Comment.created_at, Comment.id) > tuple_(*cursor))
+        query = query.order_by(Comment.created_at, Comment.id).limit(limit)
+        
+        result = await db.execute(query)
+        return result.scalars().all()
+    
+    async def create_on(
+        self,
+        db: AsyncSession,
+        *,
+        obj_in: CommentCreate,
+        user_id: str,
+        project_id: Optional[int] = None,
+        task_id: Optional[int] = None
+    ) -> Comment:
+        """
+        Create a comment on a project or a task. The parent's comment_count
+        is bumped by trigger in the same transaction.
+        """
+        row = Comment.model_validate({
+            **obj_in.model_dump(),
+            "user_id": user_id,
+            "project_id": project_id,
+            "task_id": task_id,
+        }).model_dump(exclude={"id"})
+        result = await db.execute(insert(Comment).values(**row).returning(Comment))
+        comment = result.scalar_one()
+        await db.commit()
+        return comment
+    
+    async def remove_own(
+        self,
+        db: AsyncSession,
+        *,
+        id: int,
+        user_id: str,
+        project_id: Optional[int] = None,
+        task_id: Optional[int] = None
+    ) -> Optional[int]:
+        """
+        Delete a comment written by `user_id` on the given parent.
+        Returns the deleted ID, or None when nothing matched.
+        """
+        parent = Comment.task_id == task_id if task_id is not None else Comment.project_id == project_id
+        result = await db.execute(
+            delete(Comment)
+            .where(Comment.id == id, Comment.user_id == user_id, parent)
+            .returning(Comment.id)
+            .execution_options(synchronize_session=False)
+        )
+        comment_id = result.scalar_one_or_none()
+        await db.commit()
+        return comment_id
+
+comment = CRUDComment(Comment)
@@ -1,24 +1,177 @@
-from typing import List
-from sqlalchemy import select
+from datetime import datetime
+from typing import Any, List, Optional, Tuple
+from sqlalchemy import Float, func, literal, literal_column, or_, select, text, tuple_
+from sqlalchemy.dialects.postgresql import TSVECTOR
 from sqlalchemy.ext.asyncio import AsyncSession
 
 from app.crud.base import CRUDBase
 from app.models.project import Project
 from app.schemas.project import ProjectCreate, ProjectUpdate
 
+# Generated column and text search configuration from sql/02_projects.sql.
+# search_vector is deliberately not mapped on Project, so ordinary project
+# queries never load it.
+SEARCH_VECTOR = literal_column("projects.search_vector", type_=TSVECTOR)
+SEARCH_CONFIG = literal_column("'english'::regconfig")
+
 class CRUDProject(CRUDBase[Project, ProjectCreate, ProjectUpdate]):
+    async def get_page(
+        self,
+        db: AsyncSession,
+        *,
+        owner_id: Optional[str] = None,
+        cursor: Optional[Tuple[datetime, int]] = None,
+        skip: int = 0,
+        limit: int = 100
+    ) -> List[Project]:
+        """
+        Get a page of projects, most recently updated first.
+        
+        `cursor` is the (updated_at, id) of the last project on the previous
+        page. Ordering matches the (user_id,) updated_at DESC, id DESC indexes
+        so deep pages cost the same as the first one. `skip` is only applied
+        when no cursor is given.
+        """
+        query = select(Project)
+        if owner_id:
+            query = query.where(Project.user_id == owner_id)
+        if cursor is not None:
+            query = query.where(tuple_(Project.updated_at, Project.id) < tuple_(*cursor))
+        else:
+            query = query.offset(skip)
+        query = query.order_by(Project.updated_at.desc(), Project.id.desc()).limit(limit)
+        
+        result = await db.execute(query)
+        return result.scalars().all()
+    
+    async def search(
+        self,
+        db: AsyncSession,
+        *,
+        q: str,
+        owner_id: Optional[str] = None,
+        status: Optional[str] = None,
+        cursor: Optional[Tuple[float, int]] = None,
+        limit: int = 20
+    ) -> List[Tuple[Project, float]]:
+        """
+        Search projects by name and description, best match first.
+        
+        A project matches when its search_vector matches `q` as a web-style
+        query (GIN index on search_vector) or when `q` is word-similar to its
+        name (trigram GIN index), which tolerates typos and partial words.
+        Rank is the full-text rank plus the name's word similarity.
+        `cursor` is the (rank, id) of the last result on the previous page.
+        """
+        query_text = literal(q)
+        tsquery = func.websearch_to_tsquery(SEARCH_CONFIG, query_text)
+        rank = (
+            func.ts_rank_cd(SEARCH_VECTOR, tsquery) + func.word_similarity(query_text, Project.name)
+        ).label("rank")
+        
+        query = select(Project, rank).where(
+            or_(SEARCH_VECTOR.op("@@")(tsquery), query_text.op("<%")(Project.name))
+        )
+        if owner_id:
+            query = query.where(Project.user_id == owner_id)
+        if status:
+            query = query.where(Project.status == status)
+        if cursor is not None:
+            query = query.where(
+                tuple_(rank, Project.id) < tuple_(literal(cursor[0], Float), literal(cursor[1]))
+            )
+        query = query.order_by(rank.desc(), Project.id.desc()).limit(limit)
+        
+        result = await db.execute(query)
+        return result.all()
+    
     async def get_multi_by_owner(
-        self, db: AsyncSession, *, owner_id: str, skip: int = 0, limit: int = 100
+        self,
+        db: AsyncSession,
+        *,
+        owner_id: str,
+        skip: int = 0,
+        limit: int = 100,
+        cursor: Optional[Tuple[datetime, int]] = None
     ) -> List[Project]:
         """
         Get multiple projects by owner.
         """
-        result = await db.execute(
-            select(Project)
-            .filter(Project.user_id == owner_id)
-            .offset(skip)
-            .limit(limit)
+        return await self.get_page(
+            db, owner_id=owner_id, cursor=cursor, skip=skip, limit=limit
         )
-        return result.scalars().all()
+
+class ProjectImporter:
+    """
+    Bulk loads projects through a temporary staging table.
+    
+    Rows are streamed into the staging table with asyncpg's binary COPY and
+    merged into `projects` in the same transaction: rows with an `id` update
+    that project if `owner_id` owns it, rows without one are inserted.
+    """
+    
+    STAGING_TABLE = "project_import_staging"
+    COLUMNS = ("line", "id", "name", "description", "status")
+    
+    def __init__(self, db: AsyncSession, *, owner_id: str):
+        self.db = db
+        self.owner_id = owner_id
+        self._driver_connection = None
+    
+    async def start(self) -> None:
+        # Executing through the session first opens the transaction that COPY joins
+        await self.db.execute(text(
+            f"CREATE TEMP TABLE {self.STAGING_TABLE} ("
+            "line INTEGER NOT NULL, id INTEGER, name VARCHAR(255) NOT NULL, "
+            "description TEXT, status VARCHAR(50) NOT NULL"
+            ") ON COMMIT DROP"
+        ))
+        connection = await self.db.connection()
+        raw_connection = await connection.get_raw_connection()
+        self._driver_connection = raw_connection.driver_connection
+    
+    async def copy(self, records: List[Tuple[Any, ...]]) -> None:
+        """
+        COPY a batch of (line, id, name, description, status) records.
+        """
+        await self._driver_connection.copy_records_to_table(
+            self.STAGING_TABLE, records=records, columns=self.COLUMNS
+        )
+    
+    async def merge(self) -> Tuple[int, int, List[Tuple[int, str]]]:
+        """
+        Merge staged rows into projects.
+        Returns (inserted, updated, [(line, error)]) for rows that were rejected.
+        """
+        params = {"owner_id": self.owner_id}
+        result = await self.db.execute(text(
+            f"SELECT s.line, p.user_id FROM {self.STAGING_TABLE} s "
+            "LEFT JOIN projects p ON p.id = s.id "
+            "WHERE s.id IS NOT NULL AND (p.id IS NULL OR p.user_id <> :owner_id) "
+            "ORDER BY s.line"
+        ), params)
+        rejected = [
+            (line, "Project not found" if owner is None else "Not enough permissions to update this project")
+            for line, owner in result.all()
+        ]
+        
+        # Last row wins when the same id appears more than once
+        result = await self.db.execute(text(
+            "UPDATE projects p SET name = s.name, description = s.description, "
+            "status = s.status, updated_at = CURRENT_TIMESTAMP "
+            f"FROM (SELECT DISTINCT ON (id) * FROM {self.STAGING_TABLE} "
+            "WHERE id IS NOT NULL ORDER BY id, line DESC) s "
+            "WHERE p.id = s.id AND p.user_id = :owner_id"
+        ), params)
+        updated = result.rowcount
+        
+        result = await self.db.execute(text(
+            "INSERT INTO projects (name, description, status, user_id, created_at, updated_at) "
+            "SELECT name, description, status, :owner_id, CURRENT_TIMESTAMP, CURRENT_TIMESTAMP "
+            f"FROM {self.STAGING_TABLE} WHERE id IS NULL ORDER BY line"
+        ), params)
+        inserted = result.rowcount
+        
+        return inserted, updated, rejected
 
 project = CRUDProject(Project)
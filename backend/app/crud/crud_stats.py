@@ -0,0 +1,67 @@
+from typing import List
+from sqlalchemy import func, select, text
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.models.stats import DashboardStats, EntityCounter, ScopeStats
+
+# Counter entity types and the ScopeStats field they fill
+ENTITY_FIELDS = {"project": "projects", "task": "tasks"}
+
+
+class CRUDStats:
+    async def get_counters(self, db: AsyncSession, *, scopes: List[str]) -> List[EntityCounter]:
+        """
+        Counter rows for the given scopes; a primary key lookup per scope.
+        """
+        result = await db.execute(
+            select(EntityCounter).where(EntityCounter.scope.in_(scopes))
+        )
+        return list(result.scalars().all())
+
+    async def get_totals(self, db: AsyncSession) -> List[EntityCounter]:
+        """
+        Counts across all users, summed from the per-user counter rows.
+        """
+        result = await db.execute(
+            select(
+                EntityCounter.entity_type,
+                EntityCounter.status,
+                func.sum(EntityCounter.count),
+            ).group_by(EntityCounter.entity_type, EntityCounter.status)
+        )
+        return [
+            EntityCounter(scope="", entity_type=entity_type, status=status, count=count)
+            for entity_type, status, count in result.all()
+        ]
+
+    async def get_dashboard(self, db: AsyncSession, *, user_id: str) -> DashboardStats:
+        """
+        Project and task counts by status for a user and across all users.
+        """
+        user = self._scope_stats(await self.get_counters(db, scopes=[user_id]))
+        return DashboardStats(user=user, all=self._scope_stats(await self.get_totals(db)))
+
+    def _scope_stats(self, counters: List[EntityCounter]) -> ScopeStats:
+        scope_stats = ScopeStats()
+        for counter in counters:
+            field = ENTITY_FIELDS.get(counter.entity_type)
+            if field is None or counter.count <= 0:
+                continue
+            counts = getattr(scope_stats, field)
+            counts.by_status[counter.status] = counter.count
+            counts.total += counter.count
+        return scope_stats
+
+    async def reconcile(self, db: AsyncSession) -> int:
+        """
+        Recompute the counters from projects and tasks and return the number
+        of rows that had drifted. Returns 0 when another worker is already
+        reconciling.
+        """
+        result = await db.execute(text("SELECT reconcile_entity_counters()"))
+        repaired = result.scalar_one()
+        await db.commit()
+        return repaired
+
+
+stats = CRUDStats()
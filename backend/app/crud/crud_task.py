@@ -0,0 +1,118 @@
+from typing import Any, Dict, List, Optional
+from sqlalchemy import delete, exists, func, insert, literal, or_, select, update
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.orm import selectinload
+
+from app.crud.base import CRUDBase
+from app.models.project import Project
+from app.models.task import Task, TaskCreate, TaskUpdate
+
+# Eager loads for task responses: each relation is fetched with one
+# SELECT ... WHERE id IN (...) for the whole page, never per task
+TASK_RELATIONS = (selectinload(Task.assignee), selectinload(Task.project))
+
+class CRUDTask(CRUDBase[Task, TaskCreate, TaskUpdate]):
+    async def get_by_project(
+        self,
+        db: AsyncSession,
+        *,
+        project_id: int,
+        after_id: Optional[int] = None,
+        limit: int = 100,
+        status: Optional[str] = None,
+        assigned_to: Optional[str] = None
+    ) -> List[Task]:
+        """
+        Get a page of a project's tasks ordered by ID, with assignee and
+        project loaded. Costs three queries regardless of page size.
+        """
+        query = select(Task).where(Task.project_id == project_id).options(*TASK_RELATIONS)
+        if status:
+            query = query.where(Task.status == status)
+        if assigned_to:
+            query = query.where(Task.assigned_to == assigned_to)
+        if after_id is not None:
+            query = query.where(Task.id > after_id)
+        query = query.order_by(Task.id).limit(limit)
+        
+        result = await db.execute(query)
+        return result.scalars().all()
+    
+    async def get_in_project(
+        self, db: AsyncSession, *, project_id: int, id: int
+    ) -> Optional[Task]:
+        """
+        Get one task of a project with assignee and project loaded.
+        """
+        result = await db.execute(
+            select(Task)
+            .where(Task.id == id, Task.project_id == project_id)
+            .options(*TASK_RELATIONS)
+            .execution_options(populate_existing=True)
+        )
+        return result.scalars().first()
+    
+    async def create_in_project(
+        self, db: AsyncSession, *, project_id: int, owner_id: str, obj_in: TaskCreate
+    ) -> Optional[Task]:
+        """
+        Create a task with a single INSERT ... SELECT ... RETURNING that only
+        inserts when `owner_id` owns the project. Returns None otherwise.
+        """
+        # Validate through the model for defaults
+        row = Task.model_validate({**obj_in.model_dump(), "project_id": project_id}).model_dump(exclude={"id"})
+        columns = list(row)
+        table = Task.__table__
+        owned = (
+            select(*[literal(row[c], type_=table.c[c].type) for c in columns])
+            .where(Project.id == project_id, Project.user_id == owner_id)
+        )
+        result = await db.execute(
+            insert(Task).from_select(columns, owned).returning(Task)
+        )
+        task = result.scalar_one_or_none()
+        await db.commit()
+        return task
+    
+    async def update_in_project(
+        self, db: AsyncSession, *, project_id: int, id: int, user_id: str, update_data: Dict[str, Any]
+    ) -> Optional[Task]:
+        """
+        Update a task if `user_id` owns its project or is its assignee.
+        Permission is part of the WHERE clause; returns None when nothing matched.
+        """
+        result = await db.execute(
+            update(Task)
+            .where(
+                Task.id == id,
+                Task.project_id == project_id,
+                or_(Task.assigned_to == user_id, _owns_project(project_id, user_id)),
+            )
+            .values(**update_data, updated_at=func.now())
+            .returning(Task)
+            .execution_options(synchronize_session=False)
+        )
+        task = result.scalar_one_or_none()
+        await db.commit()
+        return task
+    
+    async def remove_in_project(
+        self, db: AsyncSession, *, project_id: int, id: int, owner_id: str
+    ) -> Optional[int]:
+        """
+        Delete a task if `owner_id` owns its project. Returns the deleted ID.
+        """
+        result = await db.execute(
+            delete(Task)
+            .where(Task.id == id, Task.project_id == project_id, _owns_project(project_id, owner_id))
+            .returning(Task.id)
+            .execution_options(synchronize_session=False)
+        )
+        task_id = result.scalar_one_or_none()
+        await db.commit()
+        return task_id
+
+def _owns_project(project_id: int, user_id: str):
+    return exists().where(Project.id == project_id, Project.user_id == user_id)
+
+task = CRUDTask(Task)
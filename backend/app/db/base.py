@@ -2,3 +2,7 @@
 from app.db.base_class import Base
 from app.models.user import User
 from app.models.project import Project
+from app.models.stats import EntityCounter
+from app.models.activity import ActivityLog
+from app.models.task import Task
+from app.models.comment import Comment
@@ -1,22 +1,123 @@
-from sqlalchemy.ext.asyncio import AsyncSession, create_async_engine
-from sqlalchemy.orm import sessionmaker
-from typing import AsyncGenerator
+import time
+from sqlalchemy import exc
+from sqlalchemy.engine import make_url
+from sqlalchemy.ext.asyncio import AsyncSession, async_sessionmaker, create_async_engine
+from sqlalchemy.pool import AsyncAdaptedQueuePool
+from typing import Any, AsyncGenerator, Dict
 from app.core.config import settings
+from app.core.metrics import (
+    DB_POOL_CHECKED_OUT,
+    DB_POOL_CHECKOUT_WAIT,
+    DB_POOL_OVERFLOW,
+    DB_POOL_SIZE,
+    DB_POOL_TIMEOUTS,
+)
 
 # Convert the PostgreSQL URL to an async URL
 DATABASE_URL = str(settings.DATABASE_URI)
 if DATABASE_URL.startswith("postgresql://"):
     DATABASE_URL = DATABASE_URL.replace("postgresql://", "postgresql+asyncpg://")
 
-engine = create_async_engine(DATABASE_URL, echo=True, future=True)
+# The same database as a plain libpq URL, for code that talks to asyncpg
+# directly (LISTEN connections, session-level advisory locks)
+ASYNCPG_DSN = make_url(DATABASE_URL).set(drivername="postgresql").render_as_string(
+    hide_password=False
+)
+
+class PoolStats:
+    """
+    Counters describing how connections are acquired from the pool.
+    """
+
+    def __init__(self):
+        self.checkouts = 0
+        self.wait_time_total = 0.0
+        self.wait_time_max = 0.0
+        self.overflow_events = 0
+        self.timeouts = 0
+
+    def record_checkout(self, wait_time: float, overflowed: bool) -> None:
+        DB_POOL_CHECKOUT_WAIT.observe(wait_time)
+        self.checkouts += 1
+        self.wait_time_total += wait_time
+        if wait_time > self.wait_time_max:
+            self.wait_time_max = wait_time
+        if overflowed:
+            self.overflow_events += 1
+
+pool_stats = PoolStats()
+
+class InstrumentedAsyncQueuePool(AsyncAdaptedQueuePool):
+    """
+    AsyncAdaptedQueuePool that records acquire wait time and overflow use,
+    and keeps the pool occupancy gauges current.
+    """
+
+    def connect(self):
+        started = time.perf_counter()
+        overflow_before = self._overflow
+        try:
+            connection = super().connect()
+        except exc.TimeoutError:
+            pool_stats.timeouts += 1
+            DB_POOL_TIMEOUTS.inc()
+            raise
+        # _overflow counts up from -pool_size; above zero we are past pool_size
+        overflowed = self._overflow > overflow_before and self._overflow > 0
+        pool_stats.record_checkout(time.perf_counter() - started, overflowed)
+        self._update_gauges()
+        return connection
+
+    def _do_return_conn(self, record) -> None:
+        super()._do_return_conn(record)
+        self._update_gauges()
+
+    def _update_gauges(self) -> None:
+        # Set here rather than at import so each worker reports its own pool
+        DB_POOL_SIZE.set(self.size())
+        DB_POOL_CHECKED_OUT.set(self.checkedout())
+        DB_POOL_OVERFLOW.set(max(self._overflow, 0))
+
+engine = create_async_engine(
+    DATABASE_URL,
+    echo=settings.DB_ECHO,
+    future=True,
+    poolclass=InstrumentedAsyncQueuePool,
+    pool_size=settings.DB_POOL_SIZE,
+    max_overflow=settings.DB_MAX_OVERFLOW,
+    pool_timeout=settings.DB_POOL_TIMEOUT,
+    pool_recycle=settings.DB_POOL_RECYCLE,
+    pool_pre_ping=settings.DB_POOL_PRE_PING,
+    connect_args={"prepared_statement_cache_size": settings.DB_STATEMENT_CACHE_SIZE},
+)
+
+# Built once; sessions are cheap to create from the factory
+async_session = async_sessionmaker(
+    engine, class_=AsyncSession, expire_on_commit=False
+)
+
+def get_pool_stats() -> Dict[str, Any]:
+    """
+    Current pool occupancy plus cumulative acquire statistics.
+    """
+    pool = engine.sync_engine.pool
+    return {
+        "pool_size": pool.size(),
+        "max_overflow": settings.DB_MAX_OVERFLOW,
+        "checked_out": pool.checkedout(),
+        "checked_in": pool.checkedin(),
+        "overflow": max(pool.overflow(), 0),
+        "checkouts": pool_stats.checkouts,
+        "wait_time_total_seconds": round(pool_stats.wait_time_total, 6),
+        "wait_time_max_seconds": round(pool_stats.wait_time_max, 6),
+        "overflow_events": pool_stats.overflow_events,
+        "timeouts": pool_stats.timeouts,
+    }
 
 async def get_session() -> AsyncGenerator[AsyncSession, None]:
     """
     Dependency function that yields db sessions
     """
-    async_session = sessionmaker(
-        engine, class_=AsyncSession, expire_on_commit=False
-    )
     async with async_session() as session:
         yield session
         await session.commit()
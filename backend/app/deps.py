@@ -1,7 +1,9 @@
+import hmac
 from fastapi import Depends, HTTPException, status, Cookie
 from typing import Optional
 from app.db.session import get_session
-from app.core.auth import get_current_user
+from app.core.auth import get_current_user, oauth2_scheme
+from app.core.config import settings
 from app.models.user import User
 
 # Get current active user
@@ -27,6 +29,20 @@ async def get_current_active_superuser(
         )
     return current_user
 
+# Scrapers authenticate to /metrics with METRICS_TOKEN rather than a user session
+async def require_metrics_token(
+    token: Optional[str] = Depends(oauth2_scheme),
+) -> None:
+    """
+    Check the bearer token against METRICS_TOKEN.
+    """
+    if not token or not hmac.compare_digest(token, settings.METRICS_TOKEN):
+        raise HTTPException(
+            status_code=status.HTTP_401_UNAUTHORIZED,
+            detail="Invalid metrics token",
+            headers={"WWW-Authenticate": "Bearer"},
+        )
+
 # Get token from cookie
 async def get_token_from_cookie(
     session_token: Optional[str] = Cookie(None)
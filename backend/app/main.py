@@ -1,71 +1,59 @@
-from fastapi import FastAPI
+from fastapi import Depends, FastAPI, Response
 from fastapi.middleware.cors import CORSMiddleware
 from fastapi.middleware.httpsredirect import HTTPSRedirectMiddleware
+from contextlib import asynccontextmanager
 import logging
-import json
-from datetime import datetime
 from app.core.config import settings
-from app.routers import users, projects, mock, auth
+from app.core.http import init_http_client, close_http_client
+from app.core.security import jwks_cache
+from app.core.user_cache import user_cache_broadcaster
+from app.core.pagination import NEXT_CURSOR_HEADER
+from app.core.response_cache import response_cache
+from app.core.counters import counter_reconciler
+from app.core.activity import activity_writer
+from app.core.serialization import DefaultResponse
+from app.core.logging_config import setup_logging
+from app.core.metrics import CONTENT_TYPE_LATEST, MetricsMiddleware, render_metrics
+from app.core.profiler import ProfilerMiddleware
+from app.deps import get_current_active_superuser, require_metrics_token
+from app.routers import users, projects, tasks, comments, mock, auth, admin, stats, activities
 
-# Custom JSON formatter for structured logging
-class JsonFormatter(logging.Formatter):
-    def format(self, record):
-        log_record = {
-            "timestamp": datetime.utcnow().isoformat(),
-            "level": record.levelname,
-            "logger": record.name,
-            "message": record.getMessage(),
-        }
-        
-        # Add exception info if available
-        if record.exc_info:
-            log_record["exception"] = self.formatException(record.exc_info)
-            
-        # Add any extra attributes
-        for key, value in record.__dict__.items():
-            if key not in ["args", "asctime", "created", "exc_info", "exc_text", "filename",
-                          "funcName", "id", "levelname", "levelno", "lineno", "module",
-                          "msecs", "message", "msg", "name", "pathname", "process",
-                          "processName", "relativeCreated", "stack_info", "thread", "threadName"]:
-                log_record[key] = value
-                
-        return json.dumps(log_record)
-
-# Configure logging
-def setup_logging():
-    # Set up root logger
-    root_logger = logging.getLogger()
-    root_logger.setLevel(logging.INFO)
-    
-    # Clear existing handlers
-    for handler in root_logger.handlers[:]:
-        root_logger.removeHandler(handler)
-    
-    # Console handler with JSON formatting in production, readable format in development
-    console_handler = logging.StreamHandler()
-    
-    if settings.ENVIRONMENT == "production":
-        console_handler.setFormatter(JsonFormatter())
-    else:
-        console_handler.setFormatter(
-            logging.Formatter('%(asctime)s | %(levelname)s | %(name)s | %(message)s')
-        )
-    
-    root_logger.addHandler(console_handler)
-    
-    # Set specific log levels for different modules
-    logging.getLogger("app.auth").setLevel(logging.DEBUG)
-    logging.getLogger("uvicorn").setLevel(logging.WARNING)
-    logging.getLogger("sqlalchemy").setLevel(logging.WARNING)
+# Queued logging; formatting and output happen off the event loop
+setup_logging()
 
 # Initialize logger for this module
 logger = logging.getLogger(__name__)
 
+@asynccontextmanager
+async def lifespan(app: FastAPI):
+    # Shared outbound HTTP client for Entra ID / Microsoft Graph
+    await init_http_client()
+    # Scheduled refresh of Entra ID's token signing keys
+    jwks_cache.start()
+    # Cross-worker user cache invalidation over Postgres LISTEN/NOTIFY
+    if settings.USER_CACHE_BROADCAST:
+        await user_cache_broadcaster.start()
+    # Periodic repair of the trigger-maintained dashboard counters
+    counter_reconciler.start()
+    # Batched background writes to the activity log
+    activity_writer.start()
+    try:
+        yield
+    finally:
+        await activity_writer.stop()
+        await counter_reconciler.stop()
+        await user_cache_broadcaster.stop()
+        await response_cache.close()
+        await jwks_cache.stop()
+        await close_http_client()
+
 app = FastAPI(
     title=settings.PROJECT_NAME,
     description=settings.PROJECT_DESCRIPTION,
     version=settings.PROJECT_VERSION,
-    openapi_url=f"{settings.API_V1_STR}/openapi.json"
+    openapi_url=f"{settings.API_V1_STR}/openapi.json",
+    default_response_class=DefaultResponse,
+    lifespan=lifespan
 )
 
 # Use HTTPS in production
@@ -79,13 +67,36 @@ app.add_middleware(
     allow_credentials=True,
     allow_methods=["*"],
     allow_headers=["*"],
+    expose_headers=[NEXT_CURSOR_HEADER],
 )
 
+# Per-request query profile and Server-Timing header
+if settings.PROFILER_ENABLED:
+    app.add_middleware(ProfilerMiddleware)
+
+# Request metrics; added last so it is outermost and times the whole stack
+if settings.METRICS_ENABLED:
+    app.add_middleware(MetricsMiddleware)
+
 # Include routers
 app.include_router(auth.router, prefix=f"{settings.API_V1_STR}/auth", tags=["auth"])
 app.include_router(users.router, prefix=f"{settings.API_V1_STR}/users", tags=["users"])
 app.include_router(projects.router, prefix=f"{settings.API_V1_STR}/projects", tags=["projects"])
+app.include_router(tasks.router, prefix=f"{settings.API_V1_STR}/projects", tags=["tasks"])
+app.include_router(comments.router, prefix=f"{settings.API_V1_STR}/projects", tags=["comments"])
+app.include_router(stats.router, prefix=f"{settings.API_V1_STR}/stats", tags=["stats"])
+app.include_router(activities.router, prefix=f"{settings.API_V1_STR}/activities", tags=["activities"])
 app.include_router(mock.router, prefix=f"{settings.API_V1_STR}/mock", tags=["mock"])
+app.include_router(admin.router, prefix=f"{settings.API_V1_STR}/admin", tags=["admin"])
+
+if settings.METRICS_ENABLED:
+    # Never public: the metrics describe routes, traffic and the database pool
+    metrics_access = require_metrics_token if settings.METRICS_TOKEN else get_current_active_superuser
+
+    @app.get("/metrics", include_in_schema=False, dependencies=[Depends(metrics_access)])
+    def metrics():
+        # Sync, so reading the per-worker metric files runs in the threadpool
+        return Response(render_metrics(), media_type=CONTENT_TYPE_LATEST)
 
 @app.get("/")
 def root():
@@ -1,3 +1,7 @@
 # Import all models here for SQLModel to discover them
 from app.models.user import User
 from app.models.project import Project
+from app.models.stats import EntityCounter
+from app.models.activity import ActivityLog
+from app.models.task import Task
+from app.models.comment import Comment
@@ -0,0 +1,44 @@
+from typing import Any, Dict, Optional
+from datetime import datetime
+from sqlalchemy import JSON, Column, Index
+from sqlalchemy.dialects.postgresql import JSONB
+from sqlmodel import Field, SQLModel
+
+
+class ActivityLogBase(SQLModel):
+    action: str
+    entity_type: str
+    entity_id: int
+    details: Optional[Dict[str, Any]] = Field(
+        default=None, sa_column=Column(JSON(none_as_null=True).with_variant(JSONB(none_as_null=True), "postgresql"))
+    )
+
+
+class ActivityLog(ActivityLogBase, table=True):
+    __tablename__ = "activity_log"
+    __table_args__ = (
+        # Keyset pagination: ORDER BY created_at DESC, id DESC, optionally
+        # narrowed to a user, a user's entity type, or a single entity
+        # (sql/05_activity_log.sql)
+        Index("idx_activity_log_created_at_id", "created_at", "id"),
+        Index("idx_activity_log_user_id_created_at_id", "user_id", "created_at", "id"),
+        Index(
+            "idx_activity_log_user_id_entity_type_created_at_id",
+            "user_id", "entity_type", "created_at", "id",
+        ),
+        Index("idx_activity_log_entity_created_at_id", "entity_type", "entity_id", "created_at", "id"),
+    )
+
+    id: Optional[int] = Field(default=None, primary_key=True)
+    created_at: datetime = Field(default_factory=datetime.now)
+    user_id: str = Field(foreign_key="users.id")
+
+
+class ActivityLogCreate(ActivityLogBase):
+    user_id: str
+
+
+class ActivityLogRead(ActivityLogBase):
+    id: int
+    created_at: datetime
+    user_id: str
@@ -0,0 +1,42 @@
+from typing import Optional
+from datetime import datetime
+from sqlalchemy import CheckConstraint, Index
+from sqlmodel import Field, SQLModel
+
+
+class CommentBase(SQLModel):
+    content: str = Field(min_length=1)
+
+
+class Comment(CommentBase, table=True):
+    __tablename__ = "comments"
+    __table_args__ = (
+        CheckConstraint(
+            "(task_id IS NOT NULL AND project_id IS NULL) OR "
+            "(task_id IS NULL AND project_id IS NOT NULL)",
+            name="check_comment_target",
+        ),
+        # Keyset pagination: ORDER BY created_at, id within a project or task
+        Index("idx_comment_project_id_created_at_id", "project_id", "created_at", "id"),
+        Index("idx_comment_task_id_created_at_id", "task_id", "created_at", "id"),
+    )
+
+    id: Optional[int] = Field(default=None, primary_key=True)
+    created_at: datetime = Field(default_factory=datetime.now)
+    updated_at: datetime = Field(default_factory=datetime.now)
+    task_id: Optional[int] = Field(default=None, foreign_key="tasks.id")
+    project_id: Optional[int] = Field(default=None, foreign_key="projects.id")
+    user_id: str = Field(foreign_key="users.id")
+
+
+class CommentCreate(CommentBase):
+    pass
+
+
+class CommentRead(CommentBase):
+    id: int
+    created_at: datetime
+    updated_at: datetime
+    task_id: Optional[int] = None
+    project_id: Optional[int] = None
+    user_id: str
@@ -1,11 +1,16 @@
-from typing import Optional
+from typing import Annotated, List, Optional
 from datetime import datetime
+from sqlalchemy import Index
 from sqlmodel import Field, SQLModel, Relationship
 from typing import TYPE_CHECKING
 
 if TYPE_CHECKING:
+    from .task import Task
     from .user import User
 
+# Ids are PostgreSQL INTEGER columns; larger values fail in the driver
+MAX_ID = 2**31 - 1
+
 
 class ProjectBase(SQLModel):
     name: str = Field(index=True)
@@ -15,14 +20,23 @@ class ProjectBase(SQLModel):
 
 class Project(ProjectBase, table=True):
     __tablename__ = "projects"
+    __table_args__ = (
+        # Keyset pagination: ORDER BY updated_at DESC, id DESC
+        Index("idx_project_updated_at_id", "updated_at", "id"),
+        Index("idx_project_user_id_updated_at_id", "user_id", "updated_at", "id"),
+    )
 
     id: Optional[int] = Field(default=None, primary_key=True)
     created_at: datetime = Field(default_factory=datetime.now)
     updated_at: datetime = Field(default_factory=datetime.now)
     user_id: str = Field(foreign_key="users.id")
+    # Maintained by the comments triggers (sql/04_comments.sql)
+    comment_count: int = Field(default=0)
     
     # Relationships
     owner: "User" = Relationship(back_populates="projects")
+    # Tasks are removed by the database's ON DELETE CASCADE
+    tasks: List["Task"] = Relationship(back_populates="project", sa_relationship_kwargs={"passive_deletes": True})
 
 
 class ProjectCreate(ProjectBase):
@@ -34,9 +48,45 @@ class ProjectRead(ProjectBase):
     created_at: datetime
     updated_at: datetime
     user_id: str
+    comment_count: int = 0
 
 
 class ProjectUpdate(SQLModel):
     name: Optional[str] = None
     description: Optional[str] = None
     status: Optional[str] = None
+
+
+class ProjectBulkUpdate(ProjectUpdate):
+    id: int = Field(ge=1, le=MAX_ID)
+
+
+class ProjectBulkDelete(SQLModel):
+    ids: List[Annotated[int, Field(ge=1, le=MAX_ID)]]
+
+
+class ProjectBulkResult(SQLModel):
+    index: int
+    id: Optional[int] = None
+    status_code: int
+    detail: Optional[str] = None
+    project: Optional[ProjectRead] = None
+
+
+class ProjectImportRow(SQLModel):
+    id: Optional[int] = Field(default=None, ge=1, le=MAX_ID)
+    name: str = Field(min_length=1, max_length=255)
+    description: Optional[str] = None
+    status: str = Field(default="active", max_length=50)
+
+
+class ProjectImportError(SQLModel):
+    line: int
+    detail: str
+
+
+class ProjectImportResult(SQLModel):
+    inserted: int
+    updated: int
+    failed: int
+    errors: List[ProjectImportError]
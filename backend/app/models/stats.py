@@ -0,0 +1,34 @@
+from typing import Dict
+from sqlmodel import Field, SQLModel
+
+
+class EntityCounter(SQLModel, table=True):
+    """
+    Count of projects or tasks with one status for one user. Totals across
+    all users are summed from these rows rather than kept in a global row
+    that every write would have to lock.
+
+    Rows are maintained by triggers on projects and tasks (sql/02_projects.sql,
+    sql/03_tasks.sql) and repaired by reconcile_entity_counters().
+    """
+    __tablename__ = "entity_counters"
+
+    scope: str = Field(primary_key=True)
+    entity_type: str = Field(primary_key=True)
+    status: str = Field(primary_key=True)
+    count: int = Field(default=0)
+
+
+class EntityCounts(SQLModel):
+    total: int = 0
+    by_status: Dict[str, int] = Field(default_factory=dict)
+
+
+class ScopeStats(SQLModel):
+    projects: EntityCounts = Field(default_factory=EntityCounts)
+    tasks: EntityCounts = Field(default_factory=EntityCounts)
+
+
+class DashboardStats(SQLModel):
+    user: ScopeStats
+    all: ScopeStats
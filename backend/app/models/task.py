@@ -0,0 +1,74 @@
+from typing import Optional
+from datetime import datetime
+from sqlalchemy import Index
+from sqlmodel import Field, SQLModel, Relationship
+from typing import TYPE_CHECKING
+
+if TYPE_CHECKING:
+    from .project import Project
+    from .user import User
+
+
+class TaskBase(SQLModel):
+    title: str = Field(max_length=255)
+    description: Optional[str] = None
+    status: str = Field(default="pending", max_length=50)
+    priority: str = Field(default="medium", max_length=50)
+    due_date: Optional[datetime] = None
+    assigned_to: Optional[str] = Field(default=None, foreign_key="users.id")
+
+
+class Task(TaskBase, table=True):
+    __tablename__ = "tasks"
+    __table_args__ = (
+        # Keyset pagination within a project: ORDER BY id
+        Index("idx_task_project_id_id", "project_id", "id"),
+    )
+
+    id: Optional[int] = Field(default=None, primary_key=True)
+    created_at: datetime = Field(default_factory=datetime.now)
+    updated_at: datetime = Field(default_factory=datetime.now)
+    project_id: int = Field(foreign_key="projects.id")
+    # Maintained by the comments triggers (sql/04_comments.sql)
+    comment_count: int = Field(default=0)
+
+    # Relationships; lists load these with selectinload, one query per relation
+    project: "Project" = Relationship(back_populates="tasks")
+    assignee: Optional["User"] = Relationship()
+
+
+class TaskCreate(TaskBase):
+    pass
+
+
+class TaskUpdate(SQLModel):
+    title: Optional[str] = Field(default=None, max_length=255)
+    description: Optional[str] = None
+    status: Optional[str] = Field(default=None, max_length=50)
+    priority: Optional[str] = Field(default=None, max_length=50)
+    due_date: Optional[datetime] = None
+    assigned_to: Optional[str] = None
+
+
+class TaskRead(TaskBase):
+    id: int
+    created_at: datetime
+    updated_at: datetime
+    project_id: int
+    comment_count: int = 0
+
+
+class TaskAssignee(SQLModel):
+    id: str
+    name: str
+    email: str
+
+
+class TaskProject(SQLModel):
+    id: int
+    name: str
+
+
+class TaskReadWithRelations(TaskRead):
+    assignee: Optional[TaskAssignee] = None
+    project: TaskProject
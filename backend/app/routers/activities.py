@@ -0,0 +1,68 @@
+from datetime import datetime
+from typing import Any, List, Optional
+from fastapi import APIRouter, Depends, HTTPException, Query, Response
+from sqlmodel.ext.asyncio.session import AsyncSession
+
+from app.core.pagination import NEXT_CURSOR_HEADER, decode_cursor, encode_cursor
+from app.core.serialization import RowSerializer
+from app.crud.crud_activity import activity_log as crud_activity
+from app.deps import get_current_active_user, get_session
+from app.models.activity import ActivityLogRead
+from app.models.user import User
+
+router = APIRouter()
+
+activity_serializer = RowSerializer(ActivityLogRead)
+
+@router.get("/", response_model=List[ActivityLogRead])
+async def read_activities(
+    session: AsyncSession = Depends(get_session),
+    limit: int = Query(50, ge=1, le=500),
+    cursor: Optional[str] = Query(None, description="Cursor from the X-Next-Cursor header of the previous page"),
+    user_id: Optional[str] = Query(None, description="Filter by the user who performed the activity"),
+    entity_type: Optional[str] = Query(None, description="Filter by entity type (project, task, ...)"),
+    entity_id: Optional[int] = Query(None, description="Filter by entity ID"),
+    current_user: User = Depends(get_current_active_user),
+) -> Any:
+    """
+    Retrieve the activity feed, newest first.
+    
+    Admins see every activity; other users see only the activity they
+    performed themselves. Changes others make to their projects, such as
+    an assignee updating a task, are logged under that user and are not
+    included. `entity_id` must be given together with `entity_type`.
+    
+    When a full page is returned, the X-Next-Cursor header holds the cursor
+    for the next page.
+    """
+    if current_user.role != "admin":
+        if user_id is not None and user_id != current_user.id:
+            raise HTTPException(
+                status_code=403,
+                detail="Not enough permissions to read this user's activity"
+            )
+        user_id = current_user.id
+    if entity_id is not None and entity_type is None:
+        # No index leads with entity_id, so it is only served per entity type
+        raise HTTPException(status_code=400, detail="entity_id requires entity_type")
+    
+    position = decode_cursor(cursor, datetime, int) if cursor else None
+    activities = await crud_activity.get_feed(
+        session,
+        user_id=user_id,
+        entity_type=entity_type,
+        entity_id=entity_id,
+        cursor=position,
+        limit=limit,
+    )
+    
+    headers = {}
+    if len(activities) == limit:
+        last = activities[-1]
+        headers[NEXT_CURSOR_HEADER] = encode_cursor(last.created_at, last.id)
+    
+    return Response(
+        content=activity_serializer.dump_list(activities),
+        media_type="application/json",
+        headers=headers,
+    )
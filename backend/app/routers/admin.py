@@ -0,0 +1,71 @@
+from typing import Any, Dict
+from fastapi import APIRouter, Depends
+
+from app.deps import get_current_active_superuser
+from app.models.user import User
+from app.core.graph import graph_token_cache
+from app.core.photo_cache import photo_cache
+from app.core.user_cache import user_cache, user_cache_broadcaster
+from app.core.response_cache import response_cache
+from app.core.counters import counter_reconciler
+from app.core.activity import activity_writer
+from app.core.oauth_state import state_store
+from app.core.security import jwks_cache
+from app.core.logging_config import log_pipeline
+from app.db.session import get_pool_stats
+
+router = APIRouter()
+
+@router.get("/caches")
+async def read_cache_stats(
+    current_user: User = Depends(get_current_active_superuser),
+) -> Dict[str, Any]:
+    """
+    Get hit/miss statistics for the in-process caches.
+    """
+    return {
+        "graph_token": graph_token_cache.stats(),
+        "photo": photo_cache.stats(),
+        "user": user_cache.stats(),
+        "user_broadcast": user_cache_broadcaster.stats(),
+        "response": response_cache.stats(),
+        "oauth_state": state_store.stats(),
+        "jwks": jwks_cache.stats(),
+    }
+
+@router.get("/db-pool")
+async def read_db_pool_stats(
+    current_user: User = Depends(get_current_active_superuser),
+) -> Dict[str, Any]:
+    """
+    Get database connection pool statistics for this worker.
+    """
+    return get_pool_stats()
+
+@router.get("/activity-writer")
+async def read_activity_writer_stats(
+    current_user: User = Depends(get_current_active_superuser),
+) -> Dict[str, Any]:
+    """
+    Get queue depth, drop counts and flush latency of this worker's activity log writer.
+    """
+    return activity_writer.stats()
+
+@router.get("/logging")
+async def read_logging_stats(
+    current_user: User = Depends(get_current_active_superuser),
+) -> Dict[str, Any]:
+    """
+    Get queue depth and dropped, rate-limited and sampled-out record counts of this worker's log pipeline.
+    """
+    return log_pipeline.stats()
+
+@router.post("/stats/reconcile")
+async def reconcile_stats(
+    current_user: User = Depends(get_current_active_superuser),
+) -> Dict[str, Any]:
+    """
+    Recompute the dashboard counters now and report how many had drifted.
+    """
+    repaired = await counter_reconciler.reconcile()
+    return {"repaired": repaired, **counter_reconciler.stats()}
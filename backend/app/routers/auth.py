@@ -1,8 +1,9 @@
-from fastapi import APIRouter, Depends, HTTPException, Request, Response, Query
+from fastapi import APIRouter, Cookie, Depends, HTTPException, Request, Response, Query
 from fastapi.responses import RedirectResponse
 from sqlmodel.ext.asyncio.session import AsyncSession
 import secrets
 import logging
+import time
 from typing import Optional
 from datetime import datetime
 from app.core.auth import (
@@ -15,17 +16,20 @@ from app.core.auth import (
 from app.core.config import settings
 from app.db.session import get_session
 from app.models.user import User
-from app.core.auth import get_current_user, MICROSOFT_GRAPH_ENDPOINT
-from app.core.graph import get_graph_token
-import httpx
+from app.core.auth import get_current_user
+from app.core.conditional import etag_matches
+from app.core.oauth_state import state_store
+from app.core.photo_cache import photo_cache, sign_photo_url, verify_photo_signature
+from app.core.security import verify_token as verify_entra_token
 
 router = APIRouter()
 
 # Set up logger
 logger = logging.getLogger("app.auth")
 
-# Store state for CSRF protection
-state_store = {}
+# Cookie binding a login's state to the browser that started it
+STATE_COOKIE = "oauth_state"
+STATE_COOKIE_PATH = f"{settings.API_V1_STR}/auth"
 
 @router.get("/login")
 async def login(request: Request, redirect_uri: Optional[str] = None):
@@ -35,27 +39,34 @@ async def login(request: Request, redirect_uri: Optional[str] = None):
     client_ip = request.client.host if request.client else "unknown"
     user_agent = request.headers.get("User-Agent", "unknown")
     
-    # Log login initiation
+    # Log login initiation; the record carries its own timestamp, and the
+    # message is only built if the record passes the level and rate limits
     logger.info(
-        f"Login attempt initiated | IP: {client_ip} | "
-        f"User-Agent: {user_agent} | "
-        f"Timestamp: {datetime.utcnow().isoformat()}"
+        "Login attempt initiated | IP: %s | User-Agent: %s", client_ip, user_agent
     )
     
     # Determine the callback URL
     callback_url = f"{settings.API_URL}/api/v1/auth/callback"
     
-    # Generate state for CSRF protection
-    state = secrets.token_urlsafe(32)
-    
-    # Store state with original redirect URI if provided
-    state_store[state] = redirect_uri or settings.FRONTEND_URL
+    # Generate state for CSRF protection, remembering the original redirect URI
+    state = await state_store.issue(redirect_uri or settings.FRONTEND_URL)
     
     # Get Microsoft authorization URL
     auth_url, _ = get_authorization_url(callback_url, state)
     
-    # Redirect to Microsoft login
-    return RedirectResponse(auth_url)
+    # Redirect to Microsoft login; the callback is a top-level navigation,
+    # so a SameSite=Lax cookie comes back with it
+    response = RedirectResponse(auth_url)
+    response.set_cookie(
+        key=STATE_COOKIE,
+        value=state,
+        max_age=settings.OAUTH_STATE_TTL,
+        path=STATE_COOKIE_PATH,
+        httponly=True,
+        secure=settings.COOKIE_SECURE,
+        samesite="lax",
+    )
+    return response
 
 @router.get("/callback")
 async def callback(
@@ -64,6 +75,7 @@ async def callback(
     state: str = Query(None),
     error: str = Query(None),
     error_description: str = Query(None),
+    state_cookie: Optional[str] = Cookie(None, alias=STATE_COOKIE),
     session: AsyncSession = Depends(get_session)
 ):
     """
@@ -85,8 +97,12 @@ async def callback(
             f"{settings.FRONTEND_URL}/login?error={error}&error_description={error_description}"
         )
     
-    # Validate state for CSRF protection
-    if not state or state not in state_store:
+    # Validate state for CSRF protection: it must be the one issued to this
+    # browser and still be valid in the state store
+    redirect_uri = None
+    if state and state_cookie and secrets.compare_digest(state, state_cookie):
+        redirect_uri = await state_store.consume(state)
+    if redirect_uri is None:
         logger.warning(
             f"Invalid state parameter detected | IP: {client_ip} | "
             f"User-Agent: {user_agent} | State: {state if state else 'None'} | "
@@ -96,26 +112,28 @@ async def callback(
             f"{settings.FRONTEND_URL}/login?error=invalid_state"
         )
     
-    # Get the original redirect URI
-    redirect_uri = state_store.pop(state)
-    
     try:
         # Exchange code for token
         callback_url = f"{settings.API_URL}/api/v1/auth/callback"
         token_response = await exchange_code_for_token(code, callback_url)
         
+        # The ID token must carry Entra ID's signature and name the user
+        # whose Graph profile we are about to store
+        claims = await verify_entra_token(token_response.get("id_token") or "")
+        
         # Get user info from Microsoft Graph
         access_token = token_response.get("access_token")
         user_info = await get_user_info(access_token)
+        if claims.get("oid") != user_info.get("id"):
+            raise HTTPException(status_code=401, detail="ID token does not match the signed-in user")
         
         # Get or create user in database
         user = await get_or_create_user(session, user_info)
         
         # Log successful authentication
         logger.info(
-            f"Authentication successful | User: {user.email} | "
-            f"IP: {client_ip} | User-Agent: {user_agent} | "
-            f"Timestamp: {timestamp}"
+            "Authentication successful | User: %s | IP: %s | User-Agent: %s",
+            user.email, client_ip, user_agent
         )
         
         # Create session token
@@ -124,9 +142,11 @@ async def callback(
         )
         
         # Redirect to frontend with token as query parameter
-        return RedirectResponse(
+        response = RedirectResponse(
             f"{redirect_uri}?token={session_token}"
         )
+        response.delete_cookie(key=STATE_COOKIE, path=STATE_COOKIE_PATH)
+        return response
         
     except HTTPException as e:
         # Log detailed authentication failure
@@ -160,9 +180,7 @@ async def logout(request: Request, response: Response, redirect_uri: Optional[st
     
     # Log logout attempt
     logger.info(
-        f"Logout initiated | IP: {client_ip} | "
-        f"User-Agent: {user_agent} | "
-        f"Timestamp: {datetime.utcnow().isoformat()}"
+        "Logout initiated | IP: %s | User-Agent: %s", client_ip, user_agent
     )
     
     response = RedirectResponse(redirect_uri or settings.FRONTEND_URL)
@@ -177,54 +195,26 @@ async def get_current_user_info(
     Get current user information
     """
     try:
-        # Get user's profile picture URL from Microsoft Graph
-        photo_url = f"{MICROSOFT_GRAPH_ENDPOINT}/users/{current_user.id}/photo/$value"
-        
-        # Log the attempt to get photo
-        logger.info(
-            f"Attempting to get user photo | User: {current_user.email} | "
-            f"Photo URL: {photo_url}"
-        )
+        # Answer photo existence from the photo cache; Graph is asked at most once per TTL
+        photo = await photo_cache.get(current_user.id)
+        photo_url = None
+        if photo.exists:
+            # Signed, because the browser loads it with an <img> tag and
+            # cannot send the Authorization header
+            photo_url = f"{settings.API_URL}{sign_photo_url(current_user.id, photo.digest)}"
         
-        # Get a new token for Microsoft Graph API
-        access_token = await get_graph_token()
-        
-        # Check if photo exists by making a GET request
-        async with httpx.AsyncClient() as client:
-            response = await client.get(
-                photo_url, 
-                headers={"Authorization": f"Bearer {access_token}"}
-            )
-            
-            # Log the response status and headers
-            logger.info(
-                f"Photo request response | Status: {response.status_code} | "
-                f"Headers: {dict(response.headers)}"
-            )
-            
-            if response.status_code == 404:
-                logger.info(f"No photo found for user: {current_user.email}")
-                photo_url = None
-            elif response.status_code != 200:
-                logger.warning(
-                    f"Unexpected status code when fetching photo | "
-                    f"Status: {response.status_code} | "
-                    f"Response: {response.text}"
-                )
-                photo_url = None
-                
         user_info = {
             "id": current_user.id,
             "email": current_user.email,
             "name": current_user.name,
             "role": current_user.role,
-            "photoUrl": photo_url if photo_url else None
+            "photoUrl": photo_url
         }
         
-        # Log the final user info being returned
-        logger.info(
-            f"Returning user info | User: {current_user.email} | "
-            f"Has photo: {photo_url is not None}"
+        # Called on every page load, so only at DEBUG
+        logger.debug(
+            "Returning user info | User: %s | Has photo: %s",
+            current_user.email, photo_url is not None
         )
         
         return user_info
@@ -242,3 +232,44 @@ async def get_current_user_info(
             "name": current_user.name,
             "role": current_user.role
         }
+
+@router.get("/photo/{user_id}")
+async def get_user_photo(
+    request: Request,
+    user_id: str,
+    v: str = Query(...),
+    exp: int = Query(...),
+    sig: str = Query(...),
+):
+    """
+    Serve a user's profile photo from the photo cache. The URL is signed by
+    /me, so no Authorization header is needed.
+    """
+    if not verify_photo_signature(user_id, v, exp, sig):
+        raise HTTPException(status_code=403, detail="Invalid or expired photo URL")
+
+    photo = await photo_cache.get(user_id)
+    if not photo.exists:
+        raise HTTPException(status_code=404, detail="Photo not found")
+
+    etag = f'"{photo.digest}"'
+    # Browsers must not keep the photo past the URL's own expiry
+    max_age = max(min(settings.PHOTO_CACHE_TTL, exp - int(time.time())), 0)
+    headers = {
+        "ETag": etag,
+        "Cache-Control": f"private, max-age={max_age}",
+    }
+    if etag_matches(request, etag):
+        return Response(status_code=304, headers=headers)
+
+    content = await photo_cache.read_content(photo)
+    if content is None:
+        # Pruned from the disk store; fetch it again once
+        photo_cache.invalidate(user_id)
+        photo = await photo_cache.get(user_id)
+        content = await photo_cache.read_content(photo) if photo.exists else None
+        if content is None:
+            raise HTTPException(status_code=404, detail="Photo not found")
+        headers["ETag"] = f'"{photo.digest}"'
+
+    return Response(content=content, media_type=photo.content_type, headers=headers)
@@ -0,0 +1,189 @@
+from datetime import datetime
+from typing import Any, List, Optional
+from fastapi import APIRouter, Depends, HTTPException, Query, Response, status
+from sqlmodel.ext.asyncio.session import AsyncSession
+from sqlmodel import select
+
+from app.core.activity import activity_writer
+from app.core.pagination import NEXT_CURSOR_HEADER, decode_cursor, encode_cursor
+from app.core.serialization import RowSerializer
+from app.crud.crud_comment import comment as crud_comment
+from app.deps import get_current_active_user, get_session
+from app.models.comment import Comment, CommentCreate, CommentRead
+from app.models.project import Project
+from app.models.task import Task
+from app.models.user import User
+from app.routers.projects import invalidate_project_lists
+
+router = APIRouter()
+
+comment_serializer = RowSerializer(CommentRead)
+
+
+@router.get("/{project_id}/comments", response_model=List[CommentRead])
+async def read_project_comments(
+    *,
+    session: AsyncSession = Depends(get_session),
+    project_id: int,
+    limit: int = Query(50, ge=1, le=500),
+    cursor: Optional[str] = Query(None, description="Cursor from the X-Next-Cursor header of the previous page"),
+    current_user: User = Depends(get_current_active_user),
+) -> Any:
+    """
+    Retrieve a project's comments, oldest first.
+    
+    When a full page is returned, the X-Next-Cursor header holds the cursor
+    for the next page.
+    """
+    position = decode_cursor(cursor, datetime, int) if cursor else None
+    comments = await crud_comment.get_page(session, project_id=project_id, cursor=position, limit=limit)
+    if not comments and position is None:
+        await _get_project_owner(session, project_id)
+    return _comment_page_response(comments, limit)
+
+
+@router.post("/{project_id}/comments", response_model=CommentRead, status_code=status.HTTP_201_CREATED)
+async def create_project_comment(
+    *,
+    session: AsyncSession = Depends(get_session),
+    project_id: int,
+    comment_in: CommentCreate,
+    current_user: User = Depends(get_current_active_user),
+) -> Any:
+    """
+    Comment on a project.
+    """
+    owner_id = await _get_project_owner(session, project_id)
+    comment = await crud_comment.create_on(
+        session, obj_in=comment_in, user_id=current_user.id, project_id=project_id
+    )
+    # Cached project lists carry comment_count
+    await invalidate_project_lists(owner_id)
+    await activity_writer.record("create", "comment", comment.id, current_user.id, {"project_id": project_id})
+    return comment
+
+
+@router.delete("/{project_id}/comments/{comment_id}", status_code=status.HTTP_204_NO_CONTENT)
+async def delete_project_comment(
+    *,
+    session: AsyncSession = Depends(get_session),
+    project_id: int,
+    comment_id: int,
+    current_user: User = Depends(get_current_active_user),
+) -> None:
+    """
+    Delete a project comment. Only its author can delete it.
+    """
+    deleted = await crud_comment.remove_own(
+        session, id=comment_id, user_id=current_user.id, project_id=project_id
+    )
+    if deleted is None:
+        await _raise_delete_failure(session, comment_id, Comment.project_id == project_id)
+    
+    await invalidate_project_lists(await _get_project_owner(session, project_id))
+    await activity_writer.record("delete", "comment", comment_id, current_user.id, {"project_id": project_id})
+
+
+@router.get("/{project_id}/tasks/{task_id}/comments", response_model=List[CommentRead])
+async def read_task_comments(
+    *,
+    session: AsyncSession = Depends(get_session),
+    project_id: int,
+    task_id: int,
+    limit: int = Query(50, ge=1, le=500),
+    cursor: Optional[str] = Query(None, description="Cursor from the X-Next-Cursor header of the previous page"),
+    current_user: User = Depends(get_current_active_user),
+) -> Any:
+    """
+    Retrieve a task's comments, oldest first.
+    
+    When a full page is returned, the X-Next-Cursor header holds the cursor
+    for the next page.
+    """
+    await _check_task(session, project_id, task_id)
+    position = decode_cursor(cursor, datetime, int) if cursor else None
+    comments = await crud_comment.get_page(session, task_id=task_id, cursor=position, limit=limit)
+    return _comment_page_response(comments, limit)
+
+
+@router.post("/{project_id}/tasks/{task_id}/comments", response_model=CommentRead, status_code=status.HTTP_201_CREATED)
+async def create_task_comment(
+    *,
+    session: AsyncSession = Depends(get_session),
+    project_id: int,
+    task_id: int,
+    comment_in: CommentCreate,
+    current_user: User = Depends(get_current_active_user),
+) -> Any:
+    """
+    Comment on a task.
+    """
+    await _check_task(session, project_id, task_id)
+    comment = await crud_comment.create_on(
+        session, obj_in=comment_in, user_id=current_user.id, task_id=task_id
+    )
+    await activity_writer.record("create", "comment", comment.id, current_user.id, {"task_id": task_id})
+    return comment
+
+
+@router.delete("/{project_id}/tasks/{task_id}/comments/{comment_id}", status_code=status.HTTP_204_NO_CONTENT)
+async def delete_task_comment(
+    *,
+    session: AsyncSession = Depends(get_session),
+    project_id: int,
+    task_id: int,
+    comment_id: int,
+    current_user: User = Depends(get_current_active_user),
+) -> None:
+    """
+    Delete a task comment. Only its author can delete it.
+    """
+    await _check_task(session, project_id, task_id)
+    deleted = await crud_comment.remove_own(
+        session, id=comment_id, user_id=current_user.id, task_id=task_id
+    )
+    if deleted is None:
+        await _raise_delete_failure(session, comment_id, Comment.task_id == task_id)
+    
+    await activity_writer.record("delete", "comment", comment_id, current_user.id, {"task_id": task_id})
+
+
+def _comment_page_response(comments: List[Comment], limit: int) -> Response:
+    headers = {}
+    if len(comments) == limit:
+        last = comments[-1]
+        headers[NEXT_CURSOR_HEADER] = encode_cursor(last.created_at, last.id)
+    return Response(
+        content=comment_serializer.dump_list(comments),
+        media_type="application/json",
+        headers=headers,
+    )
+
+
+async def _get_project_owner(session: AsyncSession, project_id: int) -> str:
+    result = await session.execute(select(Project.user_id).where(Project.id == project_id))
+    owner_id = result.scalar_one_or_none()
+    if owner_id is None:
+        raise HTTPException(status_code=404, detail="Project not found")
+    return owner_id
+
+
+async def _check_task(session: AsyncSession, project_id: int, task_id: int) -> None:
+    result = await session.execute(
+        select(Task.id).where(Task.id == task_id, Task.project_id == project_id)
+    )
+    if result.scalar_one_or_none() is None:
+        raise HTTPException(status_code=404, detail="Task not found")
+
+
+async def _raise_delete_failure(session: AsyncSession, comment_id: int, parent: Any) -> None:
+    """
+    Raise 404 or 403 for a comment delete that matched nothing.
+    """
+    result = await session.execute(select(Comment.id).where(Comment.id == comment_id, parent))
+    if result.scalar_one_or_none() is None:
+        raise HTTPException(status_code=404, detail="Comment not found")
+    raise HTTPException(
+        status_code=403,
+        detail="Not enough permissions to delete this comment"
+    )
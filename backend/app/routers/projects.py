@@ -1,38 +1,128 @@
-from typing import Any, List, Optional
-from fastapi import APIRouter, Depends, HTTPException, status, Query
+import csv
+import hashlib
+import io
+import itertools
+import json
+from datetime import datetime
+from typing import Any, AsyncIterator, Dict, Iterator, List, Optional, Tuple
+import asyncpg
+from fastapi import APIRouter, Depends, File, HTTPException, Request, Response, UploadFile, status, Query
+from fastapi.concurrency import run_in_threadpool
+from fastapi.responses import StreamingResponse
+from pydantic import ValidationError
 from sqlmodel.ext.asyncio.session import AsyncSession
+from sqlalchemy import delete, func, insert, update
+from sqlalchemy.exc import DataError
 from sqlmodel import select
+from app.core.activity import activity_writer
+from app.core.config import settings
+from app.core.conditional import REVALIDATE_CACHE_CONTROL, etag_matches, make_etag, not_modified
+from app.core.pagination import NEXT_CURSOR_HEADER, decode_cursor, encode_cursor
+from app.core.response_cache import projects_namespace, response_cache
+from app.core.serialization import RowSerializer, dumps
+from app.crud.crud_project import ProjectImporter, project as crud_project
+from app.db.session import async_session
 from app.deps import get_current_active_user, get_session
 from app.models.user import User
-from app.models.project import Project, ProjectCreate, ProjectRead, ProjectUpdate
+from app.models.project import (
+    Project,
+    ProjectBulkDelete,
+    ProjectBulkResult,
+    ProjectBulkUpdate,
+    ProjectCreate,
+    ProjectImportError,
+    ProjectImportResult,
+    ProjectImportRow,
+    ProjectRead,
+    ProjectUpdate,
+)
 
 router = APIRouter()
 
+project_serializer = RowSerializer(ProjectRead)
+
+
+async def invalidate_project_lists(owner_id: str) -> None:
+    """
+    Bump the cached list versions affected by a write to owner_id's projects.
+    """
+    await response_cache.invalidate(projects_namespace(owner_id), projects_namespace())
+
 
 @router.get("/", response_model=List[ProjectRead])
 async def read_projects(
+    request: Request,
     session: AsyncSession = Depends(get_session),
     skip: int = 0,
-    limit: int = 100,
+    limit: int = Query(100, ge=1, le=1000),
+    cursor: Optional[str] = Query(None, description="Cursor from the X-Next-Cursor header of the previous page"),
     current_user: User = Depends(get_current_active_user),
     user_id: Optional[str] = Query(None, description="Filter projects by user ID"),
 ) -> Any:
     """
-    Retrieve projects. If user_id is provided, returns projects for that specific user.
-    Otherwise, returns all projects.
+    Retrieve projects, most recently updated first. If user_id is provided,
+    returns projects for that specific user. Otherwise, returns all projects.
+    
+    When a full page is returned, the X-Next-Cursor header holds the cursor
+    for the next page. `skip` is still honoured when no cursor is given.
+    Encoded pages are served from the response cache until a write to the
+    listed owner's projects bumps the cache version. A per-worker cache
+    cannot see other workers' writes, so with several workers and no shared
+    backend pages are read fresh and the ETag is computed from the body.
     """
-    query = select(Project)
+    position = decode_cursor(cursor, datetime, int) if cursor else None
+    if not response_cache.consistent:
+        # A per-worker cache misses other workers' writes; query every time
+        # and derive the ETag from the body instead of the list version
+        projects, next_cursor = await _read_project_page(session, user_id, position, skip, limit)
+        body = project_serializer.dump_list(projects)
+        etag = make_etag(hashlib.sha256(body).hexdigest())
+        if etag_matches(request, etag):
+            return not_modified(etag)
+        return _project_list_response(body, next_cursor, etag)
+
+    cache_key = await response_cache.versioned_key(
+        projects_namespace(user_id), limit, skip if position is None else 0, cursor or ""
+    )
     
-    # If user_id is provided, filter by that user
-    if user_id:
-        query = query.where(Project.user_id == user_id)
+    # The key embeds the list version, so it doubles as the ETag source
+    etag = make_etag(cache_key)
+    if etag_matches(request, etag):
+        return not_modified(etag)
     
-    # Add pagination
-    query = query.offset(skip).limit(limit)
+    cached = await response_cache.get(cache_key)
+    if cached is not None:
+        next_cursor, _, body = cached.partition(b"\n")
+        return _project_list_response(body, next_cursor.decode(), etag)
     
-    result = await session.execute(query)
-    projects = result.scalars().all()
-    return projects
+    projects, next_cursor = await _read_project_page(session, user_id, position, skip, limit)
+    body = project_serializer.dump_list(projects)
+    await response_cache.set(cache_key, next_cursor.encode() + b"\n" + body)
+    return _project_list_response(body, next_cursor, etag)
+
+
+async def _read_project_page(
+    session: AsyncSession,
+    owner_id: Optional[str],
+    position: Optional[Tuple[datetime, int]],
+    skip: int,
+    limit: int,
+) -> Tuple[List[Project], str]:
+    projects = await crud_project.get_page(
+        session, owner_id=owner_id, cursor=position, skip=skip, limit=limit
+    )
+    next_cursor = ""
+    if len(projects) == limit:
+        last = projects[-1]
+        next_cursor = encode_cursor(last.updated_at, last.id)
+    return projects, next_cursor
+
+
+def _project_list_response(body: bytes, next_cursor: str, etag: str) -> Response:
+    headers = {"ETag": etag, "Cache-Control": REVALIDATE_CACHE_CONTROL}
+    if next_cursor:
+        headers[NEXT_CURSOR_HEADER] = next_cursor
+    return Response(content=body, media_type="application/json", headers=headers)
 
 
 @router.post("/", response_model=ProjectRead, status_code=status.HTTP_201_CREATED)
@@ -47,24 +137,373 @@ async def create_project(
     """
     project_data = project_in.model_dump()
     project_data["user_id"] = current_user.id
-    project = Project.model_validate(project_data)
+    # Validate through the model for defaults, then INSERT ... RETURNING
+    row = Project.model_validate(project_data).model_dump(exclude={"id"})
     
-    session.add(project)
+    result = await session.execute(insert(Project).values(**row).returning(Project))
+    project = result.scalar_one()
     await session.commit()
-    await session.refresh(project)
+    await invalidate_project_lists(project.user_id)
+    await activity_writer.record("create", "project", project.id, current_user.id, {"name": project.name})
     
     return project
 
 
+@router.get("/search", response_model=List[ProjectRead])
+async def search_projects(
+    session: AsyncSession = Depends(get_session),
+    q: str = Query(..., min_length=1, max_length=200, description="Search terms"),
+    user_id: Optional[str] = Query(None, description="Filter projects by user ID"),
+    project_status: Optional[str] = Query(None, alias="status", description="Filter projects by status"),
+    limit: int = Query(20, ge=1, le=100),
+    cursor: Optional[str] = Query(None, description="Cursor from the X-Next-Cursor header of the previous page"),
+    current_user: User = Depends(get_current_active_user),
+) -> Any:
+    """
+    Search projects by name and description, best match first.
+    
+    Supports web-search syntax ("quoted phrases", -excluded words, OR) and
+    tolerates typos and partial words in project names. When a full page is
+    returned, the X-Next-Cursor header holds the cursor for the next page.
+    """
+    position = decode_cursor(cursor, float, int) if cursor else None
+    rows = await crud_project.search(
+        session, q=q, owner_id=user_id, status=project_status, cursor=position, limit=limit
+    )
+    
+    headers = {}
+    if len(rows) == limit:
+        last, rank = rows[-1]
+        headers[NEXT_CURSOR_HEADER] = encode_cursor(rank, last.id)
+    
+    return Response(
+        content=project_serializer.dump_list(project for project, _ in rows),
+        media_type="application/json",
+        headers=headers,
+    )
+
+
+EXPORT_FORMATS = {
+    "ndjson": "application/x-ndjson",
+    "csv": "text/csv",
+}
+
+
+@router.get("/export")
+async def export_projects(
+    format: str = Query("ndjson", pattern="^(ndjson|csv)$", description="ndjson or csv"),
+    user_id: Optional[str] = Query(None, description="Filter projects by user ID"),
+    current_user: User = Depends(get_current_active_user),
+) -> StreamingResponse:
+    """
+    Stream all projects as NDJSON or CSV.
+    
+    Rows are read through a server-side cursor in EXPORT_CHUNK_SIZE batches
+    and written out as they arrive, so memory use does not grow with the
+    table. If the client disconnects the stream is cancelled, which closes
+    the cursor and ends the query.
+    """
+    query = select(*Project.__table__.c).order_by(Project.id)
+    if user_id:
+        query = query.where(Project.user_id == user_id)
+    
+    return StreamingResponse(
+        _stream_projects(query, format),
+        media_type=EXPORT_FORMATS[format],
+        headers={"Content-Disposition": f'attachment; filename="projects.{format}"'},
+    )
+
+
+async def _stream_projects(query: Any, format: str) -> AsyncIterator[bytes]:
+    # The request-scoped session is closed before the body is streamed, so use our own
+    async with async_session() as session:
+        result = await session.stream(
+            query.execution_options(yield_per=settings.EXPORT_CHUNK_SIZE)
+        )
+        columns = list(result.keys())
+        if format == "csv":
+            yield _csv_chunk([columns])
+        async for rows in result.partitions():
+            if format == "csv":
+                yield _csv_chunk(rows)
+            else:
+                yield b"".join(dumps(dict(zip(columns, row))) + b"\n" for row in rows)
+
+
+def _csv_chunk(rows: Any) -> bytes:
+    buffer = io.StringIO()
+    csv.writer(buffer).writerows(rows)
+    return buffer.getvalue().encode()
+
+
+@router.post("/import", response_model=ProjectImportResult)
+async def import_projects(
+    *,
+    session: AsyncSession = Depends(get_session),
+    file: UploadFile = File(...),
+    format: Optional[str] = Query(None, pattern="^(ndjson|csv)$", description="Defaults to the file extension"),
+    current_user: User = Depends(get_current_active_user),
+) -> Any:
+    """
+    Import projects from a CSV (with a header row) or NDJSON upload.
+    
+    The upload is parsed incrementally and valid rows are loaded in
+    IMPORT_BATCH_SIZE batches with binary COPY into a staging table, then
+    merged in one transaction: rows with an `id` update that project if the
+    current user owns it, other rows create new projects. Invalid rows are
+    reported by line number and do not abort the import.
+    """
+    if format is None:
+        filename = (file.filename or "").lower()
+        format = "ndjson" if filename.endswith((".ndjson", ".jsonl")) else "csv"
+    
+    importer = ProjectImporter(session, owner_id=current_user.id)
+    await importer.start()
+    
+    rows = _iter_import_rows(file.file, format)
+    errors: List[ProjectImportError] = []
+    failed = 0
+    done = False
+    try:
+        while not done:
+            # Parsing and validation are CPU-bound, keep them off the event loop
+            records, batch_errors, done = await run_in_threadpool(
+                _next_import_batch, rows, settings.IMPORT_BATCH_SIZE
+            )
+            if records:
+                await importer.copy(records)
+            failed += len(batch_errors)
+            errors.extend(batch_errors[:settings.IMPORT_MAX_ERRORS - len(errors)])
+        
+        inserted, updated, rejected = await importer.merge()
+    except (DataError, asyncpg.DataError) as e:
+        # A value validation let through but the column type rejects. COPY
+        # talks to asyncpg directly, so its errors are not wrapped.
+        await session.rollback()
+        raise HTTPException(
+            status_code=400,
+            detail=f"Could not import upload: {str(getattr(e, 'orig', None) or e)}",
+        )
+    await session.commit()
+    if inserted or updated:
+        await invalidate_project_lists(current_user.id)
+    
+    failed += len(rejected)
+    errors.extend(
+        ProjectImportError(line=line, detail=detail)
+        for line, detail in rejected[:settings.IMPORT_MAX_ERRORS - len(errors)]
+    )
+    errors.sort(key=lambda e: e.line)
+    return ProjectImportResult(inserted=inserted, updated=updated, failed=failed, errors=errors)
+
+
+def _iter_import_rows(file: Any, format: str) -> Iterator[Tuple[int, Any]]:
+    """
+    Yield (line number, parsed row) pairs from an uploaded file, one at a time.
+    """
+    text_stream = io.TextIOWrapper(file, encoding="utf-8-sig", newline="")
+    try:
+        if format == "csv":
+            reader = csv.DictReader(text_stream)
+            for row in reader:
+                yield reader.line_num, row
+        else:
+            for line_no, line in enumerate(text_stream, start=1):
+                if not line.strip():
+                    continue
+                try:
+                    yield line_no, json.loads(line)
+                except ValueError:
+                    yield line_no, None
+    finally:
+        # Leave the upload's file open; UploadFile closes it
+        text_stream.detach()
+
+
+def _next_import_batch(
+    rows: Iterator[Tuple[int, Any]], batch_size: int
+) -> Tuple[List[Tuple[Any, ...]], List[ProjectImportError], bool]:
+    records: List[Tuple[Any, ...]] = []
+    errors: List[ProjectImportError] = []
+    consumed = 0
+    try:
+        for line, raw in itertools.islice(rows, batch_size):
+            consumed += 1
+            if not isinstance(raw, dict):
+                errors.append(ProjectImportError(line=line, detail="Invalid row"))
+                continue
+            data = {
+                key: value for key, value in raw.items()
+                if key in ProjectImportRow.model_fields and value not in ("", None)
+            }
+            try:
+                row = ProjectImportRow.model_validate(data)
+            except ValidationError as e:
+                detail = "; ".join(
+                    f"{'.'.join(str(loc) for loc in err['loc'])}: {err['msg']}" for err in e.errors()
+                )
+                errors.append(ProjectImportError(line=line, detail=detail))
+                continue
+            records.append((line, row.id, row.name, row.description, row.status))
+    except (UnicodeDecodeError, csv.Error) as e:
+        raise HTTPException(status_code=400, detail=f"Could not parse upload: {str(e)}")
+    return records, errors, consumed < batch_size
+
+
+def _check_bulk_size(items: List[Any]) -> None:
+    if len(items) > settings.BULK_MAX_ITEMS:
+        raise HTTPException(
+            status_code=status.HTTP_413_REQUEST_ENTITY_TOO_LARGE,
+            detail=f"At most {settings.BULK_MAX_ITEMS} items per bulk request",
+        )
+
+
+async def _missing_project_results(
+    session: AsyncSession, ids: List[int], index_by_id: Dict[int, int], action: str
+) -> List[ProjectBulkResult]:
+    """
+    Explain why the given IDs were not affected: missing (404) or not owned (403).
+    """
+    if not ids:
+        return []
+    result = await session.execute(
+        select(Project.id, Project.user_id).where(Project.id.in_(ids))
+    )
+    owners = dict(result.all())
+    results = []
+    for project_id in ids:
+        if project_id in owners:
+            status_code, detail = 403, f"Not enough permissions to {action} this project"
+        else:
+            status_code, detail = 404, "Project not found"
+        results.append(ProjectBulkResult(
+            index=index_by_id[project_id], id=project_id, status_code=status_code, detail=detail
+        ))
+    return results
+
+
+@router.post("/bulk", response_model=List[ProjectBulkResult])
+async def create_projects_bulk(
+    *,
+    session: AsyncSession = Depends(get_session),
+    projects_in: List[ProjectCreate],
+    current_user: User = Depends(get_current_active_user),
+) -> Any:
+    """
+    Create many projects owned by the current user in one transaction.
+    """
+    _check_bulk_size(projects_in)
+    projects = await crud_project.create_many(
+        session, objs_in=[p.model_dump() for p in projects_in], extra={"user_id": current_user.id}
+    )
+    if projects:
+        await invalidate_project_lists(current_user.id)
+    for project in projects:
+        await activity_writer.record("create", "project", project.id, current_user.id, {"name": project.name})
+    
+    return [
+        ProjectBulkResult(index=index, id=project.id, status_code=201, project=project)
+        for index, project in enumerate(projects)
+    ]
+
+
+@router.patch("/bulk", response_model=List[ProjectBulkResult])
+async def update_projects_bulk(
+    *,
+    session: AsyncSession = Depends(get_session),
+    projects_in: List[ProjectBulkUpdate],
+    current_user: User = Depends(get_current_active_user),
+) -> Any:
+    """
+    Update many projects in one transaction. Only projects owned by the
+    current user are updated; others are reported per item.
+    """
+    _check_bulk_size(projects_in)
+    index_by_id = {p.id: index for index, p in enumerate(projects_in)}
+    if len(index_by_id) != len(projects_in):
+        raise HTTPException(status_code=400, detail="Duplicate project ids in request")
+    
+    items = [(p.id, p.model_dump(exclude_unset=True, exclude={"id"})) for p in projects_in]
+    updated = await crud_project.update_many(
+        session, items=items, filters=[Project.user_id == current_user.id]
+    )
+    if updated:
+        await invalidate_project_lists(current_user.id)
+    fields_by_id = dict(items)
+    for project in updated:
+        await activity_writer.record(
+            "update", "project", project.id, current_user.id, {"fields": sorted(fields_by_id[project.id])}
+        )
+    
+    results = [
+        ProjectBulkResult(index=index_by_id[project.id], id=project.id, status_code=200, project=project)
+        for project in updated
+    ]
+    updated_ids = {project.id for project in updated}
+    results += await _missing_project_results(
+        session, [p.id for p in projects_in if p.id not in updated_ids], index_by_id, "update"
+    )
+    return sorted(results, key=lambda r: r.index)
+
+
+@router.delete("/bulk", response_model=List[ProjectBulkResult])
+async def delete_projects_bulk(
+    *,
+    session: AsyncSession = Depends(get_session),
+    projects_in: ProjectBulkDelete,
+    current_user: User = Depends(get_current_active_user),
+) -> Any:
+    """
+    Delete many projects in one transaction. Only projects owned by the
+    current user are deleted; others are reported per item.
+    """
+    _check_bulk_size(projects_in.ids)
+    index_by_id = {}
+    for index, project_id in enumerate(projects_in.ids):
+        index_by_id.setdefault(project_id, index)
+    
+    removed = await crud_project.remove_many(
+        session, ids=list(index_by_id), filters=[Project.user_id == current_user.id]
+    )
+    if removed:
+        await invalidate_project_lists(current_user.id)
+    for project_id in removed:
+        await activity_writer.record("delete", "project", project_id, current_user.id)
+    
+    results = [
+        ProjectBulkResult(index=index_by_id[project_id], id=project_id, status_code=204)
+        for project_id in removed
+    ]
+    removed_ids = set(removed)
+    results += await _missing_project_results(
+        session, [i for i in index_by_id if i not in removed_ids], index_by_id, "delete"
+    )
+    return sorted(results, key=lambda r: r.index)
+
+
 @router.get("/{id}", response_model=ProjectRead)
 async def read_project(
     *,
+    request: Request,
     session: AsyncSession = Depends(get_session),
     id: int
 ) -> Any:
     """
     Get project by ID.
+    
+    Conditional requests are answered from a `SELECT updated_at, comment_count`
+    alone: a matching If-None-Match returns 304 without loading the row.
     """
+    if request.headers.get("If-None-Match"):
+        result = await session.execute(
+            select(Project.updated_at, Project.comment_count).where(Project.id == id)
+        )
+        version = result.one_or_none()
+        if version is not None:
+            etag = make_etag("project", id, version.updated_at.isoformat(), version.comment_count)
+            if etag_matches(request, etag):
+                return not_modified(etag)
+    
     result = await session.execute(
         select(Project).where(Project.id == id)
     )
@@ -73,7 +512,13 @@ async def read_project(
     if not project:
         raise HTTPException(status_code=404, detail="Project not found")
     
-    return project
+    return project_serializer.response(
+        project,
+        headers={
+            "ETag": make_etag("project", project.id, project.updated_at.isoformat(), project.comment_count),
+            "Cache-Control": REVALIDATE_CACHE_CONTROL,
+        },
+    )
 
 
 @router.patch("/{id}", response_model=ProjectRead)
@@ -87,22 +532,25 @@ async def update_project(
     """
     Update a project. Only the project owner can update it.
     """
+    project_data = project_in.dict(exclude_unset=True)
+    
+    # Ownership is part of the WHERE clause; set updated_at here too so
+    # ETags change when the updated_at trigger is not installed
     result = await session.execute(
-        select(Project).where(Project.id == id)
+        update(Project)
+        .where(Project.id == id, Project.user_id == current_user.id)
+        .values(**project_data, updated_at=func.now())
+        .returning(Project)
+        .execution_options(synchronize_session=False)
     )
     project = result.scalar_one_or_none()
     
     if not project:
-        raise HTTPException(status_code=404, detail="Project not found")
+        await _raise_write_failure(session, id, "update")
     
-    # Update project attributes
-    project_data = project_in.dict(exclude_unset=True)
-    for key, value in project_data.items():
-        setattr(project, key, value)
-    
-    session.add(project)
     await session.commit()
-    await session.refresh(project)
+    await invalidate_project_lists(project.user_id)
+    await activity_writer.record("update", "project", project.id, current_user.id, {"fields": sorted(project_data)})
     
     return project
 
@@ -118,19 +566,29 @@ async def delete_project(
     Delete a project. Only the project owner can delete it.
     """
     result = await session.execute(
-        select(Project).where(Project.id == id)
+        delete(Project)
+        .where(Project.id == id, Project.user_id == current_user.id)
+        .returning(Project.id)
+        .execution_options(synchronize_session=False)
     )
-    project = result.scalar_one_or_none()
     
-    if not project:
-        raise HTTPException(status_code=404, detail="Project not found")
+    if result.scalar_one_or_none() is None:
+        await _raise_write_failure(session, id, "delete")
     
-    # Check if the current user is the project owner
-    if project.user_id != current_user.id:
-        raise HTTPException(
-            status_code=403,
-            detail="Not enough permissions to delete this project"
-        )
-    
-    await session.delete(project)
     await session.commit()
+    await invalidate_project_lists(current_user.id)
+    await activity_writer.record("delete", "project", id, current_user.id)
+
+
+async def _raise_write_failure(session: AsyncSession, id: int, action: str) -> None:
+    """
+    Raise 404 or 403 for a write whose ownership-filtered statement matched nothing.
+    Only runs on the failure path, so successful writes stay single-statement.
+    """
+    result = await session.execute(select(Project.id).where(Project.id == id))
+    if result.scalar_one_or_none() is None:
+        raise HTTPException(status_code=404, detail="Project not found")
+    raise HTTPException(
+        status_code=403,
+        detail=f"Not enough permissions to {action} this project"
+    )
@@ -0,0 +1,22 @@
+from fastapi import APIRouter, Depends
+from sqlmodel.ext.asyncio.session import AsyncSession
+
+from app.deps import get_current_active_user, get_session
+from app.models.user import User
+from app.models.stats import DashboardStats
+from app.crud.crud_stats import stats
+
+router = APIRouter()
+
+@router.get("/", response_model=DashboardStats)
+async def read_stats(
+    current_user: User = Depends(get_current_active_user),
+    session: AsyncSession = Depends(get_session),
+):
+    """
+    Get project and task counts by status for the current user and globally.
+
+    Served from the trigger-maintained counters, so the cost does not grow
+    with the number of projects or tasks.
+    """
+    return await stats.get_dashboard(session, user_id=current_user.id)
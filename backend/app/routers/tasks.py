@@ -0,0 +1,193 @@
+from typing import Any, List, Optional
+from fastapi import APIRouter, Depends, HTTPException, Query, Response, status
+from sqlalchemy.exc import IntegrityError
+from sqlmodel.ext.asyncio.session import AsyncSession
+from sqlmodel import select
+
+from app.core.activity import activity_writer
+from app.core.pagination import NEXT_CURSOR_HEADER, decode_cursor, encode_cursor
+from app.crud.crud_task import task as crud_task
+from app.deps import get_current_active_user, get_session
+from app.models.project import Project
+from app.models.task import Task, TaskCreate, TaskRead, TaskReadWithRelations, TaskUpdate
+from app.models.user import User
+
+router = APIRouter()
+
+# PostgreSQL's default name for the tasks.assigned_to foreign key (sql/03_tasks.sql)
+ASSIGNEE_FOREIGN_KEY = "tasks_assigned_to_fkey"
+
+
+@router.get("/{project_id}/tasks", response_model=List[TaskReadWithRelations])
+async def read_tasks(
+    *,
+    response: Response,
+    session: AsyncSession = Depends(get_session),
+    project_id: int,
+    limit: int = Query(100, ge=1, le=1000),
+    cursor: Optional[str] = Query(None, description="Cursor from the X-Next-Cursor header of the previous page"),
+    task_status: Optional[str] = Query(None, alias="status", description="Filter tasks by status"),
+    assigned_to: Optional[str] = Query(None, description="Filter tasks by assignee ID"),
+    current_user: User = Depends(get_current_active_user),
+) -> Any:
+    """
+    Retrieve a project's tasks with their assignee and project.
+    
+    Assignees and projects are batch-loaded, so a page costs the same
+    number of queries whatever its size. When a full page is returned, the
+    X-Next-Cursor header holds the cursor for the next page.
+    """
+    after_id = decode_cursor(cursor, int)[0] if cursor else None
+    tasks = await crud_task.get_by_project(
+        session,
+        project_id=project_id,
+        after_id=after_id,
+        limit=limit,
+        status=task_status,
+        assigned_to=assigned_to,
+    )
+    if not tasks and after_id is None:
+        await _get_project_or_404(session, project_id)
+    
+    if len(tasks) == limit:
+        response.headers[NEXT_CURSOR_HEADER] = encode_cursor(tasks[-1].id)
+    return tasks
+
+
+@router.post("/{project_id}/tasks", response_model=TaskRead, status_code=status.HTTP_201_CREATED)
+async def create_task(
+    *,
+    session: AsyncSession = Depends(get_session),
+    project_id: int,
+    task_in: TaskCreate,
+    current_user: User = Depends(get_current_active_user),
+) -> Any:
+    """
+    Create a task. Only the project owner can add tasks.
+    """
+    try:
+        task = await crud_task.create_in_project(
+            session, project_id=project_id, owner_id=current_user.id, obj_in=task_in
+        )
+    except IntegrityError as e:
+        await session.rollback()
+        if _is_assignee_violation(e):
+            raise HTTPException(status_code=400, detail="Assignee not found")
+        raise
+    
+    if not task:
+        await _raise_project_write_failure(session, project_id, "add tasks to")
+    
+    await activity_writer.record("create", "task", task.id, current_user.id, {"project_id": project_id})
+    return task
+
+
+@router.get("/{project_id}/tasks/{task_id}", response_model=TaskReadWithRelations)
+async def read_task(
+    *,
+    session: AsyncSession = Depends(get_session),
+    project_id: int,
+    task_id: int,
+    current_user: User = Depends(get_current_active_user),
+) -> Any:
+    """
+    Get a task with its assignee and project.
+    """
+    task = await crud_task.get_in_project(session, project_id=project_id, id=task_id)
+    if not task:
+        raise HTTPException(status_code=404, detail="Task not found")
+    return task
+
+
+@router.patch("/{project_id}/tasks/{task_id}", response_model=TaskRead)
+async def update_task(
+    *,
+    session: AsyncSession = Depends(get_session),
+    project_id: int,
+    task_id: int,
+    task_in: TaskUpdate,
+    current_user: User = Depends(get_current_active_user),
+) -> Any:
+    """
+    Update a task. The project owner and the task's assignee can update it.
+    """
+    task_data = task_in.model_dump(exclude_unset=True)
+    try:
+        task = await crud_task.update_in_project(
+            session, project_id=project_id, id=task_id, user_id=current_user.id, update_data=task_data
+        )
+    except IntegrityError as e:
+        await session.rollback()
+        if _is_assignee_violation(e):
+            raise HTTPException(status_code=400, detail="Assignee not found")
+        raise
+    
+    if not task:
+        await _raise_task_write_failure(session, project_id, task_id, "update")
+    
+    await activity_writer.record("update", "task", task.id, current_user.id, {"fields": sorted(task_data)})
+    return task
+
+
+@router.delete("/{project_id}/tasks/{task_id}", status_code=status.HTTP_204_NO_CONTENT)
+async def delete_task(
+    *,
+    session: AsyncSession = Depends(get_session),
+    project_id: int,
+    task_id: int,
+    current_user: User = Depends(get_current_active_user),
+) -> None:
+    """
+    Delete a task. Only the project owner can delete it.
+    """
+    deleted = await crud_task.remove_in_project(
+        session, project_id=project_id, id=task_id, owner_id=current_user.id
+    )
+    if deleted is None:
+        await _raise_task_write_failure(session, project_id, task_id, "delete")
+    
+    await activity_writer.record("delete", "task", task_id, current_user.id, {"project_id": project_id})
+
+
+def _is_assignee_violation(e: IntegrityError) -> bool:
+    # SQLAlchemy's adapted exception is raised from asyncpg's, which names the constraint
+    driver_error = e.orig.__cause__ if e.orig is not None else None
+    return getattr(driver_error, "constraint_name", None) == ASSIGNEE_FOREIGN_KEY
+
+
+async def _get_project_or_404(session: AsyncSession, project_id: int) -> str:
+    result = await session.execute(select(Project.user_id).where(Project.id == project_id))
+    owner_id = result.scalar_one_or_none()
+    if owner_id is None:
+        raise HTTPException(status_code=404, detail="Project not found")
+    return owner_id
+
+
+async def _raise_project_write_failure(session: AsyncSession, project_id: int, action: str) -> None:
+    """
+    Raise 404 or 403 for a task write whose ownership check matched nothing.
+    """
+    await _get_project_or_404(session, project_id)
+    raise HTTPException(
+        status_code=403,
+        detail=f"Not enough permissions to {action} this project"
+    )
+
+
+async def _raise_task_write_failure(
+    session: AsyncSession, project_id: int, task_id: int, action: str
+) -> None:
+    """
+    Raise 404 or 403 for a task write whose permission-filtered statement matched nothing.
+    Only runs on the failure path, so successful writes stay single-statement.
+    """
+    await _get_project_or_404(session, project_id)
+    result = await session.execute(
+        select(Task.id).where(Task.id == task_id, Task.project_id == project_id)
+    )
+    if result.scalar_one_or_none() is None:
+        raise HTTPException(status_code=404, detail="Task not found")
+    raise HTTPException(
+        status_code=403,
+        detail=f"Not enough permissions to {action} this task"
+    )
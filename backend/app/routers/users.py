@@ -1,15 +1,17 @@
 from fastapi import APIRouter, Depends, HTTPException
 from sqlmodel.ext.asyncio.session import AsyncSession
 from sqlmodel import select
-import requests
 
 from app.deps import get_current_active_user, get_current_active_superuser, get_session
 from app.models.user import User
 from app.core.config import settings
 from app.core.auth import get_current_user
+from app.core.serialization import RowSerializer
 
 router = APIRouter()
 
+user_serializer = RowSerializer(User)
+
 @router.get("/me", response_model=User)
 async def read_users_me(
     current_user: User = Depends(get_current_active_user)
@@ -17,7 +19,7 @@ async def read_users_me(
     """
     Get current user.
     """
-    return current_user
+    return user_serializer.response(current_user)
 
 @router.get("/me/graph-profile")
 async def get_user_graph_profile(
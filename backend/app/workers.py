@@ -0,0 +1,22 @@
+"""
+Gunicorn worker classes for serving the app with uvicorn.
+
+UvicornWorker itself uses uvloop and httptools when they are installed;
+these subclasses pin the choice so SERVER_LOOP can force either path.
+"""
+
+from uvicorn.workers import UvicornWorker
+
+
+class AsyncioUvicornWorker(UvicornWorker):
+    """
+    Standard-library event loop and the pure-Python h11 HTTP parser.
+    """
+    CONFIG_KWARGS = {"loop": "asyncio", "http": "h11"}
+
+
+class FastUvicornWorker(UvicornWorker):
+    """
+    uvloop event loop and the httptools HTTP parser.
+    """
+    CONFIG_KWARGS = {"loop": "uvloop", "http": "httptools"}
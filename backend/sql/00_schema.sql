@@ -7,5 +7,8 @@ CREATE EXTENSION IF NOT EXISTS "uuid-ossp";
 -- Enable pgcrypto for better password hashing if needed
 CREATE EXTENSION IF NOT EXISTS "pgcrypto";
 
+-- Enable trigram matching for typo-tolerant project search
+CREATE EXTENSION IF NOT EXISTS "pg_trgm";
+
 -- Comment on schema
 COMMENT ON SCHEMA public IS 'Standard public schema for FullStack application';
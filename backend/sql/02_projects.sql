@@ -7,14 +7,33 @@ CREATE TABLE IF NOT EXISTS projects (
     created_at TIMESTAMP WITH TIME ZONE NOT NULL DEFAULT CURRENT_TIMESTAMP,
     updated_at TIMESTAMP WITH TIME ZONE NOT NULL DEFAULT CURRENT_TIMESTAMP,
     user_id VARCHAR(255) NOT NULL,
+    comment_count INTEGER NOT NULL DEFAULT 0,
     FOREIGN KEY (user_id) REFERENCES users (id) ON DELETE CASCADE
 );
 
+-- Added after the initial schema
+ALTER TABLE projects ADD COLUMN IF NOT EXISTS comment_count INTEGER NOT NULL DEFAULT 0;
+
+-- Full-text search document: name weighted above description
+ALTER TABLE projects ADD COLUMN IF NOT EXISTS search_vector tsvector
+    GENERATED ALWAYS AS (
+        setweight(to_tsvector('english', coalesce(name, '')), 'A') ||
+        setweight(to_tsvector('english', coalesce(description, '')), 'B')
+    ) STORED;
+
 -- Indexes
 CREATE INDEX IF NOT EXISTS idx_project_name ON projects (name);
 CREATE INDEX IF NOT EXISTS idx_project_status ON projects (status);
 CREATE INDEX IF NOT EXISTS idx_project_user_id ON projects (user_id);
 
+-- Keyset pagination indexes (ORDER BY updated_at DESC, id DESC)
+CREATE INDEX IF NOT EXISTS idx_project_updated_at_id ON projects (updated_at DESC, id DESC);
+CREATE INDEX IF NOT EXISTS idx_project_user_id_updated_at_id ON projects (user_id, updated_at DESC, id DESC);
+
+-- Search indexes: full-text matches and trigram (typo-tolerant) name matches
+CREATE INDEX IF NOT EXISTS idx_project_search_vector ON projects USING GIN (search_vector);
+CREATE INDEX IF NOT EXISTS idx_project_name_trgm ON projects USING GIN (name gin_trgm_ops);
+
 -- Comments
 COMMENT ON TABLE projects IS 'User projects';
 COMMENT ON COLUMN projects.id IS 'Unique project identifier';
@@ -24,8 +43,11 @@ COMMENT ON COLUMN projects.status IS 'Project status (active, completed, archive
 COMMENT ON COLUMN projects.created_at IS 'Timestamp when the project was created';
 COMMENT ON COLUMN projects.updated_at IS 'Timestamp when the project was last updated';
 COMMENT ON COLUMN projects.user_id IS 'Reference to the user who owns this project';
+COMMENT ON COLUMN projects.comment_count IS 'Number of comments, maintained by trigger (see 04_comments.sql)';
+COMMENT ON COLUMN projects.search_vector IS 'Generated full-text search document over name and description';
 
--- Update trigger for updated_at
+-- Update trigger for updated_at. Comment count maintenance is not an edit
+-- of the project, so it leaves updated_at alone
 CREATE OR REPLACE FUNCTION update_updated_at_column()
 RETURNS TRIGGER AS $$
 BEGIN
@@ -34,7 +56,91 @@ BEGIN
 END;
 $$ LANGUAGE plpgsql;
 
+DROP TRIGGER IF EXISTS update_project_updated_at ON projects;
 CREATE TRIGGER update_project_updated_at
 BEFORE UPDATE ON projects
 FOR EACH ROW
+WHEN (OLD.comment_count IS NOT DISTINCT FROM NEW.comment_count)
 EXECUTE FUNCTION update_updated_at_column();
+
+-- Dashboard counters, maintained incrementally by the triggers below so
+-- statistics never need a COUNT(*) over projects or tasks
+CREATE TABLE IF NOT EXISTS entity_counters (
+    scope VARCHAR(255) NOT NULL,
+    entity_type VARCHAR(50) NOT NULL,
+    status VARCHAR(50) NOT NULL,
+    count BIGINT NOT NULL DEFAULT 0,
+    PRIMARY KEY (scope, entity_type, status)
+);
+
+COMMENT ON TABLE entity_counters IS 'Per-user entity counts by status; global totals are their sum';
+COMMENT ON COLUMN entity_counters.scope IS 'User id the count belongs to, or *0..*15 for unassigned tasks';
+COMMENT ON COLUMN entity_counters.entity_type IS 'Counted entity (project, task)';
+COMMENT ON COLUMN entity_counters.status IS 'Entity status';
+COMMENT ON COLUMN entity_counters.count IS 'Number of entities with this status';
+
+-- Global rows from before the totals were summed on read
+DELETE FROM entity_counters WHERE scope = '*';
+
+-- Statement-level triggers: one aggregated upsert per statement, so bulk
+-- writes and COPY imports touch each counter row once instead of per row.
+-- Rows are upserted in key order to avoid deadlocks between writers.
+-- There is no global row: every writer would queue on it, so the totals
+-- are summed from the per-user rows on read.
+CREATE OR REPLACE FUNCTION maintain_project_counters()
+RETURNS TRIGGER AS $$
+BEGIN
+    IF TG_OP = 'INSERT' THEN
+        INSERT INTO entity_counters (scope, entity_type, status, count)
+        SELECT n.user_id, 'project', n.status, COUNT(*)
+        FROM new_rows n
+        GROUP BY n.user_id, n.status
+        ORDER BY n.user_id, n.status
+        ON CONFLICT (scope, entity_type, status)
+        DO UPDATE SET count = entity_counters.count + EXCLUDED.count;
+    ELSIF TG_OP = 'DELETE' THEN
+        INSERT INTO entity_counters (scope, entity_type, status, count)
+        SELECT o.user_id, 'project', o.status, -COUNT(*)
+        FROM old_rows o
+        GROUP BY o.user_id, o.status
+        ORDER BY o.user_id, o.status
+        ON CONFLICT (scope, entity_type, status)
+        DO UPDATE SET count = entity_counters.count + EXCLUDED.count;
+    ELSE
+        INSERT INTO entity_counters (scope, entity_type, status, count)
+        SELECT d.user_id, 'project', d.status, SUM(d.delta)
+        FROM (
+            SELECT user_id, status, -1 AS delta FROM old_rows
+            UNION ALL
+            SELECT user_id, status, 1 AS delta FROM new_rows
+        ) AS d
+        GROUP BY d.user_id, d.status
+        HAVING SUM(d.delta) <> 0
+        ORDER BY d.user_id, d.status
+        ON CONFLICT (scope, entity_type, status)
+        DO UPDATE SET count = entity_counters.count + EXCLUDED.count;
+    END IF;
+    RETURN NULL;
+END;
+$$ LANGUAGE plpgsql;
+
+DROP TRIGGER IF EXISTS count_project_inserts ON projects;
+CREATE TRIGGER count_project_inserts
+AFTER INSERT ON projects
+REFERENCING NEW TABLE AS new_rows
+FOR EACH STATEMENT
+EXECUTE FUNCTION maintain_project_counters();
+
+DROP TRIGGER IF EXISTS count_project_updates ON projects;
+CREATE TRIGGER count_project_updates
+AFTER UPDATE ON projects
+REFERENCING OLD TABLE AS old_rows NEW TABLE AS new_rows
+FOR EACH STATEMENT
+EXECUTE FUNCTION maintain_project_counters();
+
+DROP TRIGGER IF EXISTS count_project_deletes ON projects;
+CREATE TRIGGER count_project_deletes
+AFTER DELETE ON projects
+REFERENCING OLD TABLE AS old_rows
+FOR EACH STATEMENT
+EXECUTE FUNCTION maintain_project_counters();
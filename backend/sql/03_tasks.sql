@@ -1,4 +1,4 @@
--- Tasks table (for future implementation)
+-- Tasks table
 CREATE TABLE IF NOT EXISTS tasks (
     id SERIAL PRIMARY KEY,
     title VARCHAR(255) NOT NULL,
@@ -10,10 +10,14 @@ CREATE TABLE IF NOT EXISTS tasks (
     updated_at TIMESTAMP WITH TIME ZONE NOT NULL DEFAULT CURRENT_TIMESTAMP,
     project_id INTEGER NOT NULL,
     assigned_to VARCHAR(255),
+    comment_count INTEGER NOT NULL DEFAULT 0,
     FOREIGN KEY (project_id) REFERENCES projects (id) ON DELETE CASCADE,
     FOREIGN KEY (assigned_to) REFERENCES users (id) ON DELETE SET NULL
 );
 
+-- Added after the initial schema
+ALTER TABLE tasks ADD COLUMN IF NOT EXISTS comment_count INTEGER NOT NULL DEFAULT 0;
+
 -- Indexes
 CREATE INDEX IF NOT EXISTS idx_task_status ON tasks (status);
 CREATE INDEX IF NOT EXISTS idx_task_priority ON tasks (priority);
@@ -21,6 +25,9 @@ CREATE INDEX IF NOT EXISTS idx_task_due_date ON tasks (due_date);
 CREATE INDEX IF NOT EXISTS idx_task_project_id ON tasks (project_id);
 CREATE INDEX IF NOT EXISTS idx_task_assigned_to ON tasks (assigned_to);
 
+-- Keyset pagination within a project (ORDER BY id)
+CREATE INDEX IF NOT EXISTS idx_task_project_id_id ON tasks (project_id, id);
+
 -- Comments
 COMMENT ON TABLE tasks IS 'Project tasks';
 COMMENT ON COLUMN tasks.id IS 'Unique task identifier';
@@ -33,9 +40,76 @@ COMMENT ON COLUMN tasks.created_at IS 'Timestamp when the task was created';
 COMMENT ON COLUMN tasks.updated_at IS 'Timestamp when the task was last updated';
 COMMENT ON COLUMN tasks.project_id IS 'Reference to the project this task belongs to';
 COMMENT ON COLUMN tasks.assigned_to IS 'Reference to the user this task is assigned to';
+COMMENT ON COLUMN tasks.comment_count IS 'Number of comments, maintained by trigger (see 04_comments.sql)';
 
--- Update trigger for updated_at
+-- Update trigger for updated_at, skipped for comment count maintenance
+DROP TRIGGER IF EXISTS update_task_updated_at ON tasks;
 CREATE TRIGGER update_task_updated_at
 BEFORE UPDATE ON tasks
 FOR EACH ROW
+WHEN (OLD.comment_count IS NOT DISTINCT FROM NEW.comment_count)
 EXECUTE FUNCTION update_updated_at_column();
+
+-- Task counters (see entity_counters in 02_projects.sql). Per-user counts
+-- follow the assignee; unassigned tasks are spread over the scopes *0..*15
+-- by id so that creating them does not serialize on a single row.
+CREATE OR REPLACE FUNCTION maintain_task_counters()
+RETURNS TRIGGER AS $$
+BEGIN
+    IF TG_OP = 'INSERT' THEN
+        INSERT INTO entity_counters (scope, entity_type, status, count)
+        SELECT s.scope, 'task', n.status, COUNT(*)
+        FROM new_rows n
+        CROSS JOIN LATERAL (VALUES (COALESCE(n.assigned_to, '*' || n.id % 16))) AS s (scope)
+        GROUP BY s.scope, n.status
+        ORDER BY s.scope, n.status
+        ON CONFLICT (scope, entity_type, status)
+        DO UPDATE SET count = entity_counters.count + EXCLUDED.count;
+    ELSIF TG_OP = 'DELETE' THEN
+        INSERT INTO entity_counters (scope, entity_type, status, count)
+        SELECT s.scope, 'task', o.status, -COUNT(*)
+        FROM old_rows o
+        CROSS JOIN LATERAL (VALUES (COALESCE(o.assigned_to, '*' || o.id % 16))) AS s (scope)
+        GROUP BY s.scope, o.status
+        ORDER BY s.scope, o.status
+        ON CONFLICT (scope, entity_type, status)
+        DO UPDATE SET count = entity_counters.count + EXCLUDED.count;
+    ELSE
+        INSERT INTO entity_counters (scope, entity_type, status, count)
+        SELECT s.scope, 'task', d.status, SUM(d.delta)
+        FROM (
+            SELECT id, assigned_to, status, -1 AS delta FROM old_rows
+            UNION ALL
+            SELECT id, assigned_to, status, 1 AS delta FROM new_rows
+        ) AS d
+        CROSS JOIN LATERAL (VALUES (COALESCE(d.assigned_to, '*' || d.id % 16))) AS s (scope)
+        GROUP BY s.scope, d.status
+        HAVING SUM(d.delta) <> 0
+        ORDER BY s.scope, d.status
+        ON CONFLICT (scope, entity_type, status)
+        DO UPDATE SET count = entity_counters.count + EXCLUDED.count;
+    END IF;
+    RETURN NULL;
+END;
+$$ LANGUAGE plpgsql;
+
+DROP TRIGGER IF EXISTS count_task_inserts ON tasks;
+CREATE TRIGGER count_task_inserts
+AFTER INSERT ON tasks
+REFERENCING NEW TABLE AS new_rows
+FOR EACH STATEMENT
+EXECUTE FUNCTION maintain_task_counters();
+
+DROP TRIGGER IF EXISTS count_task_updates ON tasks;
+CREATE TRIGGER count_task_updates
+AFTER UPDATE ON tasks
+REFERENCING OLD TABLE AS old_rows NEW TABLE AS new_rows
+FOR EACH STATEMENT
+EXECUTE FUNCTION maintain_task_counters();
+
+DROP TRIGGER IF EXISTS count_task_deletes ON tasks;
+CREATE TRIGGER count_task_deletes
+AFTER DELETE ON tasks
+REFERENCING OLD TABLE AS old_rows
+FOR EACH STATEMENT
+EXECUTE FUNCTION maintain_task_counters();
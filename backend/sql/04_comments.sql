@@ -1,4 +1,4 @@
--- Comments table (for future implementation)
+-- Comments table
 CREATE TABLE IF NOT EXISTS comments (
     id SERIAL PRIMARY KEY,
     content TEXT NOT NULL,
@@ -17,10 +17,16 @@ CREATE TABLE IF NOT EXISTS comments (
 );
 
 -- Indexes
-CREATE INDEX IF NOT EXISTS idx_comment_task_id ON comments (task_id);
-CREATE INDEX IF NOT EXISTS idx_comment_project_id ON comments (project_id);
 CREATE INDEX IF NOT EXISTS idx_comment_user_id ON comments (user_id);
 
+-- Keyset pagination indexes (ORDER BY created_at, id within a project or task)
+CREATE INDEX IF NOT EXISTS idx_comment_project_id_created_at_id ON comments (project_id, created_at, id);
+CREATE INDEX IF NOT EXISTS idx_comment_task_id_created_at_id ON comments (task_id, created_at, id);
+
+-- Superseded by the keyset indexes above, which share their leading column
+DROP INDEX IF EXISTS idx_comment_task_id;
+DROP INDEX IF EXISTS idx_comment_project_id;
+
 -- Comments
 COMMENT ON TABLE comments IS 'Comments on tasks or projects';
 COMMENT ON COLUMN comments.id IS 'Unique comment identifier';
@@ -33,7 +39,59 @@ COMMENT ON COLUMN comments.user_id IS 'Reference to the user who created this co
 COMMENT ON CONSTRAINT check_comment_target ON comments IS 'Ensures a comment is associated with either a task or a project, but not both';
 
 -- Update trigger for updated_at
+DROP TRIGGER IF EXISTS update_comment_updated_at ON comments;
 CREATE TRIGGER update_comment_updated_at
 BEFORE UPDATE ON comments
 FOR EACH ROW
 EXECUTE FUNCTION update_updated_at_column();
+
+-- Keep projects.comment_count and tasks.comment_count current. Statement-level
+-- triggers, so a multi-row insert or a cascade delete touches each parent
+-- row once. A comment's target never changes, so UPDATE is not tracked.
+CREATE OR REPLACE FUNCTION maintain_comment_counts()
+RETURNS TRIGGER AS $$
+BEGIN
+    IF TG_OP = 'INSERT' THEN
+        UPDATE projects p SET comment_count = p.comment_count + d.n
+        FROM (SELECT project_id, COUNT(*) AS n FROM new_rows WHERE project_id IS NOT NULL GROUP BY project_id) AS d
+        WHERE p.id = d.project_id;
+
+        UPDATE tasks t SET comment_count = t.comment_count + d.n
+        FROM (SELECT task_id, COUNT(*) AS n FROM new_rows WHERE task_id IS NOT NULL GROUP BY task_id) AS d
+        WHERE t.id = d.task_id;
+    ELSE
+        -- Parents being deleted in the same cascade simply match no row
+        UPDATE projects p SET comment_count = GREATEST(p.comment_count - d.n, 0)
+        FROM (SELECT project_id, COUNT(*) AS n FROM old_rows WHERE project_id IS NOT NULL GROUP BY project_id) AS d
+        WHERE p.id = d.project_id;
+
+        UPDATE tasks t SET comment_count = GREATEST(t.comment_count - d.n, 0)
+        FROM (SELECT task_id, COUNT(*) AS n FROM old_rows WHERE task_id IS NOT NULL GROUP BY task_id) AS d
+        WHERE t.id = d.task_id;
+    END IF;
+    RETURN NULL;
+END;
+$$ LANGUAGE plpgsql;
+
+DROP TRIGGER IF EXISTS count_comment_inserts ON comments;
+CREATE TRIGGER count_comment_inserts
+AFTER INSERT ON comments
+REFERENCING NEW TABLE AS new_rows
+FOR EACH STATEMENT
+EXECUTE FUNCTION maintain_comment_counts();
+
+DROP TRIGGER IF EXISTS count_comment_deletes ON comments;
+CREATE TRIGGER count_comment_deletes
+AFTER DELETE ON comments
+REFERENCING OLD TABLE AS old_rows
+FOR EACH STATEMENT
+EXECUTE FUNCTION maintain_comment_counts();
+
+-- Backfill counts for comments written before the triggers existed
+UPDATE projects p SET comment_count = c.n
+FROM (SELECT project_id, COUNT(*) AS n FROM comments WHERE project_id IS NOT NULL GROUP BY project_id) AS c
+WHERE p.id = c.project_id AND p.comment_count <> c.n;
+
+UPDATE tasks t SET comment_count = c.n
+FROM (SELECT task_id, COUNT(*) AS n FROM comments WHERE task_id IS NOT NULL GROUP BY task_id) AS c
+WHERE t.id = c.task_id AND t.comment_count <> c.n;
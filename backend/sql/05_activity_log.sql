@@ -1,4 +1,4 @@
--- Activity log table (for future implementation)
+-- Activity log table
 CREATE TABLE IF NOT EXISTS activity_log (
     id SERIAL PRIMARY KEY,
     action VARCHAR(50) NOT NULL,
@@ -10,13 +10,27 @@ CREATE TABLE IF NOT EXISTS activity_log (
     FOREIGN KEY (user_id) REFERENCES users (id) ON DELETE CASCADE
 );
 
--- Indexes
-CREATE INDEX IF NOT EXISTS idx_activity_log_action ON activity_log (action);
-CREATE INDEX IF NOT EXISTS idx_activity_log_entity_type ON activity_log (entity_type);
-CREATE INDEX IF NOT EXISTS idx_activity_log_entity_id ON activity_log (entity_id);
-CREATE INDEX IF NOT EXISTS idx_activity_log_created_at ON activity_log (created_at);
-CREATE INDEX IF NOT EXISTS idx_activity_log_user_id ON activity_log (user_id);
-CREATE INDEX IF NOT EXISTS idx_activity_log_details ON activity_log USING GIN (details);
+-- Keyset pagination indexes for the feed (ORDER BY created_at DESC, id DESC),
+-- one per filter combination the API allows, so every page is a bounded
+-- index range scan. Non-admin feeds are always narrowed to the caller's
+-- user_id, hence the user_id + entity_type index; a single entity's history
+-- is small enough to filter by user_id after the entity index. An admin
+-- feed of one entity type walks the created_at index: there are only a few
+-- types, so a page is found after a few pages' worth of rows.
+CREATE INDEX IF NOT EXISTS idx_activity_log_created_at_id ON activity_log (created_at DESC, id DESC);
+CREATE INDEX IF NOT EXISTS idx_activity_log_user_id_created_at_id ON activity_log (user_id, created_at DESC, id DESC);
+CREATE INDEX IF NOT EXISTS idx_activity_log_user_id_entity_type_created_at_id ON activity_log (user_id, entity_type, created_at DESC, id DESC);
+CREATE INDEX IF NOT EXISTS idx_activity_log_entity_created_at_id ON activity_log (entity_type, entity_id, created_at DESC, id DESC);
+
+-- Superseded by the composite indexes above (they share the same leading
+-- columns), or serving filters the feed does not offer (action, details)
+DROP INDEX IF EXISTS idx_activity_log_created_at;
+DROP INDEX IF EXISTS idx_activity_log_user_id;
+DROP INDEX IF EXISTS idx_activity_log_entity_type;
+DROP INDEX IF EXISTS idx_activity_log_entity_id;
+DROP INDEX IF EXISTS idx_activity_log_entity_type_created_at_id;
+DROP INDEX IF EXISTS idx_activity_log_action;
+DROP INDEX IF EXISTS idx_activity_log_details;
 
 -- Comments
 COMMENT ON TABLE activity_log IS 'Log of user activities';
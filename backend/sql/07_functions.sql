@@ -63,3 +63,87 @@ END;
 $$ LANGUAGE plpgsql;
 
 COMMENT ON FUNCTION get_project_statistics IS 'Function to get statistics for a specific project';
+
+-- Function to repair drift in entity_counters
+CREATE OR REPLACE FUNCTION reconcile_entity_counters()
+RETURNS INTEGER AS $$
+DECLARE
+    candidate RECORD;
+    current_count BIGINT;
+    actual_count BIGINT;
+    repaired INTEGER := 0;
+BEGIN
+    -- Only one reconciliation at a time across workers; the others skip
+    IF NOT pg_try_advisory_xact_lock(hashtext('reconcile_entity_counters')) THEN
+        RETURN 0;
+    END IF;
+
+    -- Find counters that look wrong without locking anything. Writes in
+    -- flight show up here too, so each candidate is rechecked under its
+    -- row lock below.
+    FOR candidate IN
+        WITH actual AS (
+            SELECT user_id AS scope, 'project'::VARCHAR AS entity_type, status, COUNT(*) AS count
+            FROM projects GROUP BY user_id, status
+            UNION ALL
+            SELECT COALESCE(assigned_to, '*' || id % 16), 'task', status, COUNT(*)
+            FROM tasks GROUP BY COALESCE(assigned_to, '*' || id % 16), status
+        )
+        SELECT
+            COALESCE(a.scope, c.scope) AS scope,
+            COALESCE(a.entity_type, c.entity_type) AS entity_type,
+            COALESCE(a.status, c.status) AS status
+        FROM actual a
+        FULL JOIN entity_counters c
+            ON c.scope = a.scope AND c.entity_type = a.entity_type AND c.status = a.status
+        WHERE c.count IS DISTINCT FROM a.count
+            AND NOT (a.count IS NULL AND c.count = 0)
+    LOOP
+        -- Lock just this counter (creating it if missing). A writer that has
+        -- not applied its delta yet waits for us and adds it on top of the
+        -- corrected count. One holding the lock is mid-write: skip the
+        -- counter rather than wait while holding other counters' locks,
+        -- and let the next run look at it again.
+        INSERT INTO entity_counters (scope, entity_type, status, count)
+        VALUES (candidate.scope, candidate.entity_type, candidate.status, 0)
+        ON CONFLICT (scope, entity_type, status) DO NOTHING;
+
+        SELECT count INTO current_count FROM entity_counters
+        WHERE scope = candidate.scope AND entity_type = candidate.entity_type
+            AND status = candidate.status
+        FOR UPDATE SKIP LOCKED;
+        IF NOT FOUND THEN
+            CONTINUE;
+        END IF;
+
+        -- Recount after taking the lock: each statement sees every commit
+        -- made before it started
+        IF candidate.entity_type = 'project' THEN
+            SELECT COUNT(*) INTO actual_count FROM projects
+            WHERE user_id = candidate.scope AND status = candidate.status;
+        ELSIF candidate.scope LIKE '*%' THEN
+            -- Unassigned tasks, spread by id (see 03_tasks.sql)
+            SELECT COUNT(*) INTO actual_count FROM tasks
+            WHERE assigned_to IS NULL AND '*' || id % 16 = candidate.scope
+                AND status = candidate.status;
+        ELSE
+            SELECT COUNT(*) INTO actual_count FROM tasks
+            WHERE assigned_to = candidate.scope AND status = candidate.status;
+        END IF;
+
+        IF actual_count <> current_count THEN
+            UPDATE entity_counters SET count = actual_count
+            WHERE scope = candidate.scope AND entity_type = candidate.entity_type
+                AND status = candidate.status;
+            repaired := repaired + 1;
+        END IF;
+    END LOOP;
+
+    -- Counters of deleted users and emptied statuses
+    DELETE FROM entity_counters WHERE count = 0;
+
+    RETURN repaired;
+END;
+$$ LANGUAGE plpgsql;
+
+COMMENT ON FUNCTION reconcile_entity_counters IS 'Recompute entity_counters from projects and tasks, returning the number of corrected rows';
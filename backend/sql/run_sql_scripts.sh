@@ -16,7 +16,7 @@ SQL_DIR="$(dirname "$0")"
 # Function to run a SQL script
 run_script() {
     echo "Running $1..."
-    psql "$DB_URL" -f "$SQL_DIR/$1"
+    psql "$DB_URL" -v ON_ERROR_STOP=1 -f "$SQL_DIR/$1"
     
     if [ $? -eq 0 ]; then
         echo "✅ Successfully executed $1"
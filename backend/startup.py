@@ -1,10 +1,17 @@
 """
 Startup script for Azure App Service.
 This file is used by Azure App Service to start the application.
+
+Run directly, it serves the app with gunicorn and uvicorn workers, one per
+available CPU by default (see the WEB_CONCURRENCY and SERVER_* settings).
+Where gunicorn is unavailable (Windows) it falls back to uvicorn's own
+multi-process mode.
 """
+import math
 import os
 import sys
 import logging
+import tempfile
 
 # Add the current directory to the path so we can import the app
 sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
@@ -19,12 +26,173 @@ logging.basicConfig(
 )
 logger = logging.getLogger(__name__)
 
-# Import the FastAPI app
-from app.main import app
+from app.core.config import Settings, settings
+
+# Workers must sign and verify session tokens with the same key. The
+# generated default differs per process, so export the resolved key for
+# workers that import the settings themselves.
+if "SECRET_KEY" not in os.environ:
+    if settings.SECRET_KEY == Settings.model_fields["SECRET_KEY"].default:
+        logger.warning("SECRET_KEY is not set; sessions will not survive a restart")
+    os.environ["SECRET_KEY"] = settings.SECRET_KEY
+
+# Workers write metrics to files in a shared directory so /metrics can sum
+# them. Must be set before prometheus_client is imported with the app; a
+# fresh directory keeps counters from a previous run out of the totals.
+if settings.METRICS_ENABLED and "PROMETHEUS_MULTIPROC_DIR" not in os.environ:
+    os.environ["PROMETHEUS_MULTIPROC_DIR"] = tempfile.mkdtemp(prefix="metrics-")
+
+# The app is imported by the server: in the gunicorn master with
+# SERVER_PRELOAD, otherwise in each worker
+
+WORKER_CLASSES = {
+    "auto": "uvicorn.workers.UvicornWorker",
+    "uvloop": "app.workers.FastUvicornWorker",
+    "asyncio": "app.workers.AsyncioUvicornWorker",
+}
+
+
+def available_cpus() -> int:
+    """
+    CPUs this process may use: the scheduler affinity mask, capped by a
+    cgroup CPU quota when running in a container.
+    """
+    try:
+        cpus = len(os.sched_getaffinity(0))
+    except AttributeError:
+        cpus = os.cpu_count() or 1
+
+    quota = None
+    try:
+        # cgroup v2: "<quota> <period>" or "max <period>"
+        with open("/sys/fs/cgroup/cpu.max") as f:
+            limit, period = f.read().split()
+        if limit != "max":
+            quota = int(limit) / int(period)
+    except (OSError, ValueError):
+        try:
+            # cgroup v1
+            with open("/sys/fs/cgroup/cpu/cpu.cfs_quota_us") as f:
+                limit = int(f.read())
+            with open("/sys/fs/cgroup/cpu/cpu.cfs_period_us") as f:
+                period = int(f.read())
+            if limit > 0:
+                quota = limit / period
+        except (OSError, ValueError):
+            pass
+
+    if quota is not None:
+        cpus = min(cpus, math.ceil(quota))
+    return max(cpus, 1)
+
+
+def worker_count() -> int:
+    if settings.WEB_CONCURRENCY > 0:
+        return settings.WEB_CONCURRENCY
+    workers = max(int(available_cpus() * settings.WORKERS_PER_CORE), 1)
+    if settings.MAX_WORKERS > 0:
+        workers = min(workers, settings.MAX_WORKERS)
+    return workers
+
+
+def set_worker_count(workers: int) -> None:
+    """
+    Tell the app how many workers will serve it, in this process (inherited
+    on fork) and in the environment (for workers that import it afresh).
+    """
+    os.environ["SERVER_WORKERS"] = str(workers)
+    settings.SERVER_WORKERS = workers
+    if workers == 1:
+        return
+    if not settings.USER_CACHE_BROADCAST:
+        logger.warning(
+            "The user cache is per worker and USER_CACHE_BROADCAST is off; other "
+            f"workers may serve changed users for up to {settings.USER_CACHE_TTL}s"
+        )
+    if settings.OAUTH_STATE_BACKEND == "memory":
+        logger.warning(
+            "OAUTH_STATE_BACKEND=memory is per worker; logins fail when the "
+            "callback reaches another worker. Use OAUTH_STATE_BACKEND=signed"
+        )
+
+
+def on_child_exit(arbiter, worker) -> None:
+    # A dead worker's in-flight and pool gauges must not linger in /metrics
+    from app.core.metrics import mark_worker_dead
+
+    mark_worker_dead(worker.pid)
+
+
+def run_gunicorn(port: int, workers: int) -> None:
+    from gunicorn.app.base import BaseApplication
+
+    class StandaloneApplication(BaseApplication):
+        def __init__(self, options):
+            self.options = options
+            super().__init__()
+
+        def load_config(self):
+            for key, value in self.options.items():
+                self.cfg.set(key, value)
+
+        def load(self):
+            from app.main import app
+            return app
+
+    StandaloneApplication({
+        "bind": f"0.0.0.0:{port}",
+        "workers": workers,
+        "worker_class": WORKER_CLASSES.get(settings.SERVER_LOOP, WORKER_CLASSES["auto"]),
+        # Recycle workers periodically; jitter keeps them from restarting together
+        "max_requests": settings.SERVER_MAX_REQUESTS,
+        "max_requests_jitter": settings.SERVER_MAX_REQUESTS_JITTER,
+        "timeout": settings.SERVER_TIMEOUT,
+        "graceful_timeout": settings.SERVER_GRACEFUL_TIMEOUT,
+        "keepalive": settings.SERVER_KEEPALIVE,
+        # The app is imported once in the master and shared copy-on-write;
+        # connections and background tasks are still set up per worker by the lifespan
+        "preload_app": settings.SERVER_PRELOAD,
+        "child_exit": on_child_exit,
+        "accesslog": "-",
+        "errorlog": "-",
+    }).run()
+
+
+def run_uvicorn(port: int, workers: int) -> None:
+    import uvicorn
+
+    loop, http = {
+        "uvloop": ("uvloop", "httptools"),
+        "asyncio": ("asyncio", "h11"),
+    }.get(settings.SERVER_LOOP, ("auto", "auto"))
+    uvicorn.run(
+        "app.main:app",
+        host="0.0.0.0",
+        port=port,
+        workers=workers,
+        loop=loop,
+        http=http,
+        timeout_keep_alive=settings.SERVER_KEEPALIVE,
+        timeout_graceful_shutdown=settings.SERVER_GRACEFUL_TIMEOUT,
+    )
+
 
 # This is used by Azure App Service to start the application
 if __name__ == "__main__":
-    import uvicorn
     port = int(os.environ.get("PORT", 8000))
-    logger.info(f"Starting application on port {port}")
-    uvicorn.run("startup:app", host="0.0.0.0", port=port)
+    workers = worker_count()
+    set_worker_count(workers)
+    try:
+        import gunicorn  # noqa: F401
+        use_gunicorn = os.name != "nt"
+    except ImportError:
+        use_gunicorn = False
+
+    logger.info(
+        f"Starting application on port {port} with {workers} worker(s) | "
+        f"Server: {'gunicorn' if use_gunicorn else 'uvicorn'} | Loop: {settings.SERVER_LOOP}"
+    )
+    if use_gunicorn:
+        run_gunicorn(port, workers)
+    else:
+        run_uvicorn(port, workers)
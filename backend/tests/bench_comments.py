@@ -0,0 +1,92 @@
+"""
+Project list latency with heavily commented projects.
+
+    python -m tests.bench_comments [projects] [comments_per_project]
+
+Loads `projects` projects with `comments_per_project` comments each (see
+bench_db.py for the database), checks that the API lists the counts, and
+times the query behind a 100-project page two ways: reading the
+denormalized comment_count column, and with a per-row COUNT subquery over
+comments, which is what the counts would cost without it. The first should
+not depend on the number of comments.
+"""
+
+import asyncio
+import sys
+import time
+from datetime import datetime
+from typing import Any, Awaitable, Callable, Dict, Iterator
+
+from sqlalchemy import func, select
+
+from app.crud.crud_project import project as crud_project
+from app.models.comment import Comment
+from app.models.project import Project
+from tests.bench_db import BENCH_USER, bench_client, bench_database, insert_rows, project_rows
+
+PAGE_SIZE = 100
+REPEATS = 20
+
+
+def comment_rows(projects: int, per_project: int) -> Iterator[Dict[str, Any]]:
+    now = datetime.now()
+    for project_id in range(1, projects + 1):
+        for i in range(per_project):
+            yield {
+                "content": f"Comment {i} on project {project_id}",
+                "created_at": now,
+                "updated_at": now,
+                "project_id": project_id,
+                "user_id": BENCH_USER.id,
+            }
+
+
+async def average(read_page: Callable[[], Awaitable[Any]], session: Any) -> float:
+    started = time.perf_counter()
+    for _ in range(REPEATS):
+        await read_page()
+        session.expunge_all()
+    return (time.perf_counter() - started) / REPEATS
+
+
+async def bench(projects: int, per_project: int) -> None:
+    async with bench_database() as session_factory:
+        started = time.perf_counter()
+        # Without the sql/ triggers the counts are loaded with the projects
+        await insert_rows(session_factory, Project, project_rows(projects, comment_count=per_project))
+        await insert_rows(session_factory, Comment, comment_rows(projects, per_project))
+        print(f"Loaded {projects:,} projects and {projects * per_project:,} comments "
+              f"in {time.perf_counter() - started:.1f}s")
+
+        async with bench_client(session_factory) as client:
+            page = (await client.get(f"/api/v1/projects/?limit={PAGE_SIZE}")).json()
+            assert all(project["comment_count"] == per_project for project in page)
+
+        comment_count = (
+            select(func.count(Comment.id))
+            .where(Comment.project_id == Project.id)
+            .scalar_subquery()
+        )
+        counted_query = (
+            select(Project, comment_count)
+            .order_by(Project.updated_at.desc(), Project.id.desc())
+            .limit(PAGE_SIZE)
+        )
+        async with session_factory() as session:
+            async def counted_page() -> Any:
+                return (await session.exec(counted_query)).all()
+
+            column_time = await average(
+                lambda: crud_project.get_page(session, limit=PAGE_SIZE), session
+            )
+            subquery_time = await average(counted_page, session)
+
+    print(f"Page of {PAGE_SIZE}, comment_count column: {column_time * 1e3:8.2f} ms")
+    print(f"Page of {PAGE_SIZE}, COUNT subquery per row: {subquery_time * 1e3:8.2f} ms")
+
+
+if __name__ == "__main__":
+    asyncio.run(bench(
+        int(sys.argv[1]) if len(sys.argv) > 1 else 10_000,
+        int(sys.argv[2]) if len(sys.argv) > 2 else 200,
+    ))
@@ -0,0 +1,120 @@
+"""
+Database setup shared by the benchmarks that need data.
+
+Benchmarks run against BENCH_DATABASE_URL, a postgresql+asyncpg URL of an
+empty, disposable database, and fall back to a SQLite file in a temporary
+directory. Tables are created from the models and dropped afterwards, so
+the triggers and generated columns from sql/ are not installed.
+"""
+
+import logging
+import os
+import tempfile
+from contextlib import asynccontextmanager
+from datetime import datetime, timedelta
+from typing import Any, AsyncGenerator, AsyncIterator, Dict, Iterable, Iterator, List
+
+import httpx
+from sqlalchemy import insert
+from sqlalchemy.ext.asyncio import async_sessionmaker, create_async_engine
+from sqlmodel import SQLModel
+from sqlmodel.ext.asyncio.session import AsyncSession
+
+import app.db.base  # noqa: F401 (registers every table on the metadata)
+from app.core.auth import get_current_user
+from app.db.session import get_session
+from app.main import app
+from app.models.project import Project
+from app.models.user import User
+
+BENCH_DATABASE_URL = os.getenv("BENCH_DATABASE_URL")
+
+BENCH_USER = User(id="bench-user", email="bench@example.com", name="Bench User", role="admin")
+
+
+@asynccontextmanager
+async def bench_database() -> AsyncIterator[async_sessionmaker]:
+    """
+    Yield a session factory bound to a fresh schema holding BENCH_USER.
+    """
+    with tempfile.TemporaryDirectory() as tmp_dir:
+        url = BENCH_DATABASE_URL or f"sqlite+aiosqlite:///{os.path.join(tmp_dir, 'bench.db')}"
+        engine = create_async_engine(url)
+        async with engine.begin() as conn:
+            await conn.run_sync(SQLModel.metadata.create_all)
+        session_factory = async_sessionmaker(engine, class_=AsyncSession, expire_on_commit=False)
+        try:
+            async with session_factory() as session:
+                session.add(User(**BENCH_USER.model_dump()))
+                await session.commit()
+            print(f"Database: {engine.dialect.name}")
+            yield session_factory
+        finally:
+            async with engine.begin() as conn:
+                await conn.run_sync(SQLModel.metadata.drop_all)
+            await engine.dispose()
+
+
+async def insert_rows(
+    session_factory: async_sessionmaker,
+    model: Any,
+    rows: Iterable[Dict[str, Any]],
+    batch_size: int = 10000,
+) -> int:
+    """
+    Bulk insert `rows` in batches of executemany INSERTs; returns the count.
+    """
+    count = 0
+    batch: List[Dict[str, Any]] = []
+    async with session_factory() as session:
+        for row in rows:
+            batch.append(row)
+            if len(batch) == batch_size:
+                await session.execute(insert(model), batch)
+                count += len(batch)
+                batch = []
+        if batch:
+            await session.execute(insert(model), batch)
+            count += len(batch)
+        await session.commit()
+    return count
+
+
+def project_rows(count: int, **fields: Any) -> Iterator[Dict[str, Any]]:
+    """
+    `count` projects owned by BENCH_USER, one second apart in updated_at.
+    """
+    start = datetime(2024, 1, 1)
+    for i in range(count):
+        timestamp = start + timedelta(seconds=i)
+        yield {
+            "name": f"Project {i}",
+            "description": f"Benchmark project number {i}",
+            "status": "active" if i % 4 else "archived",
+            "created_at": timestamp,
+            "updated_at": timestamp,
+            "user_id": BENCH_USER.id,
+            **fields,
+        }
+
+
+@asynccontextmanager
+async def bench_client(session_factory: async_sessionmaker) -> AsyncIterator[httpx.AsyncClient]:
+    """
+    An in-process client for the app, signed in as BENCH_USER.
+    """
+    async def override_get_session() -> AsyncGenerator[AsyncSession, None]:
+        async with session_factory() as session:
+            yield session
+            await session.commit()
+
+    app.dependency_overrides[get_session] = override_get_session
+    app.dependency_overrides[get_current_user] = lambda: BENCH_USER
+    # httpx logs every request at INFO; these are the benchmark's, not the app's
+    logging.getLogger("httpx").setLevel(logging.WARNING)
+    try:
+        transport = httpx.ASGITransport(app=app)
+        async with httpx.AsyncClient(transport=transport, base_url="http://bench") as client:
+            yield client
+    finally:
+        app.dependency_overrides.clear()
@@ -0,0 +1,92 @@
+"""
+Peak RSS and throughput of the streaming project export.
+
+    python -m tests.bench_export [projects]
+
+Loads `projects` rows (see bench_db.py for the database), serves the app
+with uvicorn on a local port and downloads /projects/export as NDJSON and
+CSV, discarding the body as it arrives. RSS is sampled while each export
+runs (Linux only); with a server-side cursor the peak should stay near the
+baseline however many rows are exported.
+"""
+
+import asyncio
+import socket
+import sys
+import time
+
+import httpx
+import uvicorn
+
+from app.main import app
+from app.models.project import Project
+from app.routers import projects as projects_router
+from tests.bench_db import bench_client, bench_database, insert_rows, project_rows
+
+SAMPLE_INTERVAL = 0.01
+
+
+def rss_mib() -> float:
+    with open("/proc/self/statm") as statm:
+        resident_pages = int(statm.read().split()[1])
+    return resident_pages * 4096 / 2**20
+
+
+async def sample_rss(stop: asyncio.Event) -> float:
+    peak = rss_mib()
+    while not stop.is_set():
+        peak = max(peak, rss_mib())
+        await asyncio.sleep(SAMPLE_INTERVAL)
+    return peak
+
+
+async def export(url: str, format: str) -> None:
+    baseline = rss_mib()
+    stop = asyncio.Event()
+    sampler = asyncio.create_task(sample_rss(stop))
+    size = lines = 0
+    started = time.perf_counter()
+    async with httpx.AsyncClient(timeout=None) as client:
+        async with client.stream("GET", f"{url}/api/v1/projects/export?format={format}") as response:
+            response.raise_for_status()
+            async for chunk in response.aiter_bytes():
+                size += len(chunk)
+                lines += chunk.count(b"\n")
+    elapsed = time.perf_counter() - started
+    stop.set()
+    peak = await sampler
+    print(
+        f"{format:>6}: {lines:,} lines, {size / 2**20:,.1f} MiB in {elapsed:.2f}s "
+        f"({lines / elapsed:,.0f} rows/s) | RSS {baseline:.0f} MiB, peak {peak:.0f} MiB"
+    )
+
+
+async def bench(projects: int) -> None:
+    async with bench_database() as session_factory:
+        started = time.perf_counter()
+        await insert_rows(session_factory, Project, project_rows(projects))
+        print(f"Loaded {projects:,} projects in {time.perf_counter() - started:.1f}s")
+
+        # The export opens its own session rather than the request's
+        projects_router.async_session = session_factory
+        with socket.socket() as sock:
+            sock.bind(("127.0.0.1", 0))
+            port = sock.getsockname()[1]
+        server = uvicorn.Server(uvicorn.Config(
+            app, host="127.0.0.1", port=port, lifespan="off", log_level="warning"
+        ))
+        # bench_client installs the signed-in user and session overrides
+        async with bench_client(session_factory):
+            serving = asyncio.create_task(server.serve())
+            while not server.started:
+                await asyncio.sleep(0.01)
+            try:
+                for format in ("ndjson", "csv"):
+                    await export(f"http://127.0.0.1:{port}", format)
+            finally:
+                server.should_exit = True
+                await serving
+
+
+if __name__ == "__main__":
+    asyncio.run(bench(int(sys.argv[1]) if len(sys.argv) > 1 else 2_000_000))
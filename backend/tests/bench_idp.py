@@ -0,0 +1,128 @@
+"""
+Event-loop latency while login callbacks talk to a slow identity provider.
+
+    python -m tests.bench_idp [callbacks] [idp_delay_ms]
+
+Starts a local stand-in for the Entra token endpoint and Graph /me that
+answers after `idp_delay_ms`, then runs `callbacks` concurrent code
+exchanges and profile lookups through the shared HTTP client. A ticker on
+the same loop measures how late each 1 ms sleep wakes up. With a
+non-blocking client the lag stays flat however many callbacks are in
+flight; a blocking client would add the IdP round trip to every tick.
+"""
+
+import asyncio
+import json
+import statistics
+import sys
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from typing import Any, List
+
+from app.core import auth
+from app.core.http import close_http_client, init_http_client
+
+TICK = 0.001
+
+
+class StubIdP:
+    """
+    Answers POST /token and GET /me after `delay` seconds.
+    """
+
+    def __init__(self, delay: float):
+        self.delay = delay
+        self.requests = 0
+        stub = self
+
+        class Handler(BaseHTTPRequestHandler):
+            protocol_version = "HTTP/1.1"
+
+            def _reply(self, payload: Any) -> None:
+                stub.requests += 1
+                time.sleep(stub.delay)
+                body = json.dumps(payload).encode()
+                self.send_response(200)
+                self.send_header("Content-Type", "application/json")
+                self.send_header("Content-Length", str(len(body)))
+                self.end_headers()
+                self.wfile.write(body)
+
+            def do_POST(self) -> None:
+                self.rfile.read(int(self.headers.get("Content-Length", 0)))
+                self._reply({"access_token": "token", "id_token": "id-token", "expires_in": 3600})
+
+            def do_GET(self) -> None:
+                self._reply({"id": "entra-user", "mail": "user@example.com", "displayName": "User"})
+
+            def log_message(self, format: str, *args: Any) -> None:
+                pass
+
+        self._httpd = ThreadingHTTPServer(("127.0.0.1", 0), Handler)
+        self._httpd.daemon_threads = True
+        self.url = f"http://127.0.0.1:{self._httpd.server_address[1]}"
+        self._thread = threading.Thread(target=self._httpd.serve_forever, daemon=True)
+
+    def __enter__(self) -> "StubIdP":
+        self._thread.start()
+        return self
+
+    def __exit__(self, *exc_info: Any) -> None:
+        self._httpd.shutdown()
+        self._httpd.server_close()
+
+
+async def measure_lag(stop: asyncio.Event) -> List[float]:
+    lags = []
+    while not stop.is_set():
+        started = time.perf_counter()
+        await asyncio.sleep(TICK)
+        lags.append(time.perf_counter() - started - TICK)
+    return lags
+
+
+async def callback() -> None:
+    tokens = await auth.exchange_code_for_token("code", "http://localhost/callback")
+    await auth.get_user_info(tokens["access_token"])
+
+
+async def run(callbacks: int) -> List[float]:
+    stop = asyncio.Event()
+    ticker = asyncio.create_task(measure_lag(stop))
+    started = time.perf_counter()
+    if callbacks:
+        await asyncio.gather(*(callback() for _ in range(callbacks)))
+    else:
+        await asyncio.sleep(0.5)
+    elapsed = time.perf_counter() - started
+    stop.set()
+    lags = await ticker
+    print(
+        f"{callbacks:5d} callbacks in {elapsed:6.3f}s | loop lag ms "
+        f"p50 {statistics.median(lags) * 1e3:6.2f}  "
+        f"p99 {statistics.quantiles(lags, n=100)[98] * 1e3:6.2f}  "
+        f"max {max(lags) * 1e3:6.2f}"
+    )
+    return lags
+
+
+async def bench(callbacks: int, delay_ms: float) -> None:
+    with StubIdP(delay_ms / 1000) as idp:
+        auth.AZURE_TOKEN_ENDPOINT = f"{idp.url}/token"
+        auth.MICROSOFT_GRAPH_ENDPOINT = idp.url
+        await init_http_client()
+        try:
+            # Idle loop first, then growing bursts up to `callbacks`
+            for concurrency in sorted({0, max(callbacks // 10, 1), callbacks}):
+                await run(concurrency)
+        finally:
+            await close_http_client()
+    print(f"IdP round trip: {delay_ms:.0f} ms, requests served: {idp.requests}")
+
+
+if __name__ == "__main__":
+    asyncio.run(bench(
+        int(sys.argv[1]) if len(sys.argv) > 1 else 200,
+        float(sys.argv[2]) if len(sys.argv) > 2 else 50,
+    ))
@@ -0,0 +1,71 @@
+"""
+Throughput of the COPY-based project import.
+
+    BENCH_DATABASE_URL=postgresql+asyncpg://... python -m tests.bench_import [rows]
+
+Writes a CSV of `rows` projects, one in a thousand of them invalid, and
+uploads it to /projects/import through the app in-process. Reports rows
+per second and the process's peak RSS before and after the upload, which
+should barely move: the upload is parsed and copied in IMPORT_BATCH_SIZE
+batches. COPY needs PostgreSQL, so BENCH_DATABASE_URL must be set.
+"""
+
+import asyncio
+import csv
+import os
+import resource
+import sys
+import tempfile
+import time
+
+from app.core.config import settings
+from tests.bench_db import BENCH_DATABASE_URL, bench_client, bench_database
+
+INVALID_EVERY = 1000
+
+
+def peak_rss_mib() -> float:
+    # ru_maxrss is in KiB on Linux
+    return resource.getrusage(resource.RUSAGE_SELF).ru_maxrss / 1024
+
+
+def write_csv(path: str, rows: int) -> None:
+    with open(path, "w", newline="") as f:
+        writer = csv.writer(f)
+        writer.writerow(["name", "description", "status"])
+        for i in range(rows):
+            # An empty name fails validation and is reported, not imported
+            name = "" if i % INVALID_EVERY == 0 else f"Imported project {i}"
+            writer.writerow([name, f"Imported by the benchmark, row {i}", "active"])
+
+
+async def bench(rows: int) -> None:
+    if not BENCH_DATABASE_URL:
+        sys.exit("The import uses COPY; set BENCH_DATABASE_URL to a PostgreSQL database")
+    with tempfile.TemporaryDirectory() as tmp_dir:
+        path = os.path.join(tmp_dir, "projects.csv")
+        write_csv(path, rows)
+        print(f"Upload: {rows:,} rows, {os.path.getsize(path) / 2**20:,.1f} MiB, "
+              f"batches of {settings.IMPORT_BATCH_SIZE:,}")
+
+        async with bench_database() as session_factory:
+            async with bench_client(session_factory) as client:
+                rss_before = peak_rss_mib()
+                started = time.perf_counter()
+                with open(path, "rb") as upload:
+                    response = await client.post(
+                        "/api/v1/projects/import",
+                        files={"file": ("projects.csv", upload, "text/csv")},
+                        timeout=None,
+                    )
+                elapsed = time.perf_counter() - started
+
+    response.raise_for_status()
+    result = response.json()
+    print(f"Inserted {result['inserted']:,}, failed {result['failed']:,} in {elapsed:.2f}s")
+    print(f"{rows / elapsed:,.0f} rows/s")
+    print(f"Peak RSS {rss_before:.0f} MiB before the upload, {peak_rss_mib():.0f} MiB after")
+
+
+if __name__ == "__main__":
+    asyncio.run(bench(int(sys.argv[1]) if len(sys.argv) > 1 else 1_000_000))
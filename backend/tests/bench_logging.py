@@ -0,0 +1,80 @@
+"""
+Request latency with logging at INFO against WARNING.
+
+    python -m tests.bench_logging [requests]
+
+Adds a route to the app that logs like a chatty hot-path handler (a few
+INFO lines per request, one carrying a headers dict in `extra`), and calls
+it in-process through the queued logging pipeline with the production JSON
+formatter. Output goes to /dev/null so only the logging cost is measured.
+Reports latency per root level and the pipeline's counters. The gap
+between the two is what INFO costs a request: creating and queuing the
+records, plus the listener thread's formatting competing for the GIL.
+"""
+
+import asyncio
+import logging
+import os
+import statistics
+import sys
+import time
+from typing import List
+
+import httpx
+
+from app.core.config import settings
+from app.core.logging_config import log_pipeline, setup_logging
+from app.main import app
+
+INFO_LINES_PER_REQUEST = 4
+HEADERS = {f"x-header-{i}": f"value-{i}" * 4 for i in range(20)}
+
+bench_logger = logging.getLogger("app.bench")
+
+
+@app.get("/bench/logging", include_in_schema=False)
+async def logging_route():
+    for i in range(INFO_LINES_PER_REQUEST - 1):
+        bench_logger.info("Handling request | Step: %d", i)
+    bench_logger.info("Upstream response", extra={"headers": HEADERS})
+    return {"ok": True}
+
+
+async def measure(client: httpx.AsyncClient, requests: int) -> List[float]:
+    latencies = []
+    for _ in range(requests):
+        started = time.perf_counter()
+        response = await client.get("/bench/logging")
+        latencies.append(time.perf_counter() - started)
+        response.raise_for_status()
+    return latencies
+
+
+async def bench(requests: int) -> None:
+    settings.ENVIRONMENT = "production"
+    with open(os.devnull, "w") as devnull:
+        # The console handler writes to the sys.stderr it finds when created
+        stderr, sys.stderr = sys.stderr, devnull
+        try:
+            setup_logging()
+        finally:
+            sys.stderr = stderr
+
+        transport = httpx.ASGITransport(app=app)
+        async with httpx.AsyncClient(transport=transport, base_url="http://bench") as client:
+            await measure(client, 100)
+            for level in ("INFO", "WARNING"):
+                logging.getLogger().setLevel(level)
+                latencies = await measure(client, requests)
+                print(
+                    f"{level:>7}: {requests / sum(latencies):8,.0f} req/s | latency us "
+                    f"p50 {statistics.median(latencies) * 1e6:7.1f}  "
+                    f"p99 {statistics.quantiles(latencies, n=100)[98] * 1e6:7.1f}"
+                )
+        log_pipeline.stop()
+
+    print(f"Pipeline: {log_pipeline.stats()}")
+
+
+if __name__ == "__main__":
+    asyncio.run(bench(int(sys.argv[1]) if len(sys.argv) > 1 else 5000))
@@ -0,0 +1,70 @@
+"""
+Per-page latency of project listings, OFFSET against keyset cursors.
+
+    python -m tests.bench_pagination [projects] [page_size]
+
+Loads `projects` rows (1M by default; see bench_db.py for the database)
+and reads one page at increasing depths, once with `skip` and once with the
+(updated_at, id) cursor of the row before it. OFFSET pages grow linearly
+with depth; cursor pages should cost the same as the first one.
+"""
+
+import asyncio
+import sys
+import time
+from typing import Any, Awaitable, Callable
+
+from sqlalchemy import select
+
+from app.crud.crud_project import project as crud_project
+from app.models.project import Project
+from tests.bench_db import bench_database, insert_rows, project_rows
+
+REPEATS = 5
+
+
+async def best_of(read_page: Callable[[], Awaitable[Any]]) -> float:
+    timings = []
+    for _ in range(REPEATS):
+        started = time.perf_counter()
+        await read_page()
+        timings.append(time.perf_counter() - started)
+    return min(timings)
+
+
+async def bench(projects: int, page_size: int) -> None:
+    async with bench_database() as session_factory:
+        started = time.perf_counter()
+        await insert_rows(session_factory, Project, project_rows(projects))
+        print(f"Loaded {projects:,} projects in {time.perf_counter() - started:.1f}s")
+
+        print(f"{'depth':>10} {'offset ms':>10} {'cursor ms':>10}")
+        depths = [0] + [d for d in (1_000, 10_000, 100_000, projects // 2) if d < projects]
+        depths.append(projects - page_size)
+        async with session_factory() as session:
+            for depth in sorted(set(depths)):
+                cursor = None
+                if depth:
+                    # The last row of the previous page, as the API's cursor encodes it
+                    row = (await session.exec(
+                        select(Project.updated_at, Project.id)
+                        .order_by(Project.updated_at.desc(), Project.id.desc())
+                        .offset(depth - 1).limit(1)
+                    )).one()
+                    cursor = (row.updated_at, row.id)
+
+                offset_time = await best_of(lambda: crud_project.get_page(
+                    session, skip=depth, limit=page_size
+                ))
+                cursor_time = await best_of(lambda: crud_project.get_page(
+                    session, cursor=cursor, limit=page_size
+                ))
+                session.expunge_all()
+                print(f"{depth:>10,} {offset_time * 1e3:>10.2f} {cursor_time * 1e3:>10.2f}")
+
+
+if __name__ == "__main__":
+    asyncio.run(bench(
+        int(sys.argv[1]) if len(sys.argv) > 1 else 1_000_000,
+        int(sys.argv[2]) if len(sys.argv) > 2 else 100,
+    ))
@@ -0,0 +1,52 @@
+"""
+Requests per second and CPU per request for project list pages.
+
+    FAST_JSON=false python -m tests.bench_serialization [requests]
+    FAST_JSON=true python -m tests.bench_serialization [requests]
+
+Lists 100 and 1000 projects through the app in-process (see bench_db.py for
+the database) and reports throughput and process CPU time per request for
+the serialization mode FAST_JSON selects; run it once per mode to compare.
+The response cache is bypassed so every request queries and encodes its
+page.
+"""
+
+import asyncio
+import sys
+import time
+
+from app.core.config import settings
+from app.core.serialization import FAST_JSON
+from app.models.project import Project
+from tests.bench_db import bench_client, bench_database, insert_rows, project_rows
+
+PAGE_SIZES = (100, 1000)
+
+
+async def bench(requests: int) -> None:
+    # More than one worker turns the per-worker response cache off
+    settings.SERVER_WORKERS = 2
+    print(f"FAST_JSON: {FAST_JSON}")
+    async with bench_database() as session_factory:
+        await insert_rows(session_factory, Project, project_rows(max(PAGE_SIZES)))
+        async with bench_client(session_factory) as client:
+            for limit in PAGE_SIZES:
+                url = f"/api/v1/projects/?limit={limit}"
+                response = await client.get(url)
+                assert response.status_code == 200 and len(response.json()) == limit
+
+                started = time.perf_counter()
+                cpu_started = time.process_time()
+                for _ in range(requests):
+                    await client.get(url)
+                elapsed = time.perf_counter() - started
+                cpu = time.process_time() - cpu_started
+                print(
+                    f"{limit:5d} projects: {requests / elapsed:8.1f} req/s, "
+                    f"{cpu / requests * 1e3:6.2f} ms CPU per request, "
+                    f"{len(response.content) / 1024:.0f} KiB"
+                )
+
+
+if __name__ == "__main__":
+    asyncio.run(bench(int(sys.argv[1]) if len(sys.argv) > 1 else 200))
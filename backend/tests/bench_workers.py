@@ -0,0 +1,112 @@
+"""
+Throughput of the production launcher with one worker against N workers.
+
+    python -m tests.bench_workers [workers] [seconds] [path]
+
+Starts `python startup.py` on a free local port, first with
+WEB_CONCURRENCY=1 and then with `workers` (available CPUs by default), and
+drives `path` (default /) with keep-alive connections from one client
+process per CPU for `seconds`. Reports requests per second and latency for
+each run. The path should not need authentication or a database.
+"""
+
+import asyncio
+import os
+import socket
+import statistics
+import subprocess
+import sys
+import time
+from concurrent.futures import ProcessPoolExecutor
+from typing import List, Tuple
+
+import httpx
+
+CONNECTIONS_PER_CLIENT = 16
+STARTUP_TIMEOUT = 30
+STARTUP_SCRIPT = os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), "startup.py")
+
+
+def available_cpus() -> int:
+    # Not startup.available_cpus: importing startup configures logging and
+    # exports settings into this process's environment
+    try:
+        return len(os.sched_getaffinity(0))
+    except AttributeError:
+        return os.cpu_count() or 1
+
+
+async def drive(url: str, seconds: float) -> Tuple[int, List[float]]:
+    latencies: List[float] = []
+    deadline = time.perf_counter() + seconds
+    limits = httpx.Limits(max_connections=CONNECTIONS_PER_CLIENT)
+
+    async def connection(client: httpx.AsyncClient) -> None:
+        while time.perf_counter() < deadline:
+            started = time.perf_counter()
+            response = await client.get(url)
+            response.raise_for_status()
+            latencies.append(time.perf_counter() - started)
+
+    async with httpx.AsyncClient(limits=limits) as client:
+        await asyncio.gather(*(connection(client) for _ in range(CONNECTIONS_PER_CLIENT)))
+    return len(latencies), latencies
+
+
+def run_client(url: str, seconds: float) -> Tuple[int, List[float]]:
+    return asyncio.run(drive(url, seconds))
+
+
+def free_port() -> int:
+    with socket.socket() as sock:
+        sock.bind(("127.0.0.1", 0))
+        return sock.getsockname()[1]
+
+
+def wait_until_serving(url: str, server: subprocess.Popen) -> None:
+    deadline = time.monotonic() + STARTUP_TIMEOUT
+    while time.monotonic() < deadline:
+        if server.poll() is not None:
+            sys.exit(f"startup.py exited with {server.returncode}")
+        try:
+            httpx.get(url).raise_for_status()
+            return
+        except httpx.HTTPError:
+            time.sleep(0.2)
+    sys.exit("startup.py did not start serving in time")
+
+
+def bench(workers: int, seconds: float, path: str) -> None:
+    clients = available_cpus()
+    for count in sorted({1, workers}):
+        port = free_port()
+        url = f"http://127.0.0.1:{port}{path}"
+        env = {**os.environ, "PORT": str(port), "WEB_CONCURRENCY": str(count)}
+        server = subprocess.Popen(
+            [sys.executable, STARTUP_SCRIPT], env=env,
+            stdout=subprocess.DEVNULL, stderr=subprocess.DEVNULL,
+        )
+        try:
+            wait_until_serving(url, server)
+            with ProcessPoolExecutor(clients) as pool:
+                results = list(pool.map(run_client, [url] * clients, [seconds] * clients))
+        finally:
+            server.terminate()
+            server.wait()
+
+        requests = sum(count for count, _ in results)
+        latencies = [latency for _, client_latencies in results for latency in client_latencies]
+        print(
+            f"{count:3d} worker(s): {requests / seconds:9,.0f} req/s | latency ms "
+            f"p50 {statistics.median(latencies) * 1e3:6.2f}  "
+            f"p99 {statistics.quantiles(latencies, n=100)[98] * 1e3:6.2f}"
+        )
+    print(f"{clients} client process(es) x {CONNECTIONS_PER_CLIENT} connections, {seconds:.0f}s each")
+
+
+if __name__ == "__main__":
+    bench(
+        int(sys.argv[1]) if len(sys.argv) > 1 else available_cpus(),
+        float(sys.argv[2]) if len(sys.argv) > 2 else 10,
+        sys.argv[3] if len(sys.argv) > 3 else "/",
+    )
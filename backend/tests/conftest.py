@@ -0,0 +1,129 @@
+"""
+Shared fixtures.
+
+The app runs against a throwaway SQLite database (through aiosqlite) with
+get_session and get_current_user overridden, so no PostgreSQL server or
+Entra ID token is needed. Set TEST_DATABASE_URL to a postgresql+asyncpg URL
+of an empty, disposable database to run against PostgreSQL instead; tests
+of PostgreSQL-only statements take the `postgres` fixture and are skipped
+otherwise.
+
+`count_queries` records the SQL statements sent to the database, for tests
+that pin down how many round trips an endpoint costs.
+"""
+
+import asyncio
+import os
+from contextlib import contextmanager
+from typing import Any, AsyncGenerator, Callable, Iterator, List
+
+import pytest
+from fastapi.testclient import TestClient
+from sqlalchemy import event
+from sqlalchemy.ext.asyncio import AsyncEngine, async_sessionmaker, create_async_engine
+from sqlalchemy.pool import NullPool
+from sqlmodel import SQLModel
+from sqlmodel.ext.asyncio.session import AsyncSession
+
+import app.db.base  # noqa: F401 (registers every table on the metadata)
+from app.core.auth import get_current_user
+from app.db.session import get_session
+from app.main import app
+from app.models.user import User
+
+TEST_DATABASE_URL = os.getenv("TEST_DATABASE_URL")
+
+
+def run(coro: Any) -> Any:
+    return asyncio.run(coro)
+
+
+@pytest.fixture
+def engine(tmp_path) -> Iterator[AsyncEngine]:
+    # A file rather than :memory: so every connection sees the same data;
+    # NullPool closes connections with their session, whichever loop opened them
+    url = TEST_DATABASE_URL or f"sqlite+aiosqlite:///{tmp_path / 'test.db'}"
+    engine = create_async_engine(url, poolclass=NullPool)
+
+    async def run_ddl(operation: Callable) -> None:
+        async with engine.begin() as conn:
+            await conn.run_sync(operation)
+
+    run(run_ddl(SQLModel.metadata.create_all))
+    yield engine
+    if TEST_DATABASE_URL:
+        run(run_ddl(SQLModel.metadata.drop_all))
+    run(engine.dispose())
+
+
+@pytest.fixture
+def postgres(engine: AsyncEngine) -> None:
+    if engine.dialect.name != "postgresql":
+        pytest.skip("needs TEST_DATABASE_URL pointing at PostgreSQL")
+
+
+@pytest.fixture
+def session_factory(engine: AsyncEngine) -> async_sessionmaker:
+    return async_sessionmaker(engine, class_=AsyncSession, expire_on_commit=False)
+
+
+@pytest.fixture
+def add(session_factory: async_sessionmaker) -> Callable[..., List[Any]]:
+    """
+    Insert rows and return them with their generated keys.
+    """
+    def add(*rows: Any) -> List[Any]:
+        async def insert() -> List[Any]:
+            async with session_factory() as session:
+                session.add_all(rows)
+                await session.commit()
+                for row in rows:
+                    await session.refresh(row)
+            return list(rows)
+        return run(insert())
+    return add
+
+
+@pytest.fixture
+def user(add) -> User:
+    return add(User(id="user-1", email="user1@example.com", name="User One"))[0]
+
+
+@pytest.fixture
+def client(session_factory: async_sessionmaker, user: User) -> Iterator[TestClient]:
+    async def override_get_session() -> AsyncGenerator[AsyncSession, None]:
+        async with session_factory() as session:
+            yield session
+            await session.commit()
+
+    app.dependency_overrides[get_session] = override_get_session
+    app.dependency_overrides[get_current_user] = lambda: user
+    try:
+        yield TestClient(app)
+    finally:
+        app.dependency_overrides.clear()
+
+
+@pytest.fixture
+def count_queries(engine: AsyncEngine) -> Callable[[], Any]:
+    """
+    Context manager collecting the statements executed inside it:
+
+        with count_queries() as queries:
+            client.get(...)
+        assert len(queries) == 3, queries
+    """
+    @contextmanager
+    def count_queries() -> Iterator[List[str]]:
+        statements: List[str] = []
+
+        def before_cursor_execute(conn, cursor, statement, parameters, context, executemany):
+            statements.append(statement)
+
+        event.listen(engine.sync_engine, "before_cursor_execute", before_cursor_execute)
+        try:
+            yield statements
+        finally:
+            event.remove(engine.sync_engine, "before_cursor_execute", before_cursor_execute)
+
+    return count_queries
@@ -0,0 +1,100 @@
+"""
+A local stand-in for Entra ID's JWKS endpoint, and RSA keys to sign test
+tokens with. Used by test_security.py and bench_jwks.py.
+"""
+
+import base64
+import json
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from typing import Any, Dict, List
+
+import rsa
+from jose import jwt
+
+from app.core.config import settings
+from app.core.security import MICROSOFT_ISSUER
+
+
+def _b64url_uint(value: int) -> str:
+    data = value.to_bytes((value.bit_length() + 7) // 8, "big")
+    return base64.urlsafe_b64encode(data).rstrip(b"=").decode()
+
+
+class SigningKey:
+    # 1024 bits keeps key generation fast; the verification path is the same
+    def __init__(self, kid: str, bits: int = 1024):
+        self.kid = kid
+        public_key, private_key = rsa.newkeys(bits)
+        self.private_pem = private_key.save_pkcs1().decode()
+        self.jwk = {
+            "kty": "RSA",
+            "use": "sig",
+            "alg": "RS256",
+            "kid": kid,
+            "n": _b64url_uint(public_key.n),
+            "e": _b64url_uint(public_key.e),
+        }
+
+    def sign(self, **claims: Any) -> str:
+        """
+        An Entra-style token for this app, with `claims` added or overridden.
+        """
+        now = int(time.time())
+        payload = {
+            "aud": settings.AZURE_CLIENT_ID,
+            "iss": MICROSOFT_ISSUER,
+            "iat": now,
+            "nbf": now,
+            "exp": now + 3600,
+            "oid": "entra-user",
+            **claims,
+        }
+        return jwt.encode(payload, self.private_pem, algorithm="RS256", headers={"kid": self.kid})
+
+
+class StandInJWKSServer:
+    """
+    Serves `keys` as a JWKS document on localhost and counts the fetches.
+    While `failing` is set it answers 503 instead.
+    """
+
+    def __init__(self, keys: List[SigningKey]):
+        self.keys = list(keys)
+        self.fetches = 0
+        self.failing = False
+        server = self
+
+        class Handler(BaseHTTPRequestHandler):
+            def do_GET(self) -> None:
+                server.fetches += 1
+                if server.failing:
+                    self.send_response(503)
+                    self.send_header("Content-Length", "0")
+                    self.end_headers()
+                    return
+                body = json.dumps(server.jwks()).encode()
+                self.send_response(200)
+                self.send_header("Content-Type", "application/json")
+                self.send_header("Content-Length", str(len(body)))
+                self.end_headers()
+                self.wfile.write(body)
+
+            def log_message(self, format: str, *args: Any) -> None:
+                pass
+
+        self._httpd = ThreadingHTTPServer(("127.0.0.1", 0), Handler)
+        self.url = f"http://127.0.0.1:{self._httpd.server_address[1]}/discovery/v2.0/keys"
+        self._thread = threading.Thread(target=self._httpd.serve_forever, daemon=True)
+
+    def jwks(self) -> Dict[str, Any]:
+        return {"keys": [key.jwk for key in self.keys]}
+
+    def __enter__(self) -> "StandInJWKSServer":
+        self._thread.start()
+        return self
+
+    def __exit__(self, *exc_info: Any) -> None:
+        self._httpd.shutdown()
+        self._httpd.server_close()
@@ -0,0 +1,64 @@
+import asyncio
+from contextlib import asynccontextmanager
+
+from sqlalchemy import func
+from sqlalchemy.exc import OperationalError
+from sqlmodel import select
+
+from app.core import activity
+from app.core.activity import ActivityWriter
+from app.models.activity import ActivityLog
+
+
+def flaky_sessions(session_factory, failures: int):
+    """
+    A session factory whose first `failures` sessions fail like a lost connection.
+    """
+    attempts = []
+
+    @asynccontextmanager
+    async def session():
+        attempts.append(1)
+        if len(attempts) <= failures:
+            raise OperationalError("INSERT", {}, Exception("connection lost"))
+        async with session_factory() as real_session:
+            yield real_session
+
+    return session
+
+
+def write(writer: ActivityWriter, session_factory, events: int) -> int:
+    async def record_and_flush() -> int:
+        writer.start()
+        for i in range(events):
+            await writer.record("update", "project", i, "user-1")
+        await writer.stop()
+        async with session_factory() as session:
+            return (await session.exec(select(func.count(ActivityLog.id)))).one()
+
+    return asyncio.run(record_and_flush())
+
+
+def test_failed_batches_are_retried(monkeypatch, session_factory, user):
+    monkeypatch.setattr(activity, "async_session", flaky_sessions(session_factory, failures=2))
+    writer = ActivityWriter(max_queue=10, batch_size=10, flush_interval=0.01, retry_backoff=0.001)
+
+    stored = write(writer, session_factory, 3)
+
+    stats = writer.stats()
+    assert stored == 3
+    assert (stats["written"], stats["write_errors"], stats["retries"], stats["dropped"]) == (3, 2, 2, 0)
+
+
+def test_batches_are_dropped_and_counted_after_the_last_retry(monkeypatch, session_factory, user):
+    monkeypatch.setattr(activity, "async_session", flaky_sessions(session_factory, failures=100))
+    writer = ActivityWriter(
+        max_queue=10, batch_size=10, flush_interval=0.01, flush_retries=2, retry_backoff=0.001
+    )
+
+    stored = write(writer, session_factory, 3)
+
+    stats = writer.stats()
+    assert stored == 0
+    assert stats["write_errors"] == 3
+    assert stats["dropped"] == stats["dropped_failed_writes"] == 3
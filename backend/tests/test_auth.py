@@ -0,0 +1,23 @@
+import asyncio
+
+from app.core.auth import get_or_create_user
+
+USER_INFO = {
+    "id": "entra-user",
+    "mail": "entra.user@example.com",
+    "displayName": "Entra User",
+}
+
+
+def test_get_or_create_user_is_one_statement(postgres, session_factory, count_queries):
+    async def login():
+        async with session_factory() as session:
+            return await get_or_create_user(session, USER_INFO)
+
+    # First login inserts the user, later ones read it back; both in one statement
+    for _ in range(2):
+        with count_queries() as queries:
+            user = asyncio.run(login())
+        assert user.id == USER_INFO["id"]
+        assert user.email == USER_INFO["mail"]
+        assert len(queries) == 1, queries
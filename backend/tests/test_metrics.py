@@ -0,0 +1,38 @@
+import asyncio
+
+import pytest
+from fastapi import HTTPException
+
+from app.core.auth import get_current_user
+from app.core.config import settings
+from app.deps import require_metrics_token
+from app.main import app
+from app.models.user import User
+
+
+def test_metrics_are_not_public(client):
+    app.dependency_overrides.pop(get_current_user)
+
+    assert client.get("/metrics").status_code == 401
+
+
+def test_metrics_need_an_admin_without_a_token(client):
+    assert client.get("/metrics").status_code == 403
+
+    app.dependency_overrides[get_current_user] = lambda: User(
+        id="admin-1", email="admin@example.com", name="Admin", role="admin"
+    )
+    response = client.get("/metrics")
+
+    assert response.status_code == 200
+    assert "http_requests" in response.text
+
+
+def test_metrics_token(monkeypatch):
+    monkeypatch.setattr(settings, "METRICS_TOKEN", "scraper-secret")
+
+    asyncio.run(require_metrics_token("scraper-secret"))
+    for token in (None, "", "wrong"):
+        with pytest.raises(HTTPException) as excinfo:
+            asyncio.run(require_metrics_token(token))
+        assert excinfo.value.status_code == 401
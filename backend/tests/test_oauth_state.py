@@ -0,0 +1,92 @@
+import asyncio
+from urllib.parse import parse_qs, urlparse
+
+import httpx
+import pytest
+from fastapi import HTTPException
+
+from app.core.config import settings
+from app.core.oauth_state import SignedStateStore, StateStore
+from app.main import app
+from app.routers import auth as auth_router
+
+LOGINS = 200
+SHARED_SECRET = "shared-secret-key"
+
+
+def test_state_store_is_abstract():
+    class IssueOnly(StateStore):
+        async def issue(self, redirect_uri: str) -> str:
+            return ""
+
+    with pytest.raises(TypeError):
+        IssueOnly()
+
+
+@pytest.fixture
+def no_token_exchange(monkeypatch):
+    # Stop each callback right after the state check, before any call to Entra ID
+    async def exchange_code_for_token(code, redirect_uri):
+        raise HTTPException(status_code=401, detail="stand-in token exchange")
+
+    monkeypatch.setattr(auth_router, "exchange_code_for_token", exchange_code_for_token)
+
+
+def test_signed_states_survive_a_worker_switch_under_concurrency(no_token_exchange, monkeypatch):
+    # One store per worker, as each worker builds its own at import
+    worker_a = SignedStateStore(SHARED_SECRET, ttl=settings.OAUTH_STATE_TTL)
+    worker_b = SignedStateStore(SHARED_SECRET, ttl=settings.OAUTH_STATE_TTL)
+    transport = httpx.ASGITransport(app=app)
+
+    def browser() -> httpx.AsyncClient:
+        # Separate cookie jars, like separate browsers
+        return httpx.AsyncClient(transport=transport, base_url="http://testserver")
+
+    async def login(client: httpx.AsyncClient, i: int) -> str:
+        response = await client.get(
+            "/api/v1/auth/login", params={"redirect_uri": f"http://localhost:3000/after/{i}"}
+        )
+        assert response.status_code == 307
+        return parse_qs(urlparse(response.headers["location"]).query)["state"][0]
+
+    async def callback(client: httpx.AsyncClient, state: str) -> str:
+        response = await client.get("/api/v1/auth/callback", params={"code": "code", "state": state})
+        return response.headers["location"]
+
+    async def run_logins():
+        clients = [browser() for _ in range(LOGINS)]
+        try:
+            monkeypatch.setattr(auth_router, "state_store", worker_a)
+            states = await asyncio.gather(*(login(c, i) for i, c in enumerate(clients)))
+            # Every callback lands on the other worker
+            monkeypatch.setattr(auth_router, "state_store", worker_b)
+            locations = await asyncio.gather(*(callback(c, s) for c, s in zip(clients, states)))
+            # A state replayed from another browser lacks the matching cookie
+            stolen = await callback(browser(), states[0])
+        finally:
+            await asyncio.gather(*(c.aclose() for c in clients))
+        return states, locations, stolen
+
+    states, locations, stolen = asyncio.run(run_logins())
+
+    assert len(set(states)) == LOGINS
+    assert all("error=authentication_failed" in location for location in locations)
+    assert worker_a.issued == LOGINS
+    assert worker_b.consumed == LOGINS and worker_b.rejected == 0
+    assert "error=invalid_state" in stolen
+
+
+def test_signed_states_need_the_shared_secret():
+    async def issue_and_consume():
+        issuer = SignedStateStore(SHARED_SECRET, ttl=60)
+        same_key = SignedStateStore(SHARED_SECRET, ttl=60)
+        other_key = SignedStateStore("another-secret", ttl=60)
+        states = await asyncio.gather(*(issuer.issue(f"http://localhost:3000/{i}") for i in range(LOGINS)))
+        accepted = await asyncio.gather(*(same_key.consume(s) for s in states))
+        rejected = await asyncio.gather(*(other_key.consume(s) for s in states))
+        return accepted, rejected
+
+    accepted, rejected = asyncio.run(issue_and_consume())
+
+    assert accepted == [f"http://localhost:3000/{i}" for i in range(LOGINS)]
+    assert rejected == [None] * LOGINS
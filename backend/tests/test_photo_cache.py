@@ -0,0 +1,27 @@
+import asyncio
+
+from fastapi import HTTPException
+
+from app.core import photo_cache as photo_cache_module
+from app.core.photo_cache import PhotoCache
+
+
+def test_failed_lookups_are_cached_briefly(monkeypatch):
+    calls = []
+
+    async def failing_token():
+        calls.append(1)
+        raise HTTPException(status_code=503, detail="Graph unavailable")
+
+    monkeypatch.setattr(photo_cache_module, "get_graph_token", failing_token)
+    cache = PhotoCache(max_entries=10, ttl=3600, negative_ttl=900, error_ttl=60, max_bytes=1024)
+
+    async def lookups():
+        return [await cache.get("user-1") for _ in range(3)]
+
+    entries = asyncio.run(lookups())
+
+    assert not any(entry.exists for entry in entries)
+    # One Graph attempt; the other lookups are answered from the failure entry
+    assert len(calls) == 1
+    assert cache.stats()["errors"] == 1
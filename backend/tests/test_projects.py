@@ -0,0 +1,55 @@
+from app.models.project import Project
+from app.models.user import User
+
+
+def test_create_project_is_one_statement(client, count_queries, user):
+    with count_queries() as queries:
+        response = client.post("/api/v1/projects/", json={"name": "New project"})
+
+    assert response.status_code == 201
+    assert response.json()["user_id"] == user.id
+    # INSERT ... RETURNING
+    assert len(queries) == 1, queries
+
+
+def test_update_project_is_one_statement(client, add, count_queries, user):
+    project = add(Project(name="Project", user_id=user.id))[0]
+
+    with count_queries() as queries:
+        response = client.patch(f"/api/v1/projects/{project.id}", json={"status": "archived"})
+
+    assert response.status_code == 200
+    assert response.json()["status"] == "archived"
+    # UPDATE ... WHERE owner ... RETURNING
+    assert len(queries) == 1, queries
+
+
+def test_delete_project_is_one_statement(client, add, count_queries, user):
+    project = add(Project(name="Project", user_id=user.id))[0]
+
+    with count_queries() as queries:
+        response = client.delete(f"/api/v1/projects/{project.id}")
+
+    assert response.status_code == 204
+    # DELETE ... WHERE owner ... RETURNING
+    assert len(queries) == 1, queries
+
+
+def test_write_to_another_users_project_is_forbidden(client, add, count_queries):
+    other = add(User(id="user-2", email="user2@example.com", name="User Two"))[0]
+    project = add(Project(name="Project", user_id=other.id))[0]
+
+    with count_queries() as queries:
+        response = client.delete(f"/api/v1/projects/{project.id}")
+
+    assert response.status_code == 403
+    # The failed DELETE, then one lookup to tell 403 from 404
+    assert len(queries) == 2, queries
+
+
+def test_delete_missing_project_is_not_found(client, count_queries):
+    with count_queries() as queries:
+        response = client.delete("/api/v1/projects/12345")
+
+    assert response.status_code == 404
+    assert len(queries) == 2, queries
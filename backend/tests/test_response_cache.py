@@ -0,0 +1,73 @@
+import asyncio
+
+import fakeredis
+import pytest
+import redis.asyncio
+
+from app.core import response_cache as response_cache_module
+from app.core.config import settings
+from app.core.response_cache import RedisCacheBackend, ResponseCache, projects_namespace
+from app.models.project import Project
+
+WORKERS = 4
+
+
+@pytest.fixture
+def redis_server(monkeypatch):
+    # One in-process Redis shared by every client, like a real server
+    server = fakeredis.FakeServer()
+    monkeypatch.setattr(
+        redis.asyncio, "from_url",
+        lambda url, **kwargs: fakeredis.FakeAsyncRedis(server=server),
+    )
+    monkeypatch.setattr(settings, "SERVER_WORKERS", WORKERS)
+    return server
+
+
+def test_workers_share_entries_and_invalidations(redis_server):
+    async def two_workers():
+        worker_a = ResponseCache(RedisCacheBackend(settings.RESPONSE_CACHE_URL), ttl=60)
+        worker_b = ResponseCache(RedisCacheBackend(settings.RESPONSE_CACHE_URL), ttl=60)
+        try:
+            namespace = projects_namespace("user-1")
+            key = await worker_a.versioned_key(namespace, 100)
+            await worker_a.set(key, b"page")
+            seen_by_b = await worker_b.get(key)
+            # A write on worker B moves both workers to a new version
+            await worker_b.invalidate(namespace)
+            new_key_on_a = await worker_a.versioned_key(namespace, 100)
+            return seen_by_b, key, new_key_on_a, await worker_a.get(new_key_on_a)
+        finally:
+            await worker_a.close()
+            await worker_b.close()
+
+    seen_by_b, key, new_key_on_a, stale = asyncio.run(two_workers())
+
+    assert seen_by_b == b"page"
+    assert new_key_on_a != key
+    assert stale is None
+
+
+def test_project_list_uses_shared_cache_with_many_workers(
+    redis_server, client, add, count_queries, user, monkeypatch
+):
+    cache = ResponseCache(RedisCacheBackend(settings.RESPONSE_CACHE_URL), ttl=60)
+    monkeypatch.setattr(response_cache_module.response_cache, "backend", cache.backend)
+    assert response_cache_module.response_cache.consistent
+    add(Project(name="Project", user_id=user.id))
+    url = f"/api/v1/projects/?user_id={user.id}"
+
+    first = client.get(url)
+    with count_queries() as queries:
+        cached = client.get(url)
+        revalidated = client.get(url, headers={"If-None-Match": first.headers["etag"]})
+    client.post("/api/v1/projects/", json={"name": "Another"})
+    changed = client.get(url, headers={"If-None-Match": first.headers["etag"]})
+
+    assert first.status_code == cached.status_code == 200
+    assert cached.content == first.content
+    assert revalidated.status_code == 304
+    # Both served from the version key and the cached page
+    assert queries == []
+    assert changed.status_code == 200
+    assert len(changed.json()) == 2
@@ -0,0 +1,158 @@
+import asyncio
+
+import pytest
+from fastapi import HTTPException
+
+from app.core import security
+from app.core.auth import get_current_user
+from app.core.http import close_http_client, init_http_client
+from app.main import app
+from app.core.security import JWKSCache, verify_token
+from tests.jwks_server import SigningKey, StandInJWKSServer
+
+
+@pytest.fixture(scope="module")
+def signing_keys():
+    return SigningKey("key-1"), SigningKey("key-2")
+
+
+@pytest.fixture
+def jwks_server(signing_keys):
+    with StandInJWKSServer([signing_keys[0]]) as server:
+        yield server
+
+
+@pytest.fixture
+def cache(jwks_server, monkeypatch):
+    cache = JWKSCache(jwks_server.url, refresh_interval=3600, min_refresh_interval=60)
+    # verify_token reads the module's cache
+    monkeypatch.setattr(security, "jwks_cache", cache)
+    return cache
+
+
+def run_with_http_client(coro_fn):
+    async def main():
+        await init_http_client()
+        try:
+            return await coro_fn()
+        finally:
+            await close_http_client()
+    return asyncio.run(main())
+
+
+def test_keys_are_fetched_once_and_reused(cache, jwks_server, signing_keys):
+    token = signing_keys[0].sign(oid="user-a")
+
+    async def verify_many():
+        return [await verify_token(token) for _ in range(50)]
+
+    claims = run_with_http_client(verify_many)
+
+    assert all(c["oid"] == "user-a" for c in claims)
+    assert jwks_server.fetches == 1
+
+
+@pytest.mark.parametrize("claims", [
+    {"aud": "someone-else"},
+    {"iss": "https://login.microsoftonline.com/other-tenant/v2.0"},
+    {"exp": 1},
+])
+def test_rejects_wrong_audience_issuer_and_expired(cache, signing_keys, claims):
+    token = signing_keys[0].sign(**claims)
+
+    with pytest.raises(HTTPException) as exc_info:
+        run_with_http_client(lambda: verify_token(token))
+    assert exc_info.value.status_code == 401
+
+
+def test_rejects_tampered_signature(cache, signing_keys):
+    header, payload, signature = signing_keys[0].sign().split(".")
+    forged = signing_keys[1].sign(oid="someone-else").split(".")[1]
+
+    with pytest.raises(HTTPException) as exc_info:
+        run_with_http_client(lambda: verify_token(f"{header}.{forged}.{signature}"))
+    assert exc_info.value.status_code == 401
+
+
+def test_unknown_kid_refreshes_at_most_once_per_window(cache, jwks_server, signing_keys):
+    old_key, new_key = signing_keys
+    stranger = SigningKey("key-3", bits=512)
+    cache.min_refresh_interval = 0
+
+    async def rotate_then_verify():
+        await verify_token(old_key.sign())
+        # Entra ID starts signing with a key we have not fetched yet
+        jwks_server.keys = [old_key, new_key]
+        claims = await verify_token(new_key.sign(oid="rotated"))
+        cache.min_refresh_interval = 3600
+        # Unknown kids inside the window are rejected without a fetch
+        for _ in range(10):
+            with pytest.raises(HTTPException):
+                await verify_token(stranger.sign())
+        return claims
+
+    claims = run_with_http_client(rotate_then_verify)
+
+    assert claims["oid"] == "rotated"
+    assert jwks_server.fetches == 2
+
+
+def test_scheduled_refresh_picks_up_rotated_keys(cache, jwks_server, signing_keys):
+    old_key, new_key = signing_keys
+    cache.refresh_interval = 0.05
+    # Too long a window for the unknown-kid path to fetch the new key
+    cache.min_refresh_interval = 3600
+
+    async def rotate_in_background():
+        cache.start()
+        try:
+            for _ in range(100):
+                if cache.refreshes:
+                    break
+                await asyncio.sleep(0.01)
+            jwks_server.keys = [new_key]
+            for _ in range(100):
+                if new_key.kid in cache._keys:
+                    break
+                await asyncio.sleep(0.01)
+            return await verify_token(new_key.sign(oid="scheduled"))
+        finally:
+            await cache.stop()
+
+    claims = run_with_http_client(rotate_in_background)
+
+    assert claims["oid"] == "scheduled"
+    assert cache.refreshes >= 2
+    assert cache.stats()["keys"] == 1
+
+
+def test_failed_refresh_keeps_keys_and_reports_their_age(cache, jwks_server, signing_keys):
+    cache.min_refresh_interval = 0
+
+    async def refresh_while_down():
+        await cache.refresh()
+        fetched_at = cache._fetched_at
+        jwks_server.failing = True
+        refreshed = await cache.refresh()
+        claims = await verify_token(signing_keys[0].sign(oid="still-valid"))
+        return fetched_at, refreshed, claims
+
+    fetched_at, refreshed, claims = run_with_http_client(refresh_while_down)
+
+    assert refreshed is False
+    assert claims["oid"] == "still-valid"
+    # The age is that of the keys, not of the failed attempt
+    assert cache._fetched_at == fetched_at
+    assert cache._attempted_at > fetched_at
+    assert cache.stats()["failures"] == 1
+
+
+def test_api_rejects_entra_tokens(client, cache, jwks_server, signing_keys, user):
+    # Entra ID tokens are only verified at login; the API takes session tokens
+    app.dependency_overrides.pop(get_current_user)
+    id_token = signing_keys[0].sign(oid=user.id, sub=user.id)
+
+    response = client.get("/api/v1/projects/", headers={"Authorization": f"Bearer {id_token}"})
+
+    assert response.status_code == 401
+    assert jwks_server.fetches == 0
@@ -0,0 +1,22 @@
+from app.models.stats import EntityCounter
+
+
+def test_dashboard_sums_totals_from_per_user_counters(client, add, user):
+    add(
+        EntityCounter(scope=user.id, entity_type="project", status="active", count=2),
+        EntityCounter(scope="user-2", entity_type="project", status="active", count=3),
+        EntityCounter(scope="user-2", entity_type="project", status="archived", count=1),
+        EntityCounter(scope=user.id, entity_type="task", status="pending", count=4),
+        # Unassigned tasks are spread over several rows
+        EntityCounter(scope="*3", entity_type="task", status="pending", count=1),
+        EntityCounter(scope="*7", entity_type="task", status="pending", count=2),
+    )
+
+    response = client.get("/api/v1/stats/")
+
+    assert response.status_code == 200
+    body = response.json()
+    assert body["user"]["projects"] == {"total": 2, "by_status": {"active": 2}}
+    assert body["user"]["tasks"] == {"total": 4, "by_status": {"pending": 4}}
+    assert body["all"]["projects"] == {"total": 6, "by_status": {"active": 5, "archived": 1}}
+    assert body["all"]["tasks"] == {"total": 7, "by_status": {"pending": 7}}
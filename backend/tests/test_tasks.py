@@ -0,0 +1,51 @@
+import asyncpg
+import pytest
+from sqlalchemy.dialects.postgresql.asyncpg import AsyncAdapt_asyncpg_dbapi
+from sqlalchemy.exc import IntegrityError
+
+from app.models.project import Project
+from app.models.task import Task
+from app.models.user import User
+from app.routers.tasks import ASSIGNEE_FOREIGN_KEY, _is_assignee_violation
+
+
+@pytest.fixture
+def project(add, user) -> Project:
+    return add(Project(name="Project", user_id=user.id))[0]
+
+
+@pytest.mark.parametrize("task_count", [1, 20])
+def test_list_tasks_query_count(client, add, count_queries, user, project, task_count):
+    assignees = add(*[
+        User(id=f"assignee-{i}", email=f"assignee{i}@example.com", name=f"Assignee {i}")
+        for i in range(3)
+    ])
+    add(*[
+        Task(title=f"Task {i}", project_id=project.id, assigned_to=assignees[i % 3].id)
+        for i in range(task_count)
+    ])
+
+    with count_queries() as queries:
+        response = client.get(f"/api/v1/projects/{project.id}/tasks")
+
+    assert response.status_code == 200
+    tasks = response.json()
+    assert len(tasks) == task_count
+    assert all(task["assignee"]["id"].startswith("assignee-") for task in tasks)
+    # Tasks, then one batch each for assignees and projects, whatever the page size
+    assert len(queries) == 3, queries
+
+
+def _integrity_error(constraint_name: str) -> IntegrityError:
+    driver_error = asyncpg.ForeignKeyViolationError.new(
+        {"C": "23503", "M": "foreign key violation", "n": constraint_name}
+    )
+    try:
+        raise AsyncAdapt_asyncpg_dbapi.IntegrityError(str(driver_error)) from driver_error
+    except AsyncAdapt_asyncpg_dbapi.IntegrityError as adapted:
+        return IntegrityError("INSERT INTO tasks ...", {}, adapted)
+
+
+def test_only_assignee_foreign_key_is_reported_as_missing_assignee():
+    assert _is_assignee_violation(_integrity_error(ASSIGNEE_FOREIGN_KEY))
+    assert not _is_assignee_violation(_integrity_error("tasks_project_id_fkey"))